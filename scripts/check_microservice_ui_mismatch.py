@@ -3,7 +3,9 @@
 Compare COM UI microservice status vs UA API truth.
 
 Sources:
-- UA API truth via scripts/ua_api_helper.py check-trap-chain
+- UA API truth via get_trap_chain_status() from scripts/ua_api_helper.py (in-process), or
+  the in-memory snapshot of scripts/ua_trap_chain_monitor.py when UA_TRAP_CHAIN_MONITOR_URL is set
+  (falls back to the in-process check while the monitor has no successful, error-free snapshot)
 - COM backend /api/v1/microservice/status (requires COM_UI_SESSION_ID)
 - COM backend /api/v1/health/connectivity (no auth)
 
@@ -13,120 +15,97 @@ Env:
 - COM_UI_USERNAME / COM_UI_PASSWORD (optional, auto-login)
 - COM_UI_SERVER_LABEL (optional, server label match for login)
 - COM_UI_FORCE_REFRESH (set to 1 to bypass cache)
+- COM_UI_SESSION_FILE / COM_UI_SESSION_TTL (cookie cache, see scripts/com_api_client.py)
+- UA_TRAP_CHAIN_MONITOR_URL (optional, e.g. http://127.0.0.1:8765)
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/check_microservice_ui_mismatch.py
+- /root/navigator/.venv/bin/python /root/navigator/scripts/check_microservice_ui_mismatch.py --soak 600 --interval 2
+
+Notes:
+- The UA check, COM login + /microservice/status and /health/connectivity run
+  concurrently; output order is unchanged.
+- COM calls go through ComApiClient: the login cookie is cached on disk and reused
+  across runs, and a 401 triggers one re-login.
+- --soak samples UA and COM concurrently every --interval seconds for the given duration
+  and prints one JSON report: per-(service, field) mismatch windows (start/end/duration
+  relative to the soak start), staleness percentiles over closed windows, the mismatch
+  rate over compared samples and per-source latency percentiles. Window edges are only
+  as precise as the sampling interval.
 """
 from __future__ import annotations
 
+import argparse
 import json
+import math
 import os
 import ssl
-import subprocess
-import sys
+import time
 import urllib.request
-from http.cookiejar import CookieJar
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from com_api_client import ComApiClient
+from ua_api_helper import get_trap_chain_status
+
+_COM_CLIENT: ComApiClient | None = None
+
 
 def _base_url() -> str:
     raw = os.getenv("COM_UI_BASE_URL", "https://localhost:5173").rstrip("/")
     return raw
 
 
-def _api_url(path: str) -> str:
-    return f"{_base_url()}/api/v1{path}"
+def _com_client() -> ComApiClient:
+    global _COM_CLIENT
+    if _COM_CLIENT is None:
+        _COM_CLIENT = ComApiClient(_base_url())
+    return _COM_CLIENT
 
 
-def _fetch_json(url: str, session_id: str | None = None) -> dict[str, Any]:
+def _fetch_json(url: str) -> dict[str, Any]:
     headers = {"Accept": "application/json"}
-    if session_id:
-        headers["Cookie"] = f"FCOM_SESSION_ID={session_id}"
     req = urllib.request.Request(url, headers=headers, method="GET")
     context = ssl._create_unverified_context()
     with urllib.request.urlopen(req, context=context, timeout=20) as resp:
         return json.loads(resp.read().decode("utf-8"))
 
 
-def _fetch_json_with_opener(opener: urllib.request.OpenerDirector, url: str) -> dict[str, Any]:
-    req = urllib.request.Request(url, headers={"Accept": "application/json"}, method="GET")
-    with opener.open(req, timeout=20) as resp:
-        return json.loads(resp.read().decode("utf-8"))
-
-
-def _post_json_with_opener(
-    opener: urllib.request.OpenerDirector,
-    url: str,
-    payload: dict[str, Any],
-) -> dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Accept": "application/json", "Content-Type": "application/json"},
-        method="POST",
-    )
-    with opener.open(req, timeout=20) as resp:
-        return json.loads(resp.read().decode("utf-8"))
-
-
-def _login_and_get_session_id() -> str | None:
-    username = os.getenv("COM_UI_USERNAME")
-    password = os.getenv("COM_UI_PASSWORD")
-    if not username or not password:
-        return None
-
-    label_hint = (os.getenv("COM_UI_SERVER_LABEL") or "").strip().lower()
-    base = _base_url()
-    cookie_jar = CookieJar()
-    context = ssl._create_unverified_context()
-    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookie_jar))
-    opener.addheaders = [("User-Agent", "com-microservice-check/1.0")]
-
-    servers_url = f"{base}/api/v1/servers"
-    servers = _fetch_json_with_opener(opener, servers_url)
-    if not isinstance(servers, list) or not servers:
-        raise RuntimeError("No servers returned from /api/v1/servers")
-
-    selected = servers[0]
-    if label_hint:
-        for server in servers:
-            label = str(server.get("label") or server.get("name") or server.get("server_id") or "").lower()
-            if label_hint in label:
-                selected = server
-                break
-
-    server_id = selected.get("server_id") or selected.get("id")
-    if not server_id:
-        raise RuntimeError("Server entry missing server_id")
-
-    login_url = f"{base}/api/v1/auth/login"
-    _post_json_with_opener(
-        opener,
-        login_url,
-        {
-            "server_id": server_id,
-            "auth_type": "basic",
-            "username": username,
-            "password": password,
-        },
-    )
-
-    for cookie in cookie_jar:
-        if cookie.name == "FCOM_SESSION_ID":
-            return cookie.value
-
-    return None
+def _run_ua_helper() -> dict[str, Any]:
+    monitor_url = (os.getenv("UA_TRAP_CHAIN_MONITOR_URL") or "").strip()
+    if monitor_url:
+        snapshot = _fetch_json(f"{monitor_url.rstrip('/')}/snapshot")
+        # Before its first poll, or after a failed one, the monitor has no current truth.
+        if snapshot.get("success") and not snapshot.get("lastError"):
+            return snapshot
+    return get_trap_chain_status()
+
+
+def _fetch_com_status() -> tuple[dict[str, Any] | None, list[str]]:
+    """Log in if needed and fetch /microservice/status; returns (status, notes to print)."""
+    client = _com_client()
+    notes: list[str] = []
+    try:
+        session_id = client.session_id()
+    except Exception as exc:
+        notes.append(f"\nAuto-login failed: {exc}")
+        session_id = None
+    if not session_id:
+        notes.append("\nCOM /microservice/status skipped (no session).")
+        return None, notes
+    try:
+        refresh = os.getenv("COM_UI_FORCE_REFRESH") == "1"
+        return client.get_json("/microservice/status", {"refresh": "1"} if refresh else None), notes
+    except Exception as exc:
+        notes.append(f"\nCOM /microservice/status failed: {exc}")
+        return None, notes
 
 
-def _run_ua_helper() -> dict[str, Any]:
-    helper = os.path.join(os.path.dirname(__file__), "ua_api_helper.py")
-    result = subprocess.run(
-        [sys.executable, helper, "check-trap-chain"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or "ua_api_helper.py failed")
-    return json.loads(result.stdout)
+def _fetch_com_status_data() -> dict[str, Any]:
+    status_data, notes = _fetch_com_status()
+    if status_data is None:
+        raise RuntimeError(" ".join(note.strip() for note in notes) or "COM status unavailable")
+    return status_data
 
 
 def _index_required(entries: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
@@ -142,38 +121,155 @@ def _summarize_required(entries: list[dict[str, Any]]) -> list[str]:
     return lines
 
 
+def _diff_required(
+    ua_index: dict[str, dict[str, Any]],
+    com_index: dict[str, dict[str, Any]],
+) -> list[tuple[str, str, str]]:
+    """Return (service, field, message) for every UA-vs-COM disagreement."""
+    mismatches: list[tuple[str, str, str]] = []
+    for key, ua_entry in ua_index.items():
+        com_entry = com_index.get(key)
+        if not com_entry:
+            mismatches.append((key, "missing", f"Missing in COM status: {key}"))
+            continue
+        for field in ("installed", "running"):
+            if bool(ua_entry.get(field)) != bool(com_entry.get(field)):
+                mismatches.append(
+                    (key, field, f"{key} {field} mismatch: ua={ua_entry.get(field)} com={com_entry.get(field)}")
+                )
+    return mismatches
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(pct: float) -> float:
+        return round(ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)], 4)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": rank(50),
+        "p90": rank(90),
+        "p99": rank(99),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def _timed(fn) -> tuple[Any, float, str | None]:
+    started = time.perf_counter()
+    try:
+        return fn(), time.perf_counter() - started, None
+    except Exception as exc:
+        return None, time.perf_counter() - started, str(exc)
+
+
+def run_soak(duration: float, interval: float) -> dict[str, Any]:
+    latencies: dict[str, list[float]] = {"ua": [], "com": []}
+    errors: dict[str, int] = {"ua": 0, "com": 0}
+    open_windows: dict[str, dict[str, Any]] = {}
+    windows: list[dict[str, Any]] = []
+    samples = compared = mismatched = 0
+
+    _com_client()
+    started = time.monotonic()
+    next_tick = started
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        while time.monotonic() - started < duration:
+            at = round(time.monotonic() - started, 3)
+            ua_future = pool.submit(_timed, _run_ua_helper)
+            com_future = pool.submit(_timed, _fetch_com_status_data)
+            outcomes = {"ua": ua_future.result(), "com": com_future.result()}
+            samples += 1
+            for source, (_data, latency, error) in outcomes.items():
+                latencies[source].append(latency)
+                if error:
+                    errors[source] += 1
+
+            ua_data, _, ua_error = outcomes["ua"]
+            com_data, _, com_error = outcomes["com"]
+            if not ua_error and not com_error:
+                compared += 1
+                current = {
+                    f"{key}.{field}": message
+                    for key, field, message in _diff_required(
+                        _index_required(ua_data.get("required") or []),
+                        _index_required(com_data.get("required") or []),
+                    )
+                }
+                if current:
+                    mismatched += 1
+                for key in current.keys() - open_windows.keys():
+                    open_windows[key] = {"key": key, "detail": current[key], "start": at}
+                for key in open_windows.keys() - current.keys():
+                    window = open_windows.pop(key)
+                    window["end"] = at
+                    window["duration"] = round(at - window["start"], 3)
+                    windows.append(window)
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # A slow sample overran the tick; resume the fixed rate from now.
+                next_tick = time.monotonic()
+
+    elapsed = round(time.monotonic() - started, 3)
+    closed = [window["duration"] for window in windows]
+    for window in open_windows.values():
+        windows.append({**window, "end": None, "duration": round(elapsed - window["start"], 3), "open": True})
+
+    return {
+        "durationSeconds": elapsed,
+        "intervalSeconds": interval,
+        "samples": samples,
+        "compared": compared,
+        "mismatchedSamples": mismatched,
+        "mismatchRate": round(mismatched / compared, 4) if compared else None,
+        "errors": errors,
+        "latencySeconds": {source: _percentiles(values) for source, values in latencies.items()},
+        "stalenessSeconds": _percentiles(closed),
+        "openWindows": len(open_windows),
+        "windows": sorted(windows, key=lambda window: (window["start"], window["key"])),
+    }
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare COM UI microservice status vs UA API truth.")
+    parser.add_argument("--soak", type=float, default=0.0, help="Sample for this many seconds and report drift")
+    parser.add_argument("--interval", type=float, default=2.0, help="Soak sampling interval (seconds)")
+    args = parser.parse_args()
+
+    if args.soak > 0:
+        report = run_soak(args.soak, max(0.05, args.interval))
+        print(json.dumps(report, indent=2))
+        return 0 if report["compared"] else 1
+
     print("COM UI base:", _base_url())
 
-    ua_data = _run_ua_helper()
+    # Create the shared client before any worker can race to build its own.
+    client = _com_client()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        ua_future = pool.submit(_run_ua_helper)
+        status_future = pool.submit(_fetch_com_status)
+        connectivity_future = pool.submit(client.get_json, "/health/connectivity", None, False)
+        ua_data = ua_future.result()
+        status_data, status_notes = status_future.result()
+
     ua_required = ua_data.get("required") or []
     ua_index = _index_required(ua_required)
 
     print("\nUA API truth (check-trap-chain):")
     print("\n".join(_summarize_required(ua_required)))
 
-    session_id = os.getenv("COM_UI_SESSION_ID")
-    if not session_id:
-        try:
-            session_id = _login_and_get_session_id()
-        except Exception as exc:
-            print(f"\nAuto-login failed: {exc}")
-            session_id = None
-    status_data: dict[str, Any] | None = None
-    if session_id:
-        try:
-            refresh = os.getenv("COM_UI_FORCE_REFRESH") == "1"
-            status_url = _api_url("/microservice/status")
-            if refresh:
-                status_url = f"{status_url}?refresh=1"
-            status_data = _fetch_json(status_url, session_id=session_id)
-        except Exception as exc:
-            print(f"\nCOM /microservice/status failed: {exc}")
-    else:
-        print("\nCOM /microservice/status skipped (no session).")
+    for note in status_notes:
+        print(note)
 
     try:
-        connectivity = _fetch_json(_api_url("/health/connectivity"))
+        connectivity = connectivity_future.result()
         print("\nCOM /health/connectivity:")
         print(json.dumps(connectivity, indent=2))
     except Exception as exc:
@@ -185,17 +281,7 @@ def main() -> int:
     com_required = status_data.get("required") or []
     com_index = _index_required(com_required)
 
-    mismatches: list[str] = []
-    for key, ua_entry in ua_index.items():
-        com_entry = com_index.get(key)
-        if not com_entry:
-            mismatches.append(f"Missing in COM status: {key}")
-            continue
-        for field in ("installed", "running"):
-            if bool(ua_entry.get(field)) != bool(com_entry.get(field)):
-                mismatches.append(
-                    f"{key} {field} mismatch: ua={ua_entry.get(field)} com={com_entry.get(field)}"
-                )
+    mismatches = [message for _key, _field, message in _diff_required(ua_index, com_index)]
 
     print("\nCOM /microservice/status:")
     print("\n".join(_summarize_required(com_required)))
@@ -0,0 +1,231 @@
+"""
+Purpose:
+- Persistent COM backend API client: keep-alive connections, FCOM_SESSION_ID cookie cached
+  on disk, re-login only when the backend answers 401.
+
+Usage:
+- from com_api_client import ComApiClient
+  client = ComApiClient()
+  status = client.get_json("/microservice/status")
+  connectivity = client.get_json("/health/connectivity", auth=False)
+
+Notes/Environment:
+- COM_UI_BASE_URL (default: https://localhost:5173); paths are relative to /api/v1.
+- COM_UI_SESSION_ID pins a session (no login, no cache file) until the backend rejects it.
+- COM_UI_USERNAME / COM_UI_PASSWORD / COM_UI_SERVER_LABEL enable auto-login.
+- COM_UI_SESSION_FILE overrides the cookie cache path (default
+  ~/.cache/ua-navigator/com-session-<host>.json, mode 0600). The cached cookie expires with
+  its Max-Age, or after COM_UI_SESSION_TTL seconds (default 8h, the backend cookie lifetime).
+- TLS verification is disabled, as for the other COM UI checks.
+"""
+from __future__ import annotations
+
+import http.client
+import http.cookies
+import io
+import json
+import os
+import re
+import ssl
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+from typing import Any
+
+SESSION_COOKIE = "FCOM_SESSION_ID"
+COM_UI_SESSION_TTL = float(os.getenv("COM_UI_SESSION_TTL", str(8 * 3600)))
+SESSION_EXPIRY_MARGIN = 60.0
+USER_AGENT = "com-microservice-check/1.0"
+_RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _default_session_file(base_url: str) -> str:
+    netloc = urllib.parse.urlsplit(base_url).netloc or "default"
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", netloc)
+    return os.path.join(os.path.expanduser("~"), ".cache", "ua-navigator", f"com-session-{safe}.json")
+
+
+class ComApiClient:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        server_label: str | None = None,
+        session_file: str | None = None,
+        timeout: float = 20.0,
+    ) -> None:
+        self.base_url = (base_url or os.getenv("COM_UI_BASE_URL", "https://localhost:5173")).rstrip("/")
+        self._username = username if username is not None else os.getenv("COM_UI_USERNAME")
+        self._password = password if password is not None else os.getenv("COM_UI_PASSWORD")
+        self._server_label = (server_label or os.getenv("COM_UI_SERVER_LABEL") or "").strip().lower()
+        self._pinned_session = os.getenv("COM_UI_SESSION_ID") or None
+        self._session_file = session_file or os.getenv("COM_UI_SESSION_FILE") or _default_session_file(self.base_url)
+        self._timeout = timeout
+        self._session_id: str | None = None
+        self._session_lock = threading.Lock()
+        self.logins = 0
+
+        parts = urllib.parse.urlsplit(self.base_url)
+        self._secure = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or (443 if self._secure else 80)
+        self._prefix = parts.path.rstrip("/") + "/api/v1"
+        self._context = ssl._create_unverified_context() if self._secure else None
+        self._idle: list[http.client.HTTPConnection] = []
+        self._conn_lock = threading.Lock()
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        with self._conn_lock:
+            if self._idle:
+                return self._idle.pop()
+        if self._secure:
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout, context=self._context)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        all_headers = {"Accept": "application/json", "User-Agent": USER_AGENT, **(headers or {})}
+        for attempt in range(2):
+            conn = self._checkout()
+            reused = conn.sock is not None
+            try:
+                conn.request(method, f"{self._prefix}{path}", body=body, headers=all_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except _RETRYABLE_ERRORS:
+                conn.close()
+                # The server closed an idle keep-alive connection; replay reads once.
+                if reused and attempt == 0 and method == "GET":
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                with self._conn_lock:
+                    self._idle.append(conn)
+            return resp.status, resp.reason, resp.headers, data
+        raise RuntimeError("unreachable")
+
+    def _decode(self, path: str, status: int, reason: str, headers: http.client.HTTPMessage, data: bytes) -> Any:
+        if status >= 400:
+            raise urllib.error.HTTPError(f"{self.base_url}/api/v1{path}", status, reason, headers, io.BytesIO(data))
+        return json.loads(data.decode("utf-8"))
+
+    def close(self) -> None:
+        with self._conn_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _read_cached_session(self) -> str | None:
+        try:
+            with open(self._session_file, "r", encoding="utf-8") as handle:
+                cached = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("baseUrl") != self.base_url:
+            return None
+        if float(cached.get("expiresAt") or 0) - SESSION_EXPIRY_MARGIN <= time.time():
+            return None
+        return cached.get("sessionId") or None
+
+    def _write_cached_session(self, session_id: str, expires_at: float) -> None:
+        directory = os.path.dirname(self._session_file) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"baseUrl": self.base_url, "sessionId": session_id, "expiresAt": expires_at}, handle)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._session_file)
+        except OSError:
+            pass
+
+    def _forget_session(self, session_id: str | None) -> None:
+        if self._pinned_session == session_id:
+            self._pinned_session = None
+        if self._session_id == session_id:
+            self._session_id = None
+            try:
+                os.remove(self._session_file)
+            except OSError:
+                pass
+
+    def login(self) -> str | None:
+        if not self._username or not self._password:
+            return None
+        status, reason, headers, data = self._request("GET", "/servers")
+        servers = self._decode("/servers", status, reason, headers, data)
+        if not isinstance(servers, list) or not servers:
+            raise RuntimeError("No servers returned from /api/v1/servers")
+
+        selected = servers[0]
+        if self._server_label:
+            for server in servers:
+                label = str(server.get("label") or server.get("name") or server.get("server_id") or "").lower()
+                if self._server_label in label:
+                    selected = server
+                    break
+        server_id = selected.get("server_id") or selected.get("id")
+        if not server_id:
+            raise RuntimeError("Server entry missing server_id")
+
+        payload = json.dumps(
+            {"server_id": server_id, "auth_type": "basic", "username": self._username, "password": self._password}
+        ).encode("utf-8")
+        status, reason, headers, data = self._request(
+            "POST", "/auth/login", body=payload, headers={"Content-Type": "application/json"}
+        )
+        self._decode("/auth/login", status, reason, headers, data)
+        self.logins += 1
+
+        for raw in headers.get_all("Set-Cookie") or []:
+            cookie = http.cookies.SimpleCookie(raw)
+            morsel = cookie.get(SESSION_COOKIE)
+            if morsel is None or not morsel.value:
+                continue
+            max_age = morsel["max-age"]
+            ttl = float(max_age) if max_age else COM_UI_SESSION_TTL
+            self._session_id = morsel.value
+            self._write_cached_session(morsel.value, time.time() + ttl)
+            return morsel.value
+        return None
+
+    def session_id(self) -> str | None:
+        if self._pinned_session:
+            return self._pinned_session
+        with self._session_lock:
+            if self._session_id is None:
+                self._session_id = self._read_cached_session() or self.login()
+            return self._session_id
+
+    def get_json(self, path: str, params: dict[str, str] | None = None, auth: bool = True) -> Any:
+        query = urllib.parse.urlencode(params or {})
+        target = f"{path}?{query}" if query else path
+        session_id = self.session_id() if auth else None
+        headers = {"Cookie": f"{SESSION_COOKIE}={session_id}"} if session_id else {}
+        status, reason, response_headers, data = self._request("GET", target, headers=headers)
+        if status == 401 and auth and self._username and self._password:
+            with self._session_lock:
+                self._forget_session(session_id)
+            session_id = self.session_id()
+            if session_id:
+                headers = {"Cookie": f"{SESSION_COOKIE}={session_id}"}
+                status, reason, response_headers, data = self._request("GET", target, headers=headers)
+        return self._decode(target, status, reason, response_headers, data)
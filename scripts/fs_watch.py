@@ -0,0 +1,203 @@
+"""
+Purpose:
+  Minimal recursive file watcher for repo scripts: inotify on Linux (via ctypes, no extra
+  dependencies) with an mtime polling fallback everywhere else.
+
+Usage:
+  from fs_watch import open_watcher
+
+  watcher = open_watcher("/path/to/root", lambda path: path.endswith(".rules"))
+  try:
+      for changed in watcher:
+          if changed is None:
+              ...  # watcher lost events (queue overflow); rescan everything
+          else:
+              ...  # set of absolute paths that were written, created, moved or deleted
+  finally:
+      watcher.close()
+
+Notes:
+  - Bursts of events are coalesced for `debounce` seconds into one batch.
+  - Set FS_WATCH_POLL=1 (or pass force_poll=True) to skip inotify.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple, Union
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+PathFilter = Callable[[str], bool]
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    kind = "inotify"
+
+    def __init__(self, root: str, path_filter: PathFilter, debounce: float) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._root = root
+        self._filter = path_filter
+        self._debounce = debounce
+        self._dirs: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _add_dir(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, root: str) -> Set[str]:
+        seen: Set[str] = set()
+        for current_root, _dirs, files in os.walk(root):
+            self._add_dir(current_root)
+            for file_name in files:
+                path = os.path.join(current_root, file_name)
+                if self._filter(path):
+                    seen.add(path)
+        return seen
+
+    def _read_events(self) -> Tuple[Set[str], bool]:
+        changed: Set[str] = set()
+        overflow = False
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return changed, overflow
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._add_tree(path))
+                elif mask & IN_MOVED_FROM:
+                    # Files under a moved-away directory vanish without their own events.
+                    overflow = True
+                continue
+            if mask & IN_CREATE:
+                continue
+            if self._filter(path):
+                changed.add(path)
+        return changed, overflow
+
+    def __iter__(self) -> Iterator[Optional[Set[str]]]:
+        while True:
+            select.select([self._fd], [], [])
+            changed, overflow = self._read_events()
+            while True:
+                ready, _, _ = select.select([self._fd], [], [], self._debounce)
+                if not ready:
+                    break
+                more, more_overflow = self._read_events()
+                changed.update(more)
+                overflow = overflow or more_overflow
+            if overflow:
+                yield None
+            elif changed:
+                yield changed
+
+
+class PollingWatcher:
+    kind = "poll"
+
+    def __init__(self, root: str, path_filter: PathFilter, interval: float) -> None:
+        self._root = root
+        self._filter = path_filter
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def close(self) -> None:
+        return None
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for current_root, _dirs, files in os.walk(self._root):
+            for file_name in files:
+                path = os.path.join(current_root, file_name)
+                if not self._filter(path):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def __iter__(self) -> Iterator[Optional[Set[str]]]:
+        while True:
+            time.sleep(self._interval)
+            current = self._scan()
+            changed = {
+                path
+                for path in current.keys() | self._snapshot.keys()
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                yield changed
+
+
+def open_watcher(
+    root: str,
+    path_filter: PathFilter,
+    debounce: float = 0.02,
+    poll_interval: float = 0.25,
+    force_poll: bool = False,
+) -> Union[InotifyWatcher, PollingWatcher]:
+    if not force_poll and os.getenv("FS_WATCH_POLL") != "1":
+        try:
+            return InotifyWatcher(root, path_filter, debounce)
+        except OSError:
+            pass
+    return PollingWatcher(root, path_filter, poll_interval)
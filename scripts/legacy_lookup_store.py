@@ -0,0 +1,479 @@
+"""
+Purpose:
+  Extract legacy lookup hash literals (e.g. `our %Table = ('k' => {'Severity' => '5'}, ...);`)
+  from .pl/.rules files and store them in an indexed SQLite file queryable by table and key.
+
+Usage:
+  /root/navigator/.venv/bin/python scripts/legacy_lookup_store.py build /path/to/legacy/root --db lookups.sqlite
+  /root/navigator/.venv/bin/python scripts/legacy_lookup_store.py tables --db lookups.sqlite
+  /root/navigator/.venv/bin/python scripts/legacy_lookup_store.py get --db lookups.sqlite \
+      --table huawei_nce_lookup_interface --key CORE_PS_1 --prop Severity
+
+Notes:
+  - Rows are tokenized and written in batches as they are parsed; no table is held in memory.
+  - Lookups go through the (table, key) primary key, so resolving `$Table{$key}{Prop}` is a
+    single indexed read.
+  - Only file-scope hashes are indexed: `our %x` anywhere, `%x = (...)` outside any block,
+    and `my %x = (...)` outside any block of a .pl file. Hashes local to a sub, and
+    top-level `my` hashes in .rules files (which run per event), are skipped.
+  - Every build first drops what the store holds for each file it re-scans, and for files under
+    the root that no longer exist, so edited and deleted tables do not linger.
+  - Tables are keyed by (path, name). A later definition of the same name in the same file
+    replaces the earlier one (Perl semantics); the same name in different files is kept
+    per file and reported as a collision. `get --table` needs `--path` for such names.
+  - Keys pair strictly on `=>`. Literal values are unquoted; any other value (variables,
+    expressions like `$x->{'k'}`) is stored as its raw source text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SCHEMA_VERSION = 2
+LOOKUP_EXTENSIONS = (".pl", ".rules")
+INSERT_BATCH_SIZE = 2000
+
+HASH_START_PATTERN = re.compile(r"(?:\b(our|my|local)\s+)?%([A-Za-z_][\w:]*)\s*=\s*\(")
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<skip>\s+|\#[^\n]*)
+    |(?P<squote>'(?:[^'\\]|\\.)*')
+    |(?P<dquote>"(?:[^"\\]|\\.)*")
+    |(?P<arrow>=>)
+    |(?P<punct>[,{}()\[\]])
+    |(?P<number>-?\d+(?:\.\d+)?\b)
+    |(?P<word>[A-Za-z_][\w:]*)
+    |(?P<raw>[$@%&]\w[\w:]*|\S)
+    """,
+    re.VERBOSE,
+)
+
+
+OPENERS = {"(": ")", "{": "}", "[": "]"}
+LITERAL_KINDS = ("squote", "dquote", "number", "word")
+
+
+@dataclass
+class LookupTable:
+    name: str
+    path: str
+    line: int
+    row_count: int = 0
+    shape: str = "empty"
+    properties: List[str] = field(default_factory=list)
+
+
+class _Tokens:
+    def __init__(self, text: str, pos: int) -> None:
+        self.text = text
+        self._iter = TOKEN_PATTERN.finditer(text, pos)
+        self._peeked: Optional[Tuple[str, str, int, int]] = None
+        self.last_end = pos
+
+    def peek(self) -> Optional[Tuple[str, str, int, int]]:
+        """(kind, text, start, end) of the next token without consuming it."""
+        if self._peeked is None:
+            for match in self._iter:
+                kind = match.lastgroup or "raw"
+                if kind == "skip":
+                    continue
+                self._peeked = (kind, match.group(kind), match.start(), match.end())
+                break
+        return self._peeked
+
+    def next(self) -> Optional[Tuple[str, str, int, int]]:
+        token = self.peek()
+        self._peeked = None
+        if token is not None:
+            self.last_end = token[3]
+        return token
+
+
+def _unquote(kind: str, value: str) -> str:
+    if kind in ("squote", "dquote"):
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _is_separator(token: Optional[Tuple[str, str, int, int]], closer: str) -> bool:
+    return token is None or (token[1] in (",", "=>", closer) and token[0] in ("punct", "arrow"))
+
+
+def _raw_span(tokens: _Tokens, start: int, closer: str, expected: List[str]) -> str:
+    """Source text from start up to the next top-level `,` / `=>` or the enclosing closer."""
+    while True:
+        token = tokens.peek()
+        if token is None or (not expected and _is_separator(token, closer)):
+            break
+        tokens.next()
+        if token[0] == "punct" and token[1] in OPENERS:
+            expected.append(OPENERS[token[1]])
+        elif token[0] == "punct" and expected and token[1] == expected[-1]:
+            expected.pop()
+    return tokens.text[start : tokens.last_end]
+
+
+def _parse_value(tokens: _Tokens, closer: str) -> Any:
+    """One hash/array element: a nested literal, an unquoted scalar, or raw source text."""
+    token = tokens.next()
+    if token is None:
+        return None
+    kind, value = token[0], token[1]
+    if kind == "punct" and value in ("{", "["):
+        inner = OPENERS[value]
+        parsed: Any = dict(_iter_pairs(tokens, inner)) if value == "{" else list(_iter_items(tokens, inner))
+        if _is_separator(tokens.peek(), closer):
+            return parsed
+        # Something follows the literal (e.g. `{...}->{k}`): keep the whole expression as text.
+        return _raw_span(tokens, token[2], closer, [])
+    if kind in LITERAL_KINDS and _is_separator(tokens.peek(), closer):
+        return _unquote(kind, value)
+    return _raw_span(tokens, token[2], closer, [OPENERS[value]] if kind == "punct" and value in OPENERS else [])
+
+
+def _iter_items(tokens: _Tokens, closer: str) -> Iterator[Any]:
+    while True:
+        token = tokens.peek()
+        if token is None:
+            return
+        if token[:2] == ("punct", closer):
+            tokens.next()
+            return
+        if token[1] in (",", "=>") and token[0] in ("punct", "arrow"):
+            tokens.next()
+            continue
+        yield _parse_value(tokens, closer)
+
+
+def _iter_pairs(tokens: _Tokens, closer: str) -> Iterator[Tuple[str, Any]]:
+    """`key => value` pairs up to closer; elements not joined by `=>` are skipped."""
+    while True:
+        token = tokens.peek()
+        if token is None:
+            return
+        if token[:2] == ("punct", closer):
+            tokens.next()
+            return
+        if token[:2] == ("punct", ","):
+            tokens.next()
+            continue
+        key = _parse_value(tokens, closer)
+        if tokens.peek() is None or tokens.peek()[:2] != ("arrow", "=>"):
+            continue
+        tokens.next()
+        if _is_separator(tokens.peek(), closer):
+            yield str(key), None
+            continue
+        yield str(key), _parse_value(tokens, closer)
+
+
+def parse_hash_literal(text: str) -> Dict[str, Any]:
+    """Parse the body of a `%x = (...)` literal, starting just after its `(`.
+
+    >>> parse_hash_literal("'a' => $x->{'k'}, b => { 'c' => 1, d => foo($y, 2) }, 'e' => 'E');")
+    {'a': "$x->{'k'}", 'b': {'c': '1', 'd': 'foo($y, 2)'}, 'e': 'E'}
+    """
+    return dict(_iter_pairs(_Tokens(text, 0), ")"))
+
+
+def _block_depths(content: str) -> Iterator[Tuple[int, int]]:
+    """(position, brace depth) after every brace token, skipping strings and comments."""
+    depth = 0
+    for match in TOKEN_PATTERN.finditer(content):
+        if match.lastgroup == "punct" and match.group() in "{}":
+            depth = depth + 1 if match.group() == "{" else max(0, depth - 1)
+            yield match.end(), depth
+
+
+def _is_file_scope(path: str, declarator: Optional[str], depth: int) -> bool:
+    if declarator == "our":
+        return True
+    if depth or declarator == "local":
+        return False
+    return declarator is None or path.lower().endswith(".pl")
+
+
+def iter_lookup_tables(path: str) -> Iterator[Tuple[LookupTable, Iterator[Tuple[str, Any]]]]:
+    """Yield (table, rows) for each file-scope `%name = (...)` literal; rows must be consumed in order."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+        content = handle.read()
+    depths = _block_depths(content)
+    depth_at, depth = next(depths, (len(content) + 1, 0))
+    current = 0
+    pos = 0
+    while True:
+        match = HASH_START_PATTERN.search(content, pos)
+        if not match:
+            return
+        while depth_at <= match.start():
+            current = depth
+            depth_at, depth = next(depths, (len(content) + 1, depth))
+        pos = match.end()
+        if not _is_file_scope(path, match.group(1), current):
+            continue
+        table = LookupTable(
+            name=match.group(2),
+            path=path,
+            line=content.count("\n", 0, match.start()) + 1,
+        )
+        tokens = _Tokens(content, match.end())
+        yield table, _iter_pairs(tokens, ")")
+
+
+def list_lookup_sources(root: str) -> List[str]:
+    if os.path.isfile(root):
+        return [root]
+    results: List[str] = []
+    for current_root, _dirs, files in os.walk(root):
+        for file_name in sorted(files):
+            if file_name.lower().endswith(LOOKUP_EXTENSIONS):
+                results.append(os.path.join(current_root, file_name))
+    return results
+
+
+def open_store(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS lookup_rows; DROP TABLE IF EXISTS lookup_tables;")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS lookup_tables (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            path TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            shape TEXT NOT NULL,
+            properties TEXT NOT NULL,
+            UNIQUE (name, path)
+        );
+        CREATE TABLE IF NOT EXISTS lookup_rows (
+            table_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (table_id, key)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    return conn
+
+
+def _store_table(conn: sqlite3.Connection, table: LookupTable, rows: Iterator[Tuple[str, Any]]) -> LookupTable:
+    existing = conn.execute(
+        "SELECT id FROM lookup_tables WHERE name = ? AND path = ?", (table.name, table.path)
+    ).fetchone()
+    if existing:
+        table_id = existing[0]
+        conn.execute("DELETE FROM lookup_rows WHERE table_id = ?", (table_id,))
+    else:
+        table_id = conn.execute(
+            "INSERT INTO lookup_tables (name, path, line, row_count, shape, properties) VALUES (?, ?, 0, 0, '', '[]')",
+            (table.name, table.path),
+        ).lastrowid
+    shapes = set()
+    properties: Dict[str, None] = {}
+
+    def encoded() -> Iterator[Tuple[str, str, str]]:
+        for key, value in rows:
+            table.row_count += 1
+            if isinstance(value, dict):
+                shapes.add("object")
+                properties.update(dict.fromkeys(value))
+            else:
+                shapes.add("scalar")
+            yield table_id, key, json.dumps(value)
+
+    stream = encoded()
+    while True:
+        batch = list(islice(stream, INSERT_BATCH_SIZE))
+        if not batch:
+            break
+        conn.executemany(
+            "INSERT OR REPLACE INTO lookup_rows (table_id, key, value) VALUES (?, ?, ?)",
+            batch,
+        )
+    table.shape = "mixed" if len(shapes) > 1 else next(iter(shapes), "empty")
+    table.properties = list(properties)
+    conn.execute(
+        "UPDATE lookup_tables SET line = ?, row_count = ?, shape = ?, properties = ? WHERE id = ?",
+        (table.line, table.row_count, table.shape, json.dumps(table.properties), table_id),
+    )
+    return table
+
+
+def name_collisions(tables: List[LookupTable]) -> Dict[str, List[str]]:
+    """Table names defined in more than one file, with their paths."""
+    paths: Dict[str, List[str]] = {}
+    for table in tables:
+        if table.path not in paths.setdefault(table.name, []):
+            paths[table.name].append(table.path)
+    return {name: found for name, found in sorted(paths.items()) if len(found) > 1}
+
+
+def _drop_path(conn: sqlite3.Connection, path: str) -> None:
+    conn.execute(
+        "DELETE FROM lookup_rows WHERE table_id IN (SELECT id FROM lookup_tables WHERE path = ?)",
+        (path,),
+    )
+    conn.execute("DELETE FROM lookup_tables WHERE path = ?", (path,))
+
+
+def build_lookup_store(root: str, db_path: str) -> List[LookupTable]:
+    """Re-scan root into the store; the stored tables for root then mirror the files on disk."""
+    conn = open_store(db_path)
+    tables: Dict[Tuple[str, str], LookupTable] = {}
+    try:
+        sources = list_lookup_sources(root)
+        scanned = set(sources)
+        prefix = root.rstrip(os.sep) + os.sep
+        for (path,) in conn.execute("SELECT DISTINCT path FROM lookup_tables").fetchall():
+            if (path == root or path.startswith(prefix)) and path not in scanned:
+                _drop_path(conn, path)
+        conn.commit()
+        for path in sources:
+            _drop_path(conn, path)
+            for table, rows in iter_lookup_tables(path):
+                tables[(table.path, table.name)] = _store_table(conn, table, rows)
+            conn.commit()
+    finally:
+        conn.close()
+    return list(tables.values())
+
+
+class LookupStore:
+    """Read-only accessor for a store produced by build_lookup_store."""
+
+    def __init__(self, db_path: str) -> None:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            raise RuntimeError(f"Unsupported lookup store version {version} (expected {SCHEMA_VERSION})")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def tables(self) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT name, path, line, row_count, shape, properties FROM lookup_tables ORDER BY name, path"
+        )
+        return [
+            {
+                "name": name,
+                "path": path,
+                "line": line,
+                "row_count": row_count,
+                "shape": shape,
+                "properties": json.loads(properties),
+            }
+            for name, path, line, row_count, shape, properties in rows
+        ]
+
+    def collisions(self) -> Dict[str, List[str]]:
+        rows = self._conn.execute(
+            "SELECT name, path FROM lookup_tables WHERE name IN "
+            "(SELECT name FROM lookup_tables GROUP BY name HAVING COUNT(*) > 1) ORDER BY name, path"
+        )
+        found: Dict[str, List[str]] = {}
+        for name, path in rows:
+            found.setdefault(name, []).append(path)
+        return found
+
+    def _table_id(self, table: str, path: Optional[str]) -> Optional[int]:
+        if path:
+            row = self._conn.execute(
+                "SELECT id FROM lookup_tables WHERE name = ? AND path = ?", (table, os.path.abspath(path))
+            ).fetchone()
+            return row[0] if row else None
+        rows = self._conn.execute("SELECT id, path FROM lookup_tables WHERE name = ?", (table,)).fetchall()
+        if len(rows) > 1:
+            raise ValueError(f"Table {table} is defined in several files; pass a path: {[p for _, p in rows]}")
+        return rows[0][0] if rows else None
+
+    def get(self, table: str, key: str, path: Optional[str] = None) -> Any:
+        table_id = self._table_id(table, path)
+        if table_id is None:
+            return None
+        row = self._conn.execute(
+            "SELECT value FROM lookup_rows WHERE table_id = ? AND key = ?",
+            (table_id, key),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_property(self, table: str, key: str, prop: str, path: Optional[str] = None) -> Any:
+        value = self.get(table, key, path)
+        if isinstance(value, dict):
+            return value.get(prop)
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Extract and query legacy lookup tables.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Extract lookup tables into a store")
+    build_parser.add_argument("root", help="Legacy rules root directory or a single file")
+    build_parser.add_argument("--db", required=True, help="SQLite store path")
+
+    tables_parser = subparsers.add_parser("tables", help="List stored tables")
+    tables_parser.add_argument("--db", required=True, help="SQLite store path")
+
+    get_parser = subparsers.add_parser("get", help="Resolve a table row or property")
+    get_parser.add_argument("--db", required=True, help="SQLite store path")
+    get_parser.add_argument("--table", required=True, help="Lookup table name (without %%)")
+    get_parser.add_argument("--key", required=True, help="Row key")
+    get_parser.add_argument("--prop", help="Optional property name for object rows")
+    get_parser.add_argument("--path", help="Defining file, for table names that collide across files")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not os.path.exists(args.root):
+            print(f"Path not found: {args.root}", file=sys.stderr)
+            return 1
+        tables = build_lookup_store(os.path.abspath(args.root), args.db)
+        print(
+            json.dumps(
+                {
+                    "db": args.db,
+                    "tables": len(tables),
+                    "rows": sum(table.row_count for table in tables),
+                    "collisions": name_collisions(tables),
+                },
+                indent=2,
+            )
+        )
+        return 0
+
+    store = LookupStore(args.db)
+    try:
+        if args.command == "tables":
+            print(json.dumps(store.tables(), indent=2))
+            return 0
+        try:
+            if args.prop:
+                value = store.get_property(args.table, args.key, args.prop, args.path)
+            else:
+                value = store.get(args.table, args.key, args.path)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
+        print(json.dumps({"table": args.table, "key": args.key, "prop": args.prop, "value": value}, indent=2))
+        return 0 if value is not None else 3
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
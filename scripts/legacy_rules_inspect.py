@@ -4,20 +4,46 @@ Purpose:
 
 Usage:
   /root/navigator/.venv/bin/python scripts/legacy_rules_inspect.py /path/to/legacy/root
+  /root/navigator/.venv/bin/python scripts/legacy_rules_inspect.py /path/to/legacy/root --ndjson
+  /root/navigator/.venv/bin/python scripts/legacy_rules_inspect.py '/path/to/archive/*' --workers 8
+  /root/navigator/.venv/bin/python scripts/legacy_rules_inspect.py /path/to/legacy/root --watch
 
 Notes:
   - Outputs a JSON summary to stdout.
+  - --ndjson streams one record per line (root, rule_file, include, dispatch, edge) and ends
+    with a summary record, so consumers can start reading before inspection completes.
+  - Passing several roots (or a glob such as '/archive/*/NCE') switches to multi-root mode:
+    rule files are deduplicated by content hash and parsed once on a shared process pool
+    (--workers), and the output adds a cross-root summary of shared include names and
+    missing definitions.
+  - --lookup-db PATH also extracts `%Table = (...)` lookup literals from .pl/.rules files into an
+    indexed SQLite store (see scripts/legacy_lookup_store.py for querying by table and key).
+  - --watch keeps the parsed root in memory, watches it with inotify (or polling via
+    --poll SECONDS / FS_WATCH_POLL=1), re-parses only changed files and prints a snapshot
+    record followed by one delta record per change (rule files, include matches, missing sets).
+  - Rule metadata and base.rules dispatch scanning run bytes regexes over mmap-ed files and
+    decode only the matched snippets.
   - Does not modify files.
 """
 
 from __future__ import annotations
 
+import argparse
+import glob
+import hashlib
 import json
+import mmap
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from fs_watch import open_watcher
+from legacy_lookup_store import build_lookup_store
 
 
 @dataclass
@@ -81,13 +107,15 @@ def parse_base_load(path: str) -> List[str]:
     return calls
 
 
-def list_rules_files(root: str) -> List[str]:
-    results: List[str] = []
+def iter_rules_files(root: str) -> Iterator[str]:
     for current_root, _dirs, files in os.walk(root):
         for file_name in files:
             if file_name.lower().endswith(".rules"):
-                results.append(os.path.join(current_root, file_name))
-    return results
+                yield os.path.join(current_root, file_name)
+
+
+def list_rules_files(root: str) -> List[str]:
+    return list(iter_rules_files(root))
 
 
 def normalize_path(path: str) -> str:
@@ -108,38 +136,58 @@ def resolve_include_path(root: str, include_path: str) -> Tuple[Optional[str], b
     return None, False, "unresolved"
 
 
+@contextmanager
+def map_file(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Expose a file as a read-only buffer for bytes regexes without decoding it."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def decode_snippet(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore")
+
+
+# Line-local whitespace: `\s` would let bytes patterns run across newlines in MULTILINE mode.
+_WS = rb"[ \t\r\f\v]"
+RULES_NAME_PATTERN = re.compile(rb"^#\s*Name:\s*(.+)$", re.MULTILINE)
+RULESFILE_PATTERN = re.compile(rb"\$rulesfile\s*=\s*\"([^\"]+)\"")
+DISPATCH_PATTERN = re.compile(
+    rb"^" + _WS + rb"*(?:if|elsif)" + _WS + rb"*\((?P<condition>.+)\)" + _WS + rb"*\{" + _WS + rb"*$"
+    rb"|\b(?P<function>[A-Za-z0-9_]+)" + _WS + rb"*\(" + _WS + rb"*\)" + _WS + rb"*;" + _WS + rb"*$",
+    re.MULTILINE,
+)
+
+
 def parse_rules_meta(path: str) -> RuleFileMeta:
-    content = read_text(path)
-    name_match = re.search(r"^#\s*Name:\s*(.+)$", content, flags=re.MULTILINE)
-    rulesfile_match = re.search(r"\$rulesfile\s*=\s*\"([^\"]+)\"", content)
-    declared_name = name_match.group(1).strip() if name_match else None
-    rulesfile_label = rulesfile_match.group(1).strip() if rulesfile_match else None
+    with map_file(path) as content:
+        name_match = RULES_NAME_PATTERN.search(content)
+        rulesfile_match = RULESFILE_PATTERN.search(content)
+        declared_name = decode_snippet(name_match.group(1)).strip() if name_match else None
+        rulesfile_label = decode_snippet(rulesfile_match.group(1)).strip() if rulesfile_match else None
     return RuleFileMeta(path=path, declared_name=declared_name, rulesfile_label=rulesfile_label)
 
 
 def parse_dispatch_rules(path: str) -> List[DispatchRule]:
     if not os.path.exists(path):
         return []
-    content = read_text(path)
-    lines = content.splitlines()
     dispatches: List[DispatchRule] = []
     current_condition: Optional[str] = None
     current_functions: List[str] = []
 
-    condition_pattern = re.compile(r"^\s*(if|elsif)\s*\((.+)\)\s*\{\s*$")
-    function_pattern = re.compile(r"\b([A-Za-z0-9_]+)\s*\(\s*\)\s*;\s*$")
-
-    for line in lines:
-        condition_match = condition_pattern.match(line)
-        if condition_match:
-            if current_condition:
-                dispatches.append(DispatchRule(condition=current_condition, functions=current_functions))
-            current_condition = condition_match.group(2).strip()
-            current_functions = []
-            continue
-        func_match = function_pattern.search(line)
-        if func_match and current_condition:
-            current_functions.append(func_match.group(1))
+    with map_file(path) as content:
+        for match in DISPATCH_PATTERN.finditer(content):
+            condition = match.group("condition")
+            if condition is not None:
+                if current_condition:
+                    dispatches.append(DispatchRule(condition=current_condition, functions=current_functions))
+                current_condition = decode_snippet(condition).strip()
+                current_functions = []
+            elif current_condition:
+                current_functions.append(decode_snippet(match.group("function")))
 
     if current_condition:
         dispatches.append(DispatchRule(condition=current_condition, functions=current_functions))
@@ -147,97 +195,132 @@ def parse_dispatch_rules(path: str) -> List[DispatchRule]:
     return dispatches
 
 
-def inspect_root(root: str, single_file: Optional[str] = None) -> Dict[str, object]:
-    base_includes_path = os.path.join(root, "base.includes")
-    base_load_path = os.path.join(root, "base.load")
-    base_rules_path = os.path.join(root, "base.rules")
-
-    include_entries = parse_base_includes(base_includes_path)
-    include_map = {entry.name: entry.path for entry in include_entries}
-    load_calls = parse_base_load(base_load_path)
-    dispatch_rules = parse_dispatch_rules(base_rules_path)
-
-    rules_files = [single_file] if single_file else list_rules_files(root)
-    rules_meta = [parse_rules_meta(path) for path in rules_files]
-
+def match_includes(
+    include_entries: List[IncludeEntry], rules_meta: List[RuleFileMeta]
+) -> Dict[str, List[str]]:
     include_matches: Dict[str, List[str]] = {}
-    include_resolutions: List[IncludeResolution] = []
     for entry in include_entries:
-        name = entry.name
-        name_lower = name.lower()
-        matches: List[str] = []
-        for meta in rules_meta:
-            file_lower = os.path.basename(meta.path).lower()
-            declared_lower = (meta.declared_name or '').lower()
-            if name_lower in file_lower or (declared_lower and name_lower == declared_lower):
-                matches.append(meta.path)
+        matches = match_include(entry, rules_meta)
         if matches:
-            include_matches[name] = matches
-        resolved_path, exists, match_kind = resolve_include_path(root, entry.path)
-        include_resolutions.append(
-            IncludeResolution(
-                name=entry.name,
-                original_path=entry.path,
-                resolved_path=normalize_path(resolved_path) if resolved_path else None,
-                exists=exists,
-                match_kind=match_kind,
-            )
-        )
+            include_matches[entry.name] = matches
+    return include_matches
+
+
+def match_include(entry: IncludeEntry, rules_meta: List[RuleFileMeta]) -> List[str]:
+    name_lower = entry.name.lower()
+    matches: List[str] = []
+    for meta in rules_meta:
+        file_lower = os.path.basename(meta.path).lower()
+        declared_lower = (meta.declared_name or '').lower()
+        if name_lower in file_lower or (declared_lower and name_lower == declared_lower):
+            matches.append(meta.path)
+    return matches
+
+
+def resolve_include(root: str, entry: IncludeEntry) -> IncludeResolution:
+    resolved_path, exists, match_kind = resolve_include_path(root, entry.path)
+    return IncludeResolution(
+        name=entry.name,
+        original_path=entry.path,
+        resolved_path=normalize_path(resolved_path) if resolved_path else None,
+        exists=exists,
+        match_kind=match_kind,
+    )
 
+
+def compute_missing(
+    include_entries: List[IncludeEntry],
+    dispatch_rules: List[DispatchRule],
+    include_matches: Dict[str, List[str]],
+) -> Dict[str, List[str]]:
+    include_map = {entry.name: entry.path for entry in include_entries}
     include_missing = [name for name in include_map if name not in include_matches]
     dispatched_functions = sorted(
         {fn for dispatch in dispatch_rules for fn in dispatch.functions if fn}
     )
     dispatch_missing = [fn for fn in dispatched_functions if fn not in include_matches]
+    return {
+        "includes_without_definitions": include_missing,
+        "dispatch_without_definitions": dispatch_missing,
+    }
 
-    traversal_order: List[Dict[str, object]] = []
-    for idx, dispatch in enumerate(dispatch_rules, start=1):
-        entry = {
-            "index": idx,
-            "condition": dispatch.condition,
-            "functions": dispatch.functions,
-        }
-        traversal_order.append(entry)
 
-    traversal_graph: List[Dict[str, object]] = []
+def iter_traversal_edges(
+    dispatch_rules: List[DispatchRule],
+    include_entries: List[IncludeEntry],
+    rules_files: List[str],
+    include_matches: Dict[str, List[str]],
+) -> Iterator[Dict[str, object]]:
     if dispatch_rules:
         for idx, dispatch in enumerate(dispatch_rules, start=1):
             sources = [f"dispatch:{idx}"]
             for fn in dispatch.functions:
                 targets = include_matches.get(fn, [])
-                traversal_graph.append(
-                    {
-                        "from": sources[0],
-                        "function": fn,
-                        "to_files": targets,
-                    }
-                )
+                yield {
+                    "from": sources[0],
+                    "function": fn,
+                    "to_files": targets,
+                }
     elif include_entries:
         for entry in include_entries:
-            traversal_graph.append(
-                {
-                    "from": "includes",
-                    "function": entry.name,
-                    "to_files": include_matches.get(entry.name, []),
-                }
-            )
+            yield {
+                "from": "includes",
+                "function": entry.name,
+                "to_files": include_matches.get(entry.name, []),
+            }
     elif rules_files:
         for path in rules_files:
-            traversal_graph.append(
-                {
-                    "from": "standalone",
-                    "function": None,
-                    "to_files": [path],
-                }
-            )
+            yield {
+                "from": "standalone",
+                "function": None,
+                "to_files": [path],
+            }
+
+
+def base_paths(root: str) -> Tuple[str, str, str]:
+    return (
+        os.path.join(root, "base.includes"),
+        os.path.join(root, "base.load"),
+        os.path.join(root, "base.rules"),
+    )
+
+
+def describe_base(root: str) -> Dict[str, Optional[str]]:
+    base_includes_path, base_load_path, base_rules_path = base_paths(root)
+    return {
+        "includes": base_includes_path if os.path.exists(base_includes_path) else None,
+        "load": base_load_path if os.path.exists(base_load_path) else None,
+        "rules": base_rules_path if os.path.exists(base_rules_path) else None,
+    }
+
+
+def build_report(
+    root: str,
+    include_entries: List[IncludeEntry],
+    load_calls: List[str],
+    dispatch_rules: List[DispatchRule],
+    rules_files: List[str],
+    rules_meta: List[RuleFileMeta],
+) -> Dict[str, object]:
+    include_matches = match_includes(include_entries, rules_meta)
+    include_resolutions = [resolve_include(root, entry) for entry in include_entries]
+
+    traversal_order: List[Dict[str, object]] = []
+    for idx, dispatch in enumerate(dispatch_rules, start=1):
+        entry = {
+            "index": idx,
+            "condition": dispatch.condition,
+            "functions": dispatch.functions,
+        }
+        traversal_order.append(entry)
+
+    traversal_graph = list(
+        iter_traversal_edges(dispatch_rules, include_entries, rules_files, include_matches)
+    )
 
     return {
         "root": root,
-        "base": {
-            "includes": base_includes_path if os.path.exists(base_includes_path) else None,
-            "load": base_load_path if os.path.exists(base_load_path) else None,
-            "rules": base_rules_path if os.path.exists(base_rules_path) else None,
-        },
+        "base": describe_base(root),
         "includes": [asdict(entry) for entry in include_entries],
         "include_resolutions": [asdict(entry) for entry in include_resolutions],
         "base_load_calls": load_calls,
@@ -247,28 +330,434 @@ def inspect_root(root: str, single_file: Optional[str] = None) -> Dict[str, obje
         "rule_files": rules_files,
         "rule_metadata": [asdict(meta) for meta in rules_meta],
         "include_matches": include_matches,
-        "missing": {
-            "includes_without_definitions": include_missing,
-            "dispatch_without_definitions": dispatch_missing,
+        "missing": compute_missing(include_entries, dispatch_rules, include_matches),
+    }
+
+
+def parse_base_files(root: str) -> Tuple[List[IncludeEntry], List[str], List[DispatchRule]]:
+    base_includes_path, base_load_path, base_rules_path = base_paths(root)
+    return (
+        parse_base_includes(base_includes_path),
+        parse_base_load(base_load_path),
+        parse_dispatch_rules(base_rules_path),
+    )
+
+
+def extract_lookup_tables(root: str, single_file: Optional[str], lookup_db: str) -> List[Dict[str, object]]:
+    tables = build_lookup_store(single_file or root, lookup_db)
+    return [
+        {
+            "name": table.name,
+            "path": table.path,
+            "line": table.line,
+            "row_count": table.row_count,
+            "shape": table.shape,
+            "properties": table.properties,
+        }
+        for table in tables
+    ]
+
+
+def inspect_root(
+    root: str,
+    single_file: Optional[str] = None,
+    lookup_db: Optional[str] = None,
+) -> Dict[str, object]:
+    include_entries, load_calls, dispatch_rules = parse_base_files(root)
+    rules_files = [single_file] if single_file else list_rules_files(root)
+    rules_meta = [parse_rules_meta(path) for path in rules_files]
+    report = build_report(root, include_entries, load_calls, dispatch_rules, rules_files, rules_meta)
+    if lookup_db:
+        report["lookup_store"] = {
+            "db": lookup_db,
+            "tables": extract_lookup_tables(root, single_file, lookup_db),
+        }
+    return report
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_target(target: str) -> Tuple[str, Optional[str]]:
+    target = os.path.abspath(target)
+    if os.path.isfile(target):
+        return os.path.dirname(target), target
+    return target, None
+
+
+def expand_targets(patterns: List[str]) -> List[str]:
+    targets: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            absolute = os.path.abspath(match)
+            if absolute not in seen:
+                seen.add(absolute)
+                targets.append(absolute)
+    return targets
+
+
+def inspect_roots(targets: List[str], workers: Optional[int] = None) -> Dict[str, object]:
+    """Inspect many roots, parsing each distinct rules file content once on a shared pool.
+
+    Rule files are deduplicated by content hash across all roots; base files are parsed
+    once per root on the same pool. Returns one report per target (a single-file target
+    reports only that file) plus a cross-target summary.
+    """
+    resolved = [resolve_target(target) for target in targets]
+    resolved = [(root, single_file) for root, single_file in resolved if os.path.isdir(root)]
+
+    # Keyed by target, not root: several single-file targets may share one directory.
+    files_by_target: Dict[str, Tuple[str, List[str]]] = {}
+    for root, single_file in resolved:
+        files_by_target[single_file or root] = (root, [single_file] if single_file else list_rules_files(root))
+
+    digest_by_path: Dict[str, str] = {}
+    representative: Dict[str, str] = {}
+    for _root, paths in files_by_target.values():
+        for path in paths:
+            if path in digest_by_path:
+                continue
+            digest = file_digest(path)
+            digest_by_path[path] = digest
+            representative.setdefault(digest, path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        roots = {root for root, _paths in files_by_target.values()}
+        base_futures = {root: pool.submit(parse_base_files, root) for root in sorted(roots)}
+        meta_futures = {digest: pool.submit(parse_rules_meta, path) for digest, path in representative.items()}
+        meta_by_digest = {digest: future.result() for digest, future in meta_futures.items()}
+        base_by_root = {root: future.result() for root, future in base_futures.items()}
+
+    reports: List[Dict[str, object]] = []
+    include_roots: Dict[str, List[str]] = {}
+    missing_roots: Dict[str, List[str]] = {}
+    for target, (root, rules_files) in files_by_target.items():
+        include_entries, load_calls, dispatch_rules = base_by_root[root]
+        rules_meta = []
+        for path in rules_files:
+            parsed = meta_by_digest[digest_by_path[path]]
+            rules_meta.append(
+                RuleFileMeta(path=path, declared_name=parsed.declared_name, rulesfile_label=parsed.rulesfile_label)
+            )
+        report = build_report(root, include_entries, load_calls, dispatch_rules, rules_files, rules_meta)
+        report["target"] = target
+        reports.append(report)
+        for name in sorted({entry.name for entry in include_entries}):
+            include_roots.setdefault(name, []).append(target)
+        missing = report["missing"]
+        for name in sorted(set(missing["includes_without_definitions"]) | set(missing["dispatch_without_definitions"])):
+            missing_roots.setdefault(name, []).append(target)
+
+    return {
+        "roots": reports,
+        "summary": {
+            "root_count": len(reports),
+            "skipped_targets": [target for target in targets if not os.path.isdir(resolve_target(target)[0])],
+            "rule_files": len(digest_by_path),
+            "unique_rule_contents": len(representative),
+            "shared_includes": {name: roots for name, roots in sorted(include_roots.items()) if len(roots) > 1},
+            "missing_definitions": dict(sorted(missing_roots.items())),
+        },
+    }
+
+
+def iter_inspect_records(
+    root: str,
+    single_file: Optional[str] = None,
+    lookup_db: Optional[str] = None,
+) -> Iterator[Dict[str, object]]:
+    """Yield the inspection report as flat records, one per file/include/dispatch/edge.
+
+    Only the small per-file metadata needed for include matching is retained while
+    streaming; every other record is emitted as soon as it is produced.
+    """
+    include_entries, load_calls, dispatch_rules = parse_base_files(root)
+    yield {
+        "type": "root",
+        "root": root,
+        "base": describe_base(root),
+        "base_load_calls": load_calls,
+    }
+
+    rules_files: Iterable[str] = [single_file] if single_file else iter_rules_files(root)
+    rules_meta: List[RuleFileMeta] = []
+    for path in rules_files:
+        meta = parse_rules_meta(path)
+        rules_meta.append(meta)
+        yield {"type": "rule_file", **asdict(meta)}
+
+    include_matches: Dict[str, List[str]] = {}
+    for entry in include_entries:
+        matches = match_include(entry, rules_meta)
+        if matches:
+            include_matches[entry.name] = matches
+        yield {
+            "type": "include",
+            **asdict(entry),
+            "resolution": asdict(resolve_include(root, entry)),
+            "matches": matches,
+        }
+
+    for idx, dispatch in enumerate(dispatch_rules, start=1):
+        yield {"type": "dispatch", "index": idx, **asdict(dispatch)}
+
+    edge_count = 0
+    rule_paths = [meta.path for meta in rules_meta]
+    for edge in iter_traversal_edges(dispatch_rules, include_entries, rule_paths, include_matches):
+        edge_count += 1
+        yield {"type": "edge", **edge}
+
+    if lookup_db:
+        for table in extract_lookup_tables(root, single_file, lookup_db):
+            yield {"type": "lookup_table", "db": lookup_db, **table}
+
+    yield {
+        "type": "summary",
+        "root": root,
+        "counts": {
+            "rule_files": len(rules_meta),
+            "includes": len(include_entries),
+            "include_matches": len(include_matches),
+            "dispatch_rules": len(dispatch_rules),
+            "edges": edge_count,
         },
+        "missing": compute_missing(include_entries, dispatch_rules, include_matches),
+    }
+
+
+BASE_FILE_NAMES = ("base.includes", "base.load", "base.rules")
+
+
+def is_inspected_file(path: str) -> bool:
+    name = os.path.basename(path).lower()
+    return name.endswith(".rules") or name in BASE_FILE_NAMES
+
+
+def _diff_names(before: List[str], after: List[str]) -> Dict[str, List[str]]:
+    before_set = set(before)
+    after_set = set(after)
+    return {
+        "added": [name for name in after if name not in before_set],
+        "resolved": [name for name in before if name not in after_set],
     }
 
 
+class InspectState:
+    """Parsed view of one legacy root that can be updated file by file."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self.include_entries, self.load_calls, self.dispatch_rules = parse_base_files(self.root)
+        self.rules_meta: Dict[str, RuleFileMeta] = {
+            path: parse_rules_meta(path) for path in iter_rules_files(self.root)
+        }
+        self.include_matches = match_includes(self.include_entries, list(self.rules_meta.values()))
+        self.missing = compute_missing(self.include_entries, self.dispatch_rules, self.include_matches)
+
+    def report(self) -> Dict[str, object]:
+        return build_report(
+            self.root,
+            self.include_entries,
+            self.load_calls,
+            self.dispatch_rules,
+            list(self.rules_meta.keys()),
+            list(self.rules_meta.values()),
+        )
+
+    def _apply_rule_file(self, path: str, delta: Dict[str, List[object]]) -> Set[str]:
+        """Refresh one rules file and return the include names whose matches changed."""
+        previous = self.rules_meta.get(path)
+        current = parse_rules_meta(path) if os.path.isfile(path) else None
+        if current is None:
+            if previous is None:
+                return set()
+            del self.rules_meta[path]
+            delta["removed"].append(path)
+        elif previous is None:
+            self.rules_meta[path] = current
+            delta["added"].append(asdict(current))
+        elif previous != current:
+            self.rules_meta[path] = current
+            delta["updated"].append(asdict(current))
+        else:
+            return set()
+
+        touched: Set[str] = set()
+        for entry in self.include_entries:
+            matches = self.include_matches.get(entry.name, [])
+            was_match = path in matches
+            is_match = current is not None and bool(match_include(entry, [current]))
+            if was_match == is_match:
+                continue
+            touched.add(entry.name)
+            if is_match:
+                self.include_matches[entry.name] = matches + [path]
+            else:
+                remaining = [item for item in matches if item != path]
+                if remaining:
+                    self.include_matches[entry.name] = remaining
+                else:
+                    self.include_matches.pop(entry.name, None)
+        return touched
+
+    def apply(self, changed: Optional[Set[str]]) -> Optional[Dict[str, object]]:
+        """Apply a batch of changed paths (None = full rescan) and return a delta, if any."""
+        started = time.perf_counter()
+        before_matches = dict(self.include_matches)
+        before_missing = self.missing
+        rule_delta: Dict[str, List[object]] = {"added": [], "removed": [], "updated": []}
+        touched: Set[str] = set()
+        base_changed: List[str] = []
+
+        if changed is None:
+            self.rebuild()
+            touched = set(before_matches) | set(self.include_matches)
+            base_changed = list(BASE_FILE_NAMES)
+        else:
+            base_names = {
+                os.path.basename(path).lower()
+                for path in changed
+                if os.path.dirname(path) == self.root and os.path.basename(path).lower() in BASE_FILE_NAMES
+            }
+            for path in sorted(changed):
+                if path.lower().endswith(".rules"):
+                    touched |= self._apply_rule_file(path, rule_delta)
+            if base_names:
+                base_changed = sorted(base_names)
+                self.include_entries, self.load_calls, self.dispatch_rules = parse_base_files(self.root)
+                if "base.includes" in base_names:
+                    self.include_matches = match_includes(self.include_entries, list(self.rules_meta.values()))
+                    touched = set(before_matches) | set(self.include_matches)
+
+        self.missing = compute_missing(self.include_entries, self.dispatch_rules, self.include_matches)
+        match_changes = {
+            name: self.include_matches.get(name, [])
+            for name in sorted(touched)
+            if before_matches.get(name, []) != self.include_matches.get(name, [])
+        }
+        missing_delta = {
+            key: _diff_names(before_missing[key], self.missing[key]) for key in self.missing
+        }
+        has_missing_delta = any(diff["added"] or diff["resolved"] for diff in missing_delta.values())
+        if not (any(rule_delta.values()) or base_changed or match_changes or has_missing_delta):
+            return None
+
+        delta: Dict[str, object] = {
+            "type": "delta",
+            "root": self.root,
+            "rule_files": rule_delta,
+            "base_changed": base_changed,
+            "include_matches": match_changes,
+            "missing": missing_delta,
+        }
+        if "base.rules" in base_changed:
+            delta["dispatch_rules"] = [asdict(entry) for entry in self.dispatch_rules]
+        if "base.load" in base_changed:
+            delta["base_load_calls"] = self.load_calls
+        delta["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return delta
+
+
+def watch_root(root: str, force_poll: bool = False, poll_interval: float = 0.25) -> None:
+    state = InspectState(root)
+    watcher = open_watcher(root, is_inspected_file, poll_interval=poll_interval, force_poll=force_poll)
+    snapshot = {"type": "snapshot", "watcher": watcher.kind, **state.report()}
+    sys.stdout.write(json.dumps(snapshot) + "\n")
+    sys.stdout.flush()
+    try:
+        for changed in watcher:
+            delta = state.apply(changed)
+            if delta:
+                sys.stdout.write(json.dumps(delta) + "\n")
+                sys.stdout.flush()
+    finally:
+        watcher.close()
+
+
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("Usage: legacy_rules_inspect.py /path/to/legacy/root_or_file", file=sys.stderr)
-        return 2
-    target = os.path.abspath(sys.argv[1])
-    single_file: Optional[str] = None
-    if os.path.isfile(target):
-        single_file = target
-        root = os.path.dirname(target)
-    else:
-        root = target
+    parser = argparse.ArgumentParser(description="Inspect legacy rules folders or single rules files.")
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        help="Legacy rules root directories, .rules files, or glob patterns",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON record per line instead of a single report document",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Force multi-root mode even for a single target",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Parser pool size for multi-root mode")
+    parser.add_argument(
+        "--lookup-db",
+        help="Extract lookup hash literals from .pl/.rules files into this SQLite store (single target only)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and emit a delta record (JSON lines) whenever watched files change",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="With --watch, poll at this interval instead of using inotify",
+    )
+    args = parser.parse_args()
+    if args.poll is not None and args.poll <= 0:
+        parser.error("--poll must be greater than 0")
+
+    targets = expand_targets(args.targets)
+    if args.batch or len(targets) != 1:
+        if not targets:
+            print("No targets matched", file=sys.stderr)
+            return 1
+        if args.lookup_db or args.watch:
+            print("--lookup-db and --watch support a single target only", file=sys.stderr)
+            return 2
+        batch = inspect_roots(targets, workers=args.workers)
+        if args.ndjson:
+            for report in batch["roots"]:
+                sys.stdout.write(json.dumps({"type": "root_report", **report}) + "\n")
+            sys.stdout.write(json.dumps({"type": "batch_summary", **batch["summary"]}) + "\n")
+            return 0
+        print(json.dumps(batch, indent=2))
+        return 0
+
+    root, single_file = resolve_target(targets[0])
     if not os.path.isdir(root):
         print(f"Directory not found: {root}", file=sys.stderr)
         return 1
-    report = inspect_root(root, single_file=single_file)
+    if args.watch:
+        if single_file:
+            print("--watch requires a directory target", file=sys.stderr)
+            return 2
+        try:
+            watch_root(root, force_poll=args.poll is not None, poll_interval=0.25 if args.poll is None else args.poll)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.ndjson:
+        for record in iter_inspect_records(root, single_file=single_file, lookup_db=args.lookup_db):
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+        return 0
+    report = inspect_root(root, single_file=single_file, lookup_db=args.lookup_db)
     print(json.dumps(report, indent=2))
     return 0
 
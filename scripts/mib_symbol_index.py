@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Parse the SMI modules in a MIB directory once and keep a versioned on-disk
+  `module::name <-> numeric OID` index, so name/OID lookups run in-process instead of
+  through snmptranslate.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/mib_symbol_index.py build --mib-dir /opt/assure1/distrib/mibs
+- /root/navigator/.venv/bin/python /root/navigator/scripts/mib_symbol_index.py lookup IF-MIB::ifOperStatus linkDown.0
+- /root/navigator/.venv/bin/python /root/navigator/scripts/mib_symbol_index.py lookup .1.3.6.1.6.3.1.1.5.3
+- /root/navigator/.venv/bin/python /root/navigator/scripts/mib_symbol_index.py stats
+- from mib_symbol_index import MibSymbolIndex
+  index = MibSymbolIndex.load("/opt/assure1/distrib/mibs")
+  index.oid("axSystemStarted", module="A10-AX-NOTIFICATIONS")
+
+Notes/Environment:
+- Indexed assignments: OBJECT IDENTIFIER values and the OBJECT-TYPE, NOTIFICATION-TYPE,
+  TRAP-TYPE, OBJECT-IDENTITY, MODULE-IDENTITY, *-GROUP, MODULE-COMPLIANCE and
+  AGENT-CAPABILITIES macros. TRAP-TYPE maps to <enterprise>.0.<trap number> (RFC 3584),
+  the same OID snmptranslate prints.
+- Parent references are resolved through each module's own definitions, then its
+  IMPORTS, then the SMI roots (iso, internet, enterprises, ...), then a name defined by
+  exactly one other module. Symbols whose parents never resolve are counted, not indexed.
+- A module defined in several files is taken from the first file in path order.
+- The index is JSON under UA_MIB_INDEX_DIR (default ~/.cache/ua-navigator), keyed by
+  INDEX_VERSION and the MIB dir fingerprint (file paths, sizes, mtimes); any MIB change
+  rebuilds it. Files are parsed on a process pool. load_cached() returns an existing,
+  fresh index without ever building one.
+- Bare names resolve only when every module defining them agrees on the OID; ambiguous
+  or unknown names return None so callers can fall back to snmptranslate.
+- OIDs are returned in snmptranslate -On form (leading dot).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+INDEX_VERSION = 1
+DEFAULT_MIB_DIR = os.getenv("UA_MIB_DIR") or os.getenv("MIBDIRS") or "/opt/assure1/distrib/mibs"
+UA_MIB_INDEX_DIR = os.getenv("UA_MIB_INDEX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ua-navigator"))
+
+NODE_MACROS = {
+    "OBJECT-TYPE",
+    "NOTIFICATION-TYPE",
+    "TRAP-TYPE",
+    "OBJECT-IDENTITY",
+    "MODULE-IDENTITY",
+    "OBJECT-GROUP",
+    "NOTIFICATION-GROUP",
+    "MODULE-COMPLIANCE",
+    "AGENT-CAPABILITIES",
+}
+SMI_ROOTS = {
+    "ccitt": "0",
+    "iso": "1",
+    "joint-iso-ccitt": "2",
+    "org": "1.3",
+    "dod": "1.3.6",
+    "internet": "1.3.6.1",
+    "directory": "1.3.6.1.1",
+    "mgmt": "1.3.6.1.2",
+    "mib-2": "1.3.6.1.2.1",
+    "transmission": "1.3.6.1.2.1.10",
+    "experimental": "1.3.6.1.3",
+    "private": "1.3.6.1.4",
+    "enterprises": "1.3.6.1.4.1",
+    "security": "1.3.6.1.5",
+    "snmpV2": "1.3.6.1.6",
+    "snmpDomains": "1.3.6.1.6.1",
+    "snmpProxys": "1.3.6.1.6.2",
+    "snmpModules": "1.3.6.1.6.3",
+    "zeroDotZero": "0.0",
+}
+
+# Comments, strings and hex/binary literals match without a group, so findall yields "" for them.
+TOKEN_PATTERN = re.compile(
+    r"""
+    "[^"]*"
+    |--[^\n]*?(?:--|$)
+    |'[^']*'[HhBb]?
+    |([A-Za-z](?:\w|-(?!-))*|\d+|::=|\S)
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+SYMBOL_PATTERN = re.compile(r"^(?:([A-Za-z][\w-]*)::)?([A-Za-z][\w-]*)((?:\.\d+)*)$")
+
+
+@dataclass
+class ParsedModule:
+    name: str
+    path: str
+    imports: Dict[str, str] = field(default_factory=dict)
+    # symbol -> (parent reference or None for absolute values, arcs below it)
+    nodes: Dict[str, Tuple[Optional[str], List[str]]] = field(default_factory=dict)
+
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text) if token]
+
+
+def _skip_braces(tokens: List[str], index: int) -> int:
+    """Index just past the brace group opening at tokens[index]."""
+    depth = 0
+    while index < len(tokens):
+        if tokens[index] == "{":
+            depth += 1
+        elif tokens[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def _oid_value(tokens: List[str], index: int) -> Tuple[Optional[Tuple[Optional[str], List[str]]], int]:
+    """Parse `{ parent 1 name(2) 3 }` at tokens[index]; returns ((parent, arcs), next index)."""
+    end = _skip_braces(tokens, index)
+    body = tokens[index + 1 : end - 1]
+    parent: Optional[str] = None
+    arcs: List[str] = []
+    position = 0
+    while position < len(body):
+        token = body[position]
+        if token.isdigit():
+            arcs.append(token)
+        elif body[position + 1 : position + 2] == ["("] and body[position + 2 : position + 3] != [")"]:
+            arcs.append(body[position + 2])
+            position += 3
+        elif not arcs and parent is None and token[0].isalpha():
+            parent = token
+        else:
+            return None, end
+        position += 1
+    if not arcs or not all(arc.isdigit() for arc in arcs):
+        return None, end
+    return (parent, arcs), end
+
+
+def parse_mib_file(path: str) -> List[ParsedModule]:
+    """Every module defined in one MIB file; unreadable or non-SMI files give []."""
+    try:
+        with open(path, "r", encoding="latin-1") as handle:
+            text = handle.read()
+    except OSError:
+        return []
+    if "DEFINITIONS" not in text:
+        return []
+    tokens = _tokens(text)
+    modules: List[ParsedModule] = []
+    module: Optional[ParsedModule] = None
+    index = 0
+    count = len(tokens)
+    while index < count:
+        token = tokens[index]
+        following = tokens[index + 1] if index + 1 < count else ""
+        if module is None:
+            if following == "DEFINITIONS" or (following == "{" and "DEFINITIONS" in tokens[index + 2 : index + 40]):
+                module = ParsedModule(name=token, path=path)
+                modules.append(module)
+                index = tokens.index("DEFINITIONS", index)
+            index += 1
+            continue
+        if following == "MACRO":
+            try:
+                index = tokens.index("END", index) + 1
+            except ValueError:
+                index = count
+            continue
+        if token == "END":
+            module = None
+        elif token == "IMPORTS":
+            index = _parse_imports(tokens, index + 1, module.imports)
+            continue
+        elif token[0].islower() and following == "OBJECT" and tokens[index + 2 : index + 5] == ["IDENTIFIER", "::=", "{"]:
+            value, index = _oid_value(tokens, index + 4)
+            if value:
+                module.nodes.setdefault(token, value)
+            continue
+        elif token[0].islower() and following in NODE_MACROS:
+            index = _parse_macro(tokens, index, module)
+            continue
+        index += 1
+    return modules
+
+
+def _parse_imports(tokens: List[str], index: int, imports: Dict[str, str]) -> int:
+    pending: List[str] = []
+    while index < len(tokens) and tokens[index] != ";":
+        token = tokens[index]
+        if token == "FROM" and index + 1 < len(tokens):
+            for symbol in pending:
+                imports.setdefault(symbol, tokens[index + 1])
+            pending = []
+            index += 2
+            continue
+        if token != ",":
+            pending.append(token)
+        index += 1
+    return index + 1
+
+
+def _parse_macro(tokens: List[str], index: int, module: ParsedModule) -> int:
+    name, macro = tokens[index], tokens[index + 1]
+    enterprise: Optional[str] = None
+    index += 2
+    while index < len(tokens) and tokens[index] != "::=":
+        if tokens[index] == "ENTERPRISE" and index + 1 < len(tokens):
+            enterprise = tokens[index + 1]
+        elif tokens[index] == "END" or (tokens[index + 1 : index + 2] and tokens[index + 1] in NODE_MACROS):
+            return index
+        index += 1
+    if index + 1 >= len(tokens):
+        return index
+    if macro == "TRAP-TYPE":
+        if enterprise and tokens[index + 1].isdigit():
+            module.nodes.setdefault(name, (enterprise, ["0", tokens[index + 1]]))
+        return index + 2
+    if tokens[index + 1] != "{":
+        return index + 1
+    value, index = _oid_value(tokens, index + 1)
+    if value:
+        module.nodes.setdefault(name, value)
+    return index
+
+
+def list_mib_files(mib_dir: str) -> List[str]:
+    paths: List[str] = []
+    for directory in mib_dir.split(os.pathsep):
+        for current_root, dirs, files in os.walk(directory):
+            dirs.sort()
+            paths.extend(os.path.join(current_root, file_name) for file_name in sorted(files))
+    return paths
+
+
+def mib_dir_fingerprint(mib_dir: str, paths: Optional[List[str]] = None) -> str:
+    digest = hashlib.sha1()
+    for path in list_mib_files(mib_dir) if paths is None else paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _Resolver:
+    def __init__(self, modules: Dict[str, ParsedModule]) -> None:
+        self.modules = modules
+        self.memo: Dict[Tuple[str, str], Optional[str]] = {}
+        definers: Dict[str, Set[str]] = {}
+        for module in modules.values():
+            for name in module.nodes:
+                definers.setdefault(name, set()).add(module.name)
+        self.unique_definer = {name: next(iter(names)) for name, names in definers.items() if len(names) == 1}
+
+    def resolve(self, module_name: str, symbol: str, active: Set[Tuple[str, str]]) -> Optional[str]:
+        key = (module_name, symbol)
+        if key in self.memo:
+            return self.memo[key]
+        if key in active:
+            return None
+        active.add(key)
+        oid = self._resolve(module_name, symbol, active)
+        active.discard(key)
+        self.memo[key] = oid
+        return oid
+
+    def _resolve(self, module_name: str, symbol: str, active: Set[Tuple[str, str]]) -> Optional[str]:
+        module = self.modules.get(module_name)
+        if module is not None:
+            node = module.nodes.get(symbol)
+            if node is not None:
+                parent, arcs = node
+                base = self.resolve(module_name, parent, active) if parent else ""
+                if parent and base is None:
+                    return None
+                return ".".join(filter(None, [base, *arcs]))
+            source = module.imports.get(symbol)
+            if source and source in self.modules and symbol in self.modules[source].nodes:
+                return self.resolve(source, symbol, active)
+        if symbol in SMI_ROOTS:
+            return SMI_ROOTS[symbol]
+        owner = self.unique_definer.get(symbol)
+        if owner and owner != module_name:
+            return self.resolve(owner, symbol, active)
+        return None
+
+
+def build_index(mib_dir: str, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Parse every MIB file under mib_dir and resolve all module symbol trees."""
+    started = time.perf_counter()
+    paths = list_mib_files(mib_dir)
+    if workers == 1 or len(paths) < 64:
+        results = [parse_mib_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_mib_file, paths, chunksize=32))
+
+    modules: Dict[str, ParsedModule] = {}
+    duplicates = 0
+    for file_modules in results:
+        for module in file_modules:
+            if module.name in modules:
+                duplicates += 1
+                continue
+            modules[module.name] = module
+
+    resolver = _Resolver(modules)
+    resolved: Dict[str, Dict[str, str]] = {}
+    unresolved = 0
+    for module in modules.values():
+        symbols: Dict[str, str] = {}
+        for symbol in module.nodes:
+            oid = resolver.resolve(module.name, symbol, set())
+            if oid is None:
+                unresolved += 1
+            else:
+                symbols[symbol] = oid
+        if symbols:
+            resolved[module.name] = symbols
+    return {
+        "version": INDEX_VERSION,
+        "fingerprint": mib_dir_fingerprint(mib_dir, paths),
+        "mibDir": mib_dir,
+        "stats": {
+            "files": len(paths),
+            "modules": len(modules),
+            "duplicateModules": duplicates,
+            "symbols": sum(len(symbols) for symbols in resolved.values()),
+            "unresolved": unresolved,
+            "buildSeconds": round(time.perf_counter() - started, 3),
+        },
+        "modules": resolved,
+    }
+
+
+def default_index_path(mib_dir: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.abspath(mib_dir)).strip("_")
+    return os.path.join(UA_MIB_INDEX_DIR, f"mib-index-{safe}.json")
+
+
+class MibSymbolIndex:
+    """In-memory `module::name <-> OID` maps loaded from a built index."""
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.stats: Dict[str, Any] = payload.get("stats", {})
+        self.fingerprint: str = payload.get("fingerprint", "")
+        self._qualified: Dict[str, str] = {}
+        self._bare: Dict[str, Optional[str]] = {}
+        self._names: Dict[str, str] = {}
+        for module_name in sorted(payload.get("modules", {})):
+            for symbol, oid in payload["modules"][module_name].items():
+                self._qualified[f"{module_name}::{symbol}"] = oid
+                self._names.setdefault(oid, f"{module_name}::{symbol}")
+                if symbol not in self._bare:
+                    self._bare[symbol] = oid
+                elif self._bare[symbol] != oid:
+                    self._bare[symbol] = None
+        self._max_arcs = max((oid.count(".") + 1 for oid in self._names), default=0)
+
+    @classmethod
+    def load(
+        cls,
+        mib_dir: str = DEFAULT_MIB_DIR,
+        index_path: Optional[str] = None,
+        rebuild: bool = False,
+        workers: Optional[int] = None,
+    ) -> "MibSymbolIndex":
+        """Load the index for mib_dir, rebuilding it when missing, stale or of another version."""
+        index_path = index_path or default_index_path(mib_dir)
+        if not rebuild:
+            cached = cls.load_cached(mib_dir, index_path)
+            if cached is not None:
+                return cached
+        payload = build_index(mib_dir, workers)
+        try:
+            os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path) or ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+        return cls(payload)
+
+    @classmethod
+    def load_cached(cls, mib_dir: str = DEFAULT_MIB_DIR, index_path: Optional[str] = None) -> Optional["MibSymbolIndex"]:
+        """The on-disk index for mib_dir if it exists and matches the current MIB files, else None."""
+        try:
+            with open(index_path or default_index_path(mib_dir), "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != INDEX_VERSION or payload.get("fingerprint") != mib_dir_fingerprint(mib_dir):
+            return None
+        return cls(payload)
+
+    def __len__(self) -> int:
+        return len(self._qualified)
+
+    def oid(self, target: str, module: Optional[str] = None) -> Optional[str]:
+        """Numeric OID for `name`, `module::name` or either with a `.N` instance suffix."""
+        match = SYMBOL_PATTERN.match(target.strip())
+        if not match:
+            return None
+        qualifier, symbol, suffix = match.groups()
+        qualifier = qualifier or module
+        oid = self._qualified.get(f"{qualifier}::{symbol}") if qualifier else None
+        if oid is None and not match.group(1):
+            oid = self._bare.get(symbol)
+        return f".{oid}{suffix}" if oid else None
+
+    def name(self, oid: str) -> Optional[str]:
+        """`module::name[.suffix]` of the longest indexed prefix of a numeric OID."""
+        arcs = oid.strip().strip(".").split(".")
+        for length in range(min(len(arcs), self._max_arcs), 0, -1):
+            found = self._names.get(".".join(arcs[:length]))
+            if found:
+                suffix = "".join(f".{arc}" for arc in arcs[length:])
+                return f"{found}{suffix}"
+        return None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._qualified.items())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Native MIB module::name <-> OID index.")
+    parser.add_argument("--mib-dir", default=DEFAULT_MIB_DIR)
+    parser.add_argument("--index", help="Index file path (default under UA_MIB_INDEX_DIR)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = sub.add_parser("build", help="(Re)build the index")
+    build_parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+
+    lookup_parser = sub.add_parser("lookup", help="Resolve names to OIDs or OIDs to names")
+    lookup_parser.add_argument("targets", nargs="+", help="name, module::name or numeric OID")
+    lookup_parser.add_argument("--module", help="Module for bare names")
+
+    sub.add_parser("stats", help="Show index build statistics")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = MibSymbolIndex.load(args.mib_dir, args.index, rebuild=True, workers=args.workers)
+        print(json.dumps(index.stats, indent=2))
+        return 0
+
+    index = MibSymbolIndex.load(args.mib_dir, args.index)
+    if args.command == "stats":
+        print(json.dumps(index.stats, indent=2))
+        return 0
+
+    missing = 0
+    for target in args.targets:
+        started = time.perf_counter()
+        if re.fullmatch(r"\.?\d+(?:\.\d+)*", target.strip()):
+            result = {"oid": target, "name": index.name(target)}
+            missing += result["name"] is None
+        else:
+            result = {"name": target, "oid": index.oid(target, args.module)}
+            missing += result["oid"] is None
+        result["elapsedMs"] = round((time.perf_counter() - started) * 1000, 4)
+        print(json.dumps(result))
+    return 3 if missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,6 +10,9 @@ For client cert auth:
   python3 scripts/redeploy_fcom_processor.py \
     --base-url https://ua-host:8443/api \
     --cert /path/cert.pem --key /path/key.pem --ca-cert /path/ca.pem
+
+Clusters, namespaces, installed charts and catalogs come from the topology cache shared with
+scripts/ua_api_helper.py (see scripts/ua_topology.py); pass --refresh-topology to bypass it.
 """
 
 import argparse
@@ -22,6 +25,8 @@ try:
 except ImportError as exc:  # pragma: no cover
     raise SystemExit("Missing dependency: requests. Install with 'pip install requests'.") from exc
 
+from ua_topology import HintIndex, invalidate_topology, load_topology
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Redeploy FCOM Processor via UA APIs")
@@ -39,9 +44,7 @@ def parse_args() -> argparse.Namespace:
         "--match-hints",
         help="Comma-separated fallback match hints (e.g. fcom-processor,\"fcom processor\")",
     )
-    parser.add_argument("--page", type=int, default=1, help="Installed charts page")
-    parser.add_argument("--start", type=int, default=0, help="Installed charts start")
-    parser.add_argument("--limit", type=int, default=25, help="Installed charts limit")
+    parser.add_argument("--refresh-topology", action="store_true", help="Ignore the cached topology snapshot")
     return parser.parse_args()
 
 
@@ -86,31 +89,6 @@ def request_json(
     return data
 
 
-def pick_cluster(data: Any, preferred: str = "primary-cluster") -> Optional[str]:
-    if isinstance(data, dict):
-        data = data.get("data")
-    if not isinstance(data, list):
-        return None
-    names = []
-    for entry in data:
-        if not isinstance(entry, dict):
-            continue
-        name = (
-            entry.get("name")
-            or entry.get("Name")
-            or entry.get("cluster")
-            or entry.get("Cluster")
-            or entry.get("ClusterName")
-        )
-        if isinstance(name, str) and name.strip():
-            names.append(name.strip())
-    if not names:
-        return None
-    if preferred in names:
-        return preferred
-    return names[0]
-
-
 def extract_custom_values(result: Dict[str, Any]) -> Optional[str]:
     candidates = [
         result.get("CustomValues"),
@@ -153,10 +131,12 @@ def normalize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def pick_entry_value(entry: Dict[str, Any], keys: Tuple[str, ...]) -> str:
-    normalized = normalize_entry(entry)
+    normalized = None
     for key in keys:
         if key in entry and entry[key] is not None:
             return str(entry[key])
+        if normalized is None:
+            normalized = normalize_entry(entry)
         lower = key.lower()
         if lower in normalized and normalized[lower] is not None:
             return str(normalized[lower])
@@ -175,18 +155,6 @@ def parse_chart_info(chart: str, app_version: str) -> Tuple[str, str]:
     return chart, version
 
 
-def matches_target(entry: Dict[str, Any], target: str) -> bool:
-    if not target:
-        return False
-    target = target.lower()
-    candidates = [
-        pick_entry_value(entry, ("ReleaseName", "releaseName", "release_name")),
-        pick_entry_value(entry, ("Helmchart", "helmchart", "chart", "chartName", "helmChart")),
-        pick_entry_value(entry, ("Name", "name")),
-    ]
-    return any(target in value.lower() for value in candidates if value)
-
-
 def format_target_entry(entry: Dict[str, Any]) -> str:
     name = pick_entry_value(entry, ("ReleaseName", "releaseName", "release_name", "name")) or "unknown"
     namespace = pick_entry_value(entry, ("Namespace", "namespace")) or "unknown"
@@ -200,47 +168,9 @@ def format_target_entry(entry: Dict[str, Any]) -> str:
     )
 
 
-def fetch_catalog_entries(
-    session: requests.Session,
-    base_url: str,
-    limit: int = 500,
-) -> list[Dict[str, Any]]:
-    entries: list[Dict[str, Any]] = []
-    start = 0
-    while True:
-        result = request_json(
-            session,
-            "GET",
-            f"{base_url}/microservice/Catalogs",
-            params={"start": start, "limit": limit},
-        )
-        data = result.get("data")
-        batch: list[Dict[str, Any]] = []
-        if isinstance(data, list):
-            batch = [entry for entry in data if isinstance(entry, dict)]
-        elif isinstance(data, dict):
-            nested = data.get("data")
-            if isinstance(nested, list):
-                batch = [entry for entry in nested if isinstance(entry, dict)]
-        if not batch:
-            break
-        entries.extend(batch)
-        if len(batch) < limit:
-            break
-        start += limit
-    return entries
-
-
-def matches_catalog_target(entry: Dict[str, Any], target: str) -> bool:
-    if not target:
-        return False
-    name = pick_entry_value(entry, ("name", "Name", "chart", "Chart", "helmchart", "Helmchart"))
-    return bool(name) and target.lower() in name.lower()
-
-
 def build_required_status(
-    installed: list[Dict[str, Any]],
-    catalogs: list[Dict[str, Any]],
+    installed: HintIndex,
+    catalogs: HintIndex,
 ) -> tuple[list[Dict[str, Any]], list[str]]:
     required = [
         {"key": "trap-collector", "label": "Trap Collector", "hints": ["trap-collector", "trap collector"]},
@@ -251,14 +181,8 @@ def build_required_status(
     missing: list[str] = []
     for item in required:
         hints = [hint.lower() for hint in item["hints"]]
-        installed_match = next(
-            (entry for entry in installed if any(matches_target(entry, hint) for hint in hints)),
-            None,
-        )
-        catalog_match = next(
-            (entry for entry in catalogs if any(matches_catalog_target(entry, hint) for hint in hints)),
-            None,
-        )
+        installed_match = installed.first(hints)
+        catalog_match = catalogs.first(hints)
         entry_status = {
             "name": item["key"],
             "label": item["label"],
@@ -271,72 +195,26 @@ def build_required_status(
     return status, missing
 
 
-def fetch_installed_entries(
-    session: requests.Session,
-    base_url: str,
-    limit: int,
-    max_pages: int = 25,
-) -> list[Dict[str, Any]]:
-    entries: list[Dict[str, Any]] = []
-    for page in range(1, max_pages + 1):
-        start = (page - 1) * limit
-        installed = request_json(
-            session,
-            "GET",
-            f"{base_url}/microservice/Deploy/readForInstalled",
-            params={"page": page, "start": start, "limit": limit},
-        )
-        data = installed.get("data")
-        if not isinstance(data, list) or not data:
-            break
-        entries.extend([entry for entry in data if isinstance(entry, dict)])
-        if len(data) < limit:
-            break
-    return entries
-
-
 def main() -> None:
     args = parse_args()
     session = get_session(args)
     base_url = args.base_url.rstrip("/")
 
-    clusters_url = f"{base_url}/microservice/Clusters"
-    clusters = request_json(session, "GET", clusters_url, params={"start": 0, "limit": 100})
+    topology = load_topology(
+        lambda path, params: request_json(session, "GET", f"{base_url}{path}", params=params),
+        base_url,
+        refresh=args.refresh_topology,
+    )
     cluster_override = args.cluster.strip() if isinstance(args.cluster, str) else ""
-    cluster_name = cluster_override or pick_cluster(clusters)
+    cluster_name = cluster_override or topology.default_cluster()
     if not cluster_name:
-        exit_error("No clusters found", clusters)
-    if cluster_override:
-        cluster_entries = clusters.get("data") if isinstance(clusters, dict) else None
-        cluster_names = set()
-        if isinstance(cluster_entries, list):
-            for entry in cluster_entries:
-                if isinstance(entry, dict):
-                    name = pick_entry_value(entry, ("ClusterName", "cluster", "Cluster", "name", "Name"))
-                    if name:
-                        cluster_names.add(name)
-        if cluster_names and cluster_override not in cluster_names:
-            exit_error("Provided cluster not found", {"cluster": cluster_override, "clusters": list(cluster_names)})
-
-    namespaces_url = f"{base_url}/microservice/Deploy/readClusterData"
-    namespaces = request_json(
-        session,
-        "GET",
-        namespaces_url,
-        params={"Cluster": cluster_name, "start": 0, "limit": 200},
-    )
-    namespace_list = []
-    data = namespaces.get("data")
-    if isinstance(data, list):
-        for entry in data:
-            if isinstance(entry, dict):
-                name = entry.get("name") or entry.get("Name") or entry.get("namespace")
-                if isinstance(name, str) and name.strip():
-                    namespace_list.append(name.strip())
-            elif isinstance(entry, str) and entry.strip():
-                namespace_list.append(entry.strip())
+        exit_error("No clusters found", {"clusters": topology.clusters})
+    if cluster_override and topology.cluster_names and cluster_override not in topology.cluster_names:
+        exit_error("Provided cluster not found", {"cluster": cluster_override, "clusters": topology.clusters})
+
+    namespace_list = topology.namespaces(cluster_name)
     if not namespace_list:
-        exit_error("No namespaces found for cluster", namespaces)
+        exit_error("No namespaces found for cluster", {"cluster": cluster_name})
     namespace_override = args.namespace.strip() if isinstance(args.namespace, str) else ""
     if namespace_override and namespace_override not in namespace_list:
         exit_error("Provided namespace not found in cluster namespaces", {
@@ -344,23 +222,16 @@ def main() -> None:
             "namespaces": namespace_list,
         })
 
-    entries = fetch_installed_entries(session, base_url, max(args.limit, 1))
+    entries = topology.installed
     if not entries:
         exit_error("No installed Helm charts found", {"cluster": cluster_name})
 
-    catalogs = fetch_catalog_entries(session, base_url)
-    required_status, required_missing = build_required_status(entries, catalogs)
+    required_status, required_missing = build_required_status(topology.installed_index, topology.catalog_index)
     if required_missing:
         print("Warning: missing required microservices for trap collection")
         print(json.dumps({"required": required_status, "missing": required_missing}, indent=2))
 
-    target = None
-    for entry in entries:
-        if namespace_override and pick_entry_value(entry, ("Namespace", "namespace")) != namespace_override:
-            continue
-        if matches_target(entry, args.release.lower()):
-            target = entry
-            break
+    target = topology.find_installed(args.release, namespace_override)
 
     if not target:
         hint_values = []
@@ -368,12 +239,7 @@ def main() -> None:
             hint_values = [value.strip().lower() for value in args.match_hints.split(",") if value.strip()]
         if not hint_values:
             hint_values = ["fcom-processor", "fcom processor"]
-        hinted = [
-            entry
-            for entry in entries
-            if (not namespace_override or pick_entry_value(entry, ("Namespace", "namespace")) == namespace_override)
-            and any(matches_target(entry, hint) for hint in hint_values)
-        ]
+        hinted = topology.installed_index.matching(hint_values, namespace_override)
         if len(hinted) == 1:
             target = hinted[0]
         else:
@@ -382,11 +248,7 @@ def main() -> None:
                 print(f"- {format_target_entry(entry)}")
             if not hinted:
                 print("- (no matches for hints)")
-            catalog_hints = [
-                entry
-                for entry in catalogs
-                if any(matches_catalog_target(entry, hint) for hint in hint_values)
-            ]
+            catalog_hints = topology.catalog_index.matching(hint_values)
             if catalog_hints:
                 print("Available in catalog:")
                 for entry in catalog_hints[:20]:
@@ -429,6 +291,7 @@ def main() -> None:
         exit_error("Missing CustomValues for fcom-processor", values_result)
 
     delete_url = f"{base_url}/microservice/deploy/{deploy_id}"
+    invalidate_topology(base_url)
     delete_result = request_json(session, "DELETE", delete_url)
     if not delete_result.get("success"):
         exit_error("Failed to uninstall fcom-processor", delete_result)
@@ -1,25 +1,71 @@
 #!/usr/bin/env python3
+"""
+Purpose:
+- Test snmptranslate resolution for MIB objects, one name at a time or in bulk.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/test_snmptranslate.py --name A10-AX-NOTIFICATIONS::axSystemStarted
+- /root/navigator/.venv/bin/python /root/navigator/scripts/test_snmptranslate.py --batch names.txt > resolved.jsonl
+- cat names.txt | /root/navigator/.venv/bin/python /root/navigator/scripts/test_snmptranslate.py --batch - --workers 4
+
+Notes/Environment:
+- UA_MIB_DIR / MIBDIRS (default /opt/assure1/distrib/mibs), MIBS, UA_SNMP_TRANSLATE_CMD.
+- --batch looks names up in the native MIB index first (scripts/mib_symbol_index.py, built
+  on first use and rebuilt when the MIB dir changes); snmptranslate only runs for names the
+  index cannot resolve, or for every name with --no-index.
+- --name always runs snmptranslate unless --use-index is given; it then answers from an
+  already built, up-to-date index (never building one) and falls back to snmptranslate.
+- --batch reads one name (or module::name) per line and prints one JSON line per name plus
+  a summary (index/cache hits, snmptranslate invocations, names/sec) on stderr.
+- Batch names are resolved by multi-argument snmptranslate invocations (--batch-size names
+  each, --workers in parallel), so the MIB directory is parsed once per batch instead of
+  once per name. snmptranslate prints nothing for names it cannot resolve; a batch whose
+  output does not line up with its inputs is split in half and retried down to single names.
+- Results, failures included, are cached in SQLite under UA_SNMP_TRANSLATE_CACHE_DIR (default
+  ~/.cache/ua-navigator), keyed by MIB dir fingerprint (file names, sizes, mtimes), the
+  resolved snmptranslate binary path, -m module, MIBS and name. Any MIB change invalidates the whole cache; --no-cache bypasses it.
+- A timed-out batch is halved and retried; a name that still times out, or a binary that
+  cannot be started, is reported with returncode null, the error in stderr and
+  "transient": true, and is not cached.
+"""
 import argparse
 import json
 import os
+import shutil
+import sqlite3
 import subprocess
-from typing import Any
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
 
+from mib_symbol_index import MibSymbolIndex, mib_dir_fingerprint
 
-def run_snmptranslate(binary: str, mib_dir: str, module: str | None, mibs: str | None, target: str) -> dict[str, Any]:
-    args = [binary, "-On", "-M", mib_dir]
-    if module:
-        args.extend(["-m", module])
-    args.append(target)
+DEFAULT_BATCH_SIZE = 200
+CACHE_SCHEMA_VERSION = 2
+UA_SNMP_TRANSLATE_CACHE_DIR = os.getenv(
+    "UA_SNMP_TRANSLATE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ua-navigator")
+)
 
+
+def _snmptranslate_env(mib_dir: str, mibs: str | None) -> dict[str, str]:
     env = os.environ.copy()
     env["MIBDIRS"] = mib_dir
     if mibs is not None:
         env["MIBS"] = mibs
+    return env
+
+
+def run_snmptranslate(binary: str, mib_dir: str, module: str | None, mibs: str | None, target: str) -> dict[str, Any]:
+    args = [binary, "-On", "-M", mib_dir]
+    if module:
+        args.extend(["-m", module])
+    args.append(target)
 
     result = subprocess.run(
         args,
-        env=env,
+        env=_snmptranslate_env(mib_dir, mibs),
         text=True,
         capture_output=True,
         timeout=8,
@@ -32,17 +78,267 @@ def run_snmptranslate(binary: str, mib_dir: str, module: str | None, mibs: str |
     }
 
 
+def run_snmptranslate_batch(
+    binary: str,
+    mib_dir: str,
+    module: str | None,
+    mibs: str | None,
+    targets: list[str],
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """Resolve many targets with as few snmptranslate invocations as possible; returns (results, runs)."""
+    if len(targets) == 1:
+        try:
+            return {targets[0]: run_snmptranslate(binary, mib_dir, module, mibs, targets[0])}, 1
+        except (subprocess.TimeoutExpired, OSError) as exc:
+            return {targets[0]: _transient_failure(targets[0], exc)}, 1
+
+    args = [binary, "-On", "-M", mib_dir]
+    if module:
+        args.extend(["-m", module])
+    args.extend(targets)
+    try:
+        result = subprocess.run(
+            args,
+            env=_snmptranslate_env(mib_dir, mibs),
+            text=True,
+            capture_output=True,
+            timeout=8 + 0.05 * len(targets),
+        )
+    except subprocess.TimeoutExpired:
+        # Usually one slow name; halve the batch until it is isolated.
+        return _split_batch(binary, mib_dir, module, mibs, targets)
+    except OSError as exc:
+        # Missing or unexecutable binary: retrying smaller batches cannot help.
+        return {target: _transient_failure(target, exc) for target in targets}, 1
+    lines = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    pending = set(targets)
+    if len(lines) == len(targets):
+        return {
+            target: {"target": target, "returncode": 0, "stdout": line, "stderr": ""}
+            for target, line in zip(targets, lines)
+        }, 1
+
+    # snmptranslate reports each unresolvable name on stderr as "<name>: <error>" and prints
+    # nothing on stdout for it; drop those names and the rest line up again.
+    errors: dict[str, str] = {}
+    for line in result.stderr.splitlines():
+        target, separator, _message = line.partition(": ")
+        if separator and target in pending:
+            errors.setdefault(target, line.strip())
+    if errors and len(lines) + len(errors) == len(targets):
+        resolved = iter(lines)
+        return {
+            target: (
+                {"target": target, "returncode": result.returncode, "stdout": "", "stderr": errors[target]}
+                if target in errors
+                else {"target": target, "returncode": 0, "stdout": next(resolved), "stderr": ""}
+            )
+            for target in targets
+        }, 1
+
+    # Output we cannot attribute to names: split and retry.
+    return _split_batch(binary, mib_dir, module, mibs, targets)
+
+
+def _split_batch(
+    binary: str,
+    mib_dir: str,
+    module: str | None,
+    mibs: str | None,
+    targets: list[str],
+) -> tuple[dict[str, dict[str, Any]], int]:
+    middle = len(targets) // 2
+    results, left_runs = run_snmptranslate_batch(binary, mib_dir, module, mibs, targets[:middle])
+    right, right_runs = run_snmptranslate_batch(binary, mib_dir, module, mibs, targets[middle:])
+    results.update(right)
+    return results, 1 + left_runs + right_runs
+
+
+def _transient_failure(target: str, exc: Exception) -> dict[str, Any]:
+    """Error result for a run that never completed; it is reported but not cached."""
+    if isinstance(exc, subprocess.TimeoutExpired):
+        message = f"snmptranslate timed out after {exc.timeout:g}s"
+    else:
+        message = f"snmptranslate failed to run: {exc}"
+    return {"target": target, "returncode": None, "stdout": "", "stderr": message, "transient": True}
+
+
+class TranslateCache:
+    """On-disk snmptranslate results keyed by (MIB fingerprint, binary, module, MIBS, target)."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or os.path.join(UA_SNMP_TRANSLATE_CACHE_DIR, "snmptranslate-cache.sqlite")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS translations")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                fingerprint TEXT NOT NULL,
+                binary TEXT NOT NULL,
+                module TEXT NOT NULL,
+                mibs TEXT NOT NULL,
+                target TEXT NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (fingerprint, binary, module, mibs, target)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(f"PRAGMA user_version={CACHE_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get_many(
+        self, fingerprint: str, binary: str, module: str, mibs: str, targets: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for offset in range(0, len(targets), 500):
+                chunk = targets[offset : offset + 500]
+                rows = self._conn.execute(
+                    "SELECT target, result FROM translations WHERE fingerprint = ? AND binary = ? AND module = ? "
+                    f"AND mibs = ? AND target IN ({','.join('?' * len(chunk))})",
+                    (fingerprint, binary, module, mibs, *chunk),
+                )
+                found.update((target, json.loads(result)) for target, result in rows)
+        return found
+
+    def put_many(
+        self, fingerprint: str, binary: str, module: str, mibs: str, results: Iterable[dict[str, Any]]
+    ) -> None:
+        rows = [
+            (fingerprint, binary, module, mibs, result["target"], json.dumps(result))
+            for result in results
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+
+def binary_cache_key(binary: str) -> str:
+    """Resolved path of the snmptranslate binary, so switching binaries never reuses results."""
+    return os.path.realpath(shutil.which(binary) or binary)
+
+
+def resolve_names(
+    targets: list[str],
+    binary: str,
+    mib_dir: str,
+    module: str | None,
+    mibs: str | None,
+    workers: int = 4,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: TranslateCache | None = None,
+    index: MibSymbolIndex | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    """Resolve targets through the MIB index and the cache, then batched snmptranslate runs in parallel."""
+    started = time.perf_counter()
+    unique = list(dict.fromkeys(targets))
+    results: dict[str, dict[str, Any]] = {}
+    for target in unique if index else ():
+        result = _index_result(index, target, module)
+        if result:
+            results[target] = result
+    index_hits = len(results)
+    missing = [target for target in unique if target not in results]
+    fingerprint = mib_dir_fingerprint(mib_dir) if cache and missing else ""
+    binary_key = binary_cache_key(binary) if cache and missing else ""
+    cached = cache.get_many(fingerprint, binary_key, module or "", mibs or "", missing) if cache and missing else {}
+    results.update(cached)
+    missing = [target for target in missing if target not in cached]
+
+    invocations = 0
+    batches = [missing[offset : offset + max(1, batch_size)] for offset in range(0, len(missing), max(1, batch_size))]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_snmptranslate_batch, binary, mib_dir, module, mibs, batch) for batch in batches]
+        for future in futures:
+            resolved, runs = future.result()
+            invocations += runs
+            if cache:
+                cache.put_many(
+                    fingerprint,
+                    binary_key,
+                    module or "",
+                    mibs or "",
+                    (r for r in resolved.values() if not r.get("transient")),
+                )
+            results.update(resolved)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "names": len(unique),
+        "resolved": sum(1 for result in results.values() if result["returncode"] == 0 and result["stdout"]),
+        "indexHits": index_hits,
+        "cacheHits": len(cached),
+        "invocations": invocations,
+        "seconds": round(elapsed, 3),
+        "namesPerSecond": round(len(unique) / elapsed, 1) if elapsed > 0 else None,
+    }
+    return results, summary
+
+
+def _index_result(index: MibSymbolIndex, target: str, module: str | None) -> dict[str, Any] | None:
+    oid = index.oid(target, module)
+    if oid is None:
+        return None
+    return {"target": target, "returncode": 0, "stdout": oid, "stderr": "", "source": "index"}
+
+
+def _read_names(source: str) -> list[str]:
+    handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.startswith("#")]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _batch_target(name: str, module: str | None) -> str:
+    return name if "::" in name or not module else f"{module}::{name}"
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Test snmptranslate resolution for a MIB object.")
-    parser.add_argument("--name", required=True, help="Object name (or module::name).")
+    parser.add_argument("--name", help="Object name (or module::name).")
+    parser.add_argument("--batch", help="File with one name per line ('-' for stdin); prints JSON lines.")
     parser.add_argument("--module", help="MIB module name, e.g. A10-AX-NOTIFICATIONS.")
     parser.add_argument("--mib-dir", default=os.getenv("UA_MIB_DIR") or os.getenv("MIBDIRS") or "/opt/assure1/distrib/mibs")
     parser.add_argument("--mibs", default=os.getenv("MIBS"), help="Optional MIBS search list.")
     parser.add_argument("--binary", default=os.getenv("UA_SNMP_TRANSLATE_CMD", "snmptranslate"))
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Parallel snmptranslate runs.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Names per snmptranslate run.")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk result cache.")
+    parser.add_argument("--no-index", action="store_true", help="--batch: skip the native MIB index.")
+    parser.add_argument("--use-index", action="store_true", help="--name: try an existing, fresh MIB index first.")
     args = parser.parse_args()
 
-    name = args.name.strip()
+    if not args.name and not args.batch:
+        parser.error("--name or --batch is required")
     module = args.module.strip() if args.module else None
+
+    if args.batch:
+        index = None if args.no_index else MibSymbolIndex.load(args.mib_dir)
+        names = _read_names(args.batch)
+        cache = None if args.no_cache else TranslateCache()
+        try:
+            targets = [_batch_target(name, module) for name in names]
+            results, summary = resolve_names(
+                targets, args.binary, args.mib_dir, module, args.mibs, args.workers, args.batch_size, cache, index
+            )
+        finally:
+            if cache:
+                cache.close()
+        for name, target in zip(names, targets):
+            result = results[target]
+            print(json.dumps({"name": name, "oid": result["stdout"] or None, **result}))
+        print(json.dumps(summary), file=sys.stderr)
+        return 0
+
+    name = args.name.strip()
     candidates = []
     if "::" in name:
         candidates.append(name)
@@ -51,7 +347,12 @@ def main() -> int:
             candidates.append(f"{module}::{name}")
         candidates.append(name)
 
-    results = [run_snmptranslate(args.binary, args.mib_dir, module, args.mibs, target) for target in candidates]
+    index = MibSymbolIndex.load_cached(args.mib_dir) if args.use_index else None
+    results = [
+        (index and _index_result(index, target, module))
+        or run_snmptranslate(args.binary, args.mib_dir, module, args.mibs, target)
+        for target in candidates
+    ]
 
     payload = {
         "binary": args.binary,
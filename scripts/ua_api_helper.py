@@ -11,32 +11,78 @@ Usage:
 - ./scripts/ua_api_helper.py check-trap-chain
 - ./scripts/ua_api_helper.py deploy-service name=fcom-processor
 - ./scripts/ua_api_helper.py redeploy-service name=fcom-processor
+- ./scripts/ua_api_helper.py redeploy-batch names=fcom-processor,fcom-processor-* parallel=4 timeout=300
 
 Notes/Environment:
 - Uses HTTPS with optional TLS verification disabled.
 - Credentials and host are defined in this file.
 - Optional overrides: FCOM_PROCESSOR_RELEASE_NAME, FCOM_PROCESSOR_NAMESPACE,
   FCOM_PROCESSOR_CLUSTER, FCOM_PROCESSOR_MATCH_HINTS (comma-separated).
+- UA_MAX_CONCURRENCY bounds parallel UA requests (default 8); check-trap-chain fetches
+  installed charts, catalogs and workloads concurrently.
+- get_trap_chain_status() returns the check-trap-chain payload for in-process callers
+  (see scripts/ua_trap_chain_monitor.py for the long-running monitor).
+- redeploy-batch redeploys every matching release (exact name, glob, or first substring
+  match) in waves of `parallel`; each wave waits for its workloads to report ready
+  (readForTree polled with exponential backoff, the first poll also delayed so the old
+  workload is not mistaken for the new one) before the next starts. Each target's namespace
+  is checked against its own cluster. Per-release
+  uninstall/deploy/ready timings are reported; a failed or timed-out wave skips the rest
+  unless continue_on_error=true. UA_REDEPLOY_READY_TIMEOUT sets the default timeout (300s).
+- deploy-service, redeploy-service, redeploy-fcom and redeploy-batch resolve clusters,
+  namespaces, releases and catalog charts from the cached topology in scripts/ua_topology.py
+  (UA_TOPOLOGY_TTL, default 60s); the cache is dropped after every install/uninstall.
+- Requests reuse keep-alive connections per host (scripts/ua_servers.py).
+- Fan-out across several UA servers (read-only commands only):
+    ./scripts/ua_api_helper.py --servers servers.json check-trap-chain
+    ./scripts/ua_api_helper.py --servers servers.json override-counts
+    ./scripts/ua_api_helper.py --servers servers.json device-probe limit=200 snmp_only=true
+    ./scripts/ua_api_helper.py --servers servers.json --deadline 30 GET /microservice/Clusters limit=5
+  Results are merged into one JSON report keyed by server_id. UA_SERVERS_FILE can replace
+  --servers and UA_FANOUT_DEADLINE sets the default global deadline (60s).
 """
 
 from __future__ import annotations
 
 import base64
+import fnmatch
 import json
 import os
-import ssl
 import sys
+import time
 import urllib.parse
-import urllib.request
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from ua_servers import UAServer, current_server, load_inventory, request_json, run_on_servers, submit_in_context
+from ua_topology import (
+    CATALOG_MATCH_FIELDS,
+    INSTALLED_MATCH_FIELDS,
+    HintIndex,
+    Topology,
+    invalidate_topology,
+    load_topology,
+)
 
 UA_HOST = "lab-ua-tony02.tony.lab"
 UA_PORT = 443
 UA_USERNAME = "admin"
 UA_PASSWORD = "admin"
 UA_INSECURE_TLS = True
+UA_MAX_CONCURRENCY = max(1, int(os.getenv("UA_MAX_CONCURRENCY", "8")))
+UA_FANOUT_DEADLINE = float(os.getenv("UA_FANOUT_DEADLINE", "60"))
+UA_REDEPLOY_READY_TIMEOUT = float(os.getenv("UA_REDEPLOY_READY_TIMEOUT", "300"))
 
 BASE_URL = f"https://{UA_HOST}:{UA_PORT}/api"
+DEFAULT_SERVER = UAServer(
+    server_id=UA_HOST,
+    hostname=UA_HOST,
+    port=UA_PORT,
+    username=UA_USERNAME,
+    password=UA_PASSWORD,
+    insecure_tls=UA_INSECURE_TLS,
+    max_concurrency=UA_MAX_CONCURRENCY,
+)
 
 FCOM_PROCESSOR_RELEASE_NAME = os.getenv("FCOM_PROCESSOR_RELEASE_NAME", "fcom-processor")
 FCOM_PROCESSOR_HELM_CHART = os.getenv("FCOM_PROCESSOR_HELM_CHART", "fcom-processor")
@@ -45,25 +91,42 @@ FCOM_PROCESSOR_CLUSTER = os.getenv("FCOM_PROCESSOR_CLUSTER", "")
 FCOM_PROCESSOR_MATCH_HINTS = os.getenv("FCOM_PROCESSOR_MATCH_HINTS", "")
 
 
-def _build_headers() -> dict[str, str]:
-    token = base64.b64encode(f"{UA_USERNAME}:{UA_PASSWORD}".encode("utf-8")).decode("ascii")
+def _build_headers(server: UAServer | None = None) -> dict[str, str]:
+    username = server.username if server else UA_USERNAME
+    password = server.password if server else UA_PASSWORD
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
     return {
         "Authorization": f"Basic {token}",
         "Accept": "application/json",
     }
 
 
+RequestObserver = Callable[[str, str, float, bool], None]
+_request_observers: list[RequestObserver] = []
+
+
+def add_request_observer(observer: RequestObserver) -> None:
+    """Register a callback(method, path, seconds, ok) invoked after every ua_request."""
+    _request_observers.append(observer)
+
+
 def ua_request(method: str, path: str, params: dict[str, str] | None = None) -> dict:
+    server = current_server() or DEFAULT_SERVER
     query = urllib.parse.urlencode(params or {})
-    url = f"{BASE_URL}{path}"
+    target = f"{server.base_path}{path}"
     if query:
-        url = f"{url}?{query}"
-    headers = _build_headers()
-    context = ssl._create_unverified_context() if UA_INSECURE_TLS else None
-    req = urllib.request.Request(url, headers=headers, method=method.upper())
-    with urllib.request.urlopen(req, context=context, timeout=20) as resp:
-        data = resp.read().decode("utf-8")
-    return json.loads(data)
+        target = f"{target}?{query}"
+    started = time.perf_counter()
+    ok = False
+    try:
+        payload = request_json(server, method, target, _build_headers(server))
+        ok = True
+    finally:
+        if _request_observers:
+            elapsed = time.perf_counter() - started
+            for observer in _request_observers:
+                observer(method.upper(), path, elapsed, ok)
+    return payload
 
 
 def _extract_installed_entries(result: dict[str, Any]) -> list[dict[str, Any]]:
@@ -130,10 +193,12 @@ def _normalize_entry(entry: dict[str, Any]) -> dict[str, Any]:
 def _pick_entry_value(entry: dict[str, Any], keys: list[str]) -> str:
     if not entry:
         return ""
-    normalized = _normalize_entry(entry)
+    normalized = None
     for key in keys:
         if key in entry and entry[key] is not None:
             return str(entry[key])
+        if normalized is None:
+            normalized = _normalize_entry(entry)
         lower = key.lower()
         if lower in normalized and normalized[lower] is not None:
             return str(normalized[lower])
@@ -193,44 +258,6 @@ def _extract_custom_values(result: dict[str, Any]) -> str | None:
     return None
 
 
-def _matches_target(entry: dict[str, Any], target: str) -> bool:
-    if not target:
-        return False
-    candidates = [
-        _pick_entry_value(entry, ["ReleaseName", "releaseName", "release_name"]),
-        _pick_entry_value(entry, ["Helmchart", "helmchart", "chart", "chartName", "helmChart"]),
-        _pick_entry_value(entry, ["Name", "name"]),
-    ]
-    return any(value.lower().find(target) >= 0 for value in candidates if value)
-
-
-def _matches_catalog_target(entry: dict[str, Any], target: str) -> bool:
-    if not target:
-        return False
-    name = _pick_entry_value(entry, ["name", "Name", "chart", "Chart", "helmchart", "Helmchart"])
-    if not name:
-        return False
-    return target in name.lower()
-
-
-def _pick_cluster_name(result: dict[str, Any], preferred: str = "primary-cluster") -> str:
-    entries = _extract_installed_entries(result)
-    names = [
-        _pick_entry_value(entry, ["ClusterName", "cluster", "Cluster", "name", "Name"])
-        for entry in entries
-    ]
-    names = [name for name in names if name]
-    if preferred in names:
-        return preferred
-    return names[0] if names else ""
-
-
-def _pick_namespace_list(result: dict[str, Any]) -> list[str]:
-    entries = _extract_installed_entries(result)
-    names = [_pick_entry_value(entry, ["Namespace", "namespace", "name", "Name"]) for entry in entries]
-    return [name for name in names if name]
-
-
 def _get_target_meta(entry: dict[str, Any]) -> dict[str, str]:
     chart_raw = _pick_entry_value(entry, ["Helmchart", "helmchart", "chart", "chartName"])
     app_version = _pick_entry_value(entry, ["app_version", "appVersion"])
@@ -313,53 +340,46 @@ def _format_target_entry(entry: dict[str, Any]) -> str:
     return ", ".join(parts)
 
 
-def _collect_hint_candidates(
-    entries: list[dict[str, Any]],
-    namespace_override: str,
-    hints: list[str],
-) -> list[dict[str, Any]]:
-    candidates: list[dict[str, Any]] = []
-    for entry in entries:
-        if namespace_override and _pick_entry_value(entry, ["Namespace", "namespace"]) != namespace_override:
-            continue
-        if any(_matches_target(entry, hint) for hint in hints if hint):
-            candidates.append(entry)
-    return candidates
-
-
-def check_trap_chain() -> None:
-    required = [
-        {"key": "trap-collector", "label": "Trap Collector", "hints": ["trap-collector", "trap collector"]},
-        {"key": "fcom-processor", "label": "FCOM Processor", "hints": ["fcom-processor", "fcom processor"]},
-        {"key": "event-sink", "label": "Event Sink", "hints": ["event-sink", "event sink"]},
-    ]
-    installed = _fetch_installed_entries()
-    catalogs = _fetch_catalog_entries()
-
-    workloads: dict[str, dict[str, dict[str, Any]]] = {}
-    for entry in installed:
-        cluster = _pick_entry_value(entry, ["Cluster", "cluster"])
-        namespace = _pick_entry_value(entry, ["Namespace", "namespace"])
-        if not cluster or not namespace:
-            continue
-        key = f"{cluster}::{namespace}"
-        if key in workloads:
-            continue
-        data = _fetch_workload_entries(cluster, namespace)
-        workloads[key] = {item.get("name"): item for item in data if item.get("name")}
-
-    def find_match(entries: list[dict[str, Any]], hints: list[str], matcher) -> dict[str, Any] | None:
-        for entry in entries:
-            if any(matcher(entry, hint) for hint in hints):
-                return entry
-        return None
+TRAP_CHAIN_REQUIRED = [
+    {"key": "trap-collector", "label": "Trap Collector", "hints": ["trap-collector", "trap collector"]},
+    {"key": "fcom-processor", "label": "FCOM Processor", "hints": ["fcom-processor", "fcom processor"]},
+    {"key": "event-sink", "label": "Event Sink", "hints": ["event-sink", "event sink"]},
+]
+
+
+def get_trap_chain_status() -> dict[str, Any]:
+    required = TRAP_CHAIN_REQUIRED
+
+    with ThreadPoolExecutor(max_workers=UA_MAX_CONCURRENCY) as pool:
+        installed_future = submit_in_context(pool, _fetch_installed_entries)
+        catalogs_future = submit_in_context(pool, _fetch_catalog_entries)
+        installed_index = HintIndex(installed_future.result(), INSTALLED_MATCH_FIELDS)
+
+        # Only the namespaces hosting a required release are needed; fetch them while the
+        # catalog listing is still in flight.
+        installed_matches: dict[str, dict[str, Any] | None] = {}
+        workload_futures: dict[str, Future] = {}
+        for item in required:
+            hints = [hint.lower() for hint in item["hints"]]
+            installed_entry = installed_index.first(hints)
+            installed_matches[item["key"]] = installed_entry
+            cluster = _pick_entry_value(installed_entry or {}, ["Cluster", "cluster"])
+            namespace = _pick_entry_value(installed_entry or {}, ["Namespace", "namespace"])
+            key = f"{cluster}::{namespace}"
+            if cluster and namespace and key not in workload_futures:
+                workload_futures[key] = submit_in_context(pool, _fetch_workload_entries, cluster, namespace)
+
+        catalog_index = HintIndex(catalogs_future.result(), CATALOG_MATCH_FIELDS)
+        workloads: dict[str, dict[str, dict[str, Any]]] = {}
+        for key, future in workload_futures.items():
+            workloads[key] = {item.get("name"): item for item in future.result() if item.get("name")}
 
     status = []
     missing = []
     for item in required:
         hints = [hint.lower() for hint in item["hints"]]
-        installed_entry = find_match(installed, hints, _matches_target)
-        catalog_entry = find_match(catalogs, hints, _matches_catalog_target)
+        installed_entry = installed_matches[item["key"]]
+        catalog_entry = catalog_index.first(hints)
         cluster = _pick_entry_value(installed_entry or {}, ["Cluster", "cluster"]) if installed_entry else ""
         namespace = _pick_entry_value(installed_entry or {}, ["Namespace", "namespace"]) if installed_entry else ""
         workload_key = f"{cluster}::{namespace}" if cluster and namespace else ""
@@ -382,38 +402,44 @@ def check_trap_chain() -> None:
         if not entry_status["installed"]:
             missing.append(item["key"])
 
-    print(json.dumps({"success": True, "required": status, "missing": missing}, indent=2))
+    return {"success": True, "required": status, "missing": missing}
+
+
+def check_trap_chain() -> None:
+    print(json.dumps(get_trap_chain_status(), indent=2))
+
+
+def _topology_key() -> str:
+    return (current_server() or DEFAULT_SERVER).base_url
+
+
+def _load_topology(refresh: bool = False) -> Topology:
+    return load_topology(
+        lambda path, params: ua_request("GET", path, params),
+        _topology_key(),
+        refresh=refresh,
+        max_workers=UA_MAX_CONCURRENCY,
+    )
 
 
 def deploy_service(service_name: str) -> None:
     if not service_name:
         raise RuntimeError("Missing service name")
 
-    clusters = ua_request("GET", "/microservice/Clusters", {"start": "0", "limit": "100"})
-    cluster_name = _pick_cluster_name(clusters)
+    topology = _load_topology()
+    cluster_name = topology.default_cluster()
     if not cluster_name:
         raise RuntimeError("No clusters found")
 
-    namespaces_result = ua_request(
-        "GET",
-        "/microservice/Deploy/readClusterData",
-        {"Cluster": cluster_name, "start": "0", "limit": "200"},
-    )
-    namespaces = _pick_namespace_list(namespaces_result)
+    namespaces = topology.namespaces(cluster_name)
     if not namespaces:
         raise RuntimeError("No namespaces found for cluster")
 
-    installed = _fetch_installed_entries()
-    if any(_matches_target(entry, service_name.lower()) for entry in installed):
+    if topology.find_installed(service_name) is not None:
         print(json.dumps({"success": True, "alreadyInstalled": True}, indent=2))
         return
 
-    catalogs = _fetch_catalog_entries()
-    catalog_entry = None
-    for entry in catalogs:
-        if _matches_catalog_target(entry, service_name.lower()):
-            catalog_entry = entry
-            break
+    catalog_entry = topology.find_catalog(service_name)
     if not catalog_entry:
         raise RuntimeError("Helm chart not found in catalog")
 
@@ -423,11 +449,7 @@ def deploy_service(service_name: str) -> None:
         raise RuntimeError("Missing catalog chart name or version")
 
     namespace = namespaces[0]
-    preferred_entry = None
-    for entry in installed:
-        if _matches_target(entry, "trap-collector") or _matches_target(entry, "event-sink"):
-            preferred_entry = entry
-            break
+    preferred_entry = topology.find_installed("trap-collector") or topology.find_installed("event-sink")
     preferred_namespace = _pick_entry_value(preferred_entry or {}, ["Namespace", "namespace"])
     if preferred_namespace and preferred_namespace in namespaces:
         namespace = preferred_namespace
@@ -455,44 +477,16 @@ def deploy_service(service_name: str) -> None:
     if missing:
         raise RuntimeError(f"Missing required deploy fields: {', '.join(missing)}")
 
-    deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    try:
+        deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    finally:
+        invalidate_topology(_topology_key())
     if not deploy_result.get("success"):
         raise RuntimeError("Failed to deploy microservice")
     print(json.dumps({"success": True, "deployResult": deploy_result}, indent=2))
 
 
-def redeploy_service(service_name: str) -> None:
-    if not service_name:
-        raise RuntimeError("Missing service name")
-    clusters = ua_request("GET", "/microservice/Clusters", {"start": "0", "limit": "100"})
-    cluster_name = _pick_cluster_name(clusters)
-    if not cluster_name:
-        raise RuntimeError("No clusters found")
-
-    namespaces_result = ua_request(
-        "GET",
-        "/microservice/Deploy/readClusterData",
-        {"Cluster": cluster_name, "start": "0", "limit": "200"},
-    )
-    namespaces = _pick_namespace_list(namespaces_result)
-    if not namespaces:
-        raise RuntimeError("No namespaces found for cluster")
-
-    installed = _fetch_installed_entries()
-    target_entry = None
-    for entry in installed:
-        if _matches_target(entry, service_name.lower()):
-            target_entry = entry
-            break
-    if not target_entry:
-        raise RuntimeError("Microservice release not found")
-
-    target_meta = _get_target_meta(target_entry)
-    if not target_meta.get("cluster"):
-        target_meta["cluster"] = cluster_name
-    if not target_meta.get("namespace") or target_meta["namespace"] not in namespaces:
-        raise RuntimeError("Installed chart namespace not found in cluster namespaces")
-
+def _redeploy_target(target_meta: dict[str, str], timings: dict[str, float] | None = None) -> dict[str, Any]:
     deploy_id = _build_deploy_id(target_meta)
     if not deploy_id:
         raise RuntimeError("Missing deploy id")
@@ -524,37 +518,59 @@ def redeploy_service(service_name: str) -> None:
     if missing:
         raise RuntimeError(f"Missing required deploy fields: {', '.join(missing)}")
 
-    delete_result = ua_request("DELETE", f"/microservice/deploy/{deploy_id}")
-    if not delete_result.get("success"):
-        raise RuntimeError("Failed to uninstall")
-
-    deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    started = time.perf_counter()
+    try:
+        delete_result = ua_request("DELETE", f"/microservice/deploy/{deploy_id}")
+        if not delete_result.get("success"):
+            raise RuntimeError("Failed to uninstall")
+        uninstalled = time.perf_counter()
+        deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    finally:
+        invalidate_topology(_topology_key())
     if not deploy_result.get("success"):
         raise RuntimeError("Failed to redeploy")
+    if timings is not None:
+        timings["uninstallMs"] = round((uninstalled - started) * 1000, 1)
+        timings["deployMs"] = round((time.perf_counter() - uninstalled) * 1000, 1)
+    return deploy_result
+
+
+def redeploy_service(service_name: str) -> None:
+    if not service_name:
+        raise RuntimeError("Missing service name")
+    topology = _load_topology()
+    cluster_name = topology.default_cluster()
+    if not cluster_name:
+        raise RuntimeError("No clusters found")
+
+    namespaces = topology.namespaces(cluster_name)
+    if not namespaces:
+        raise RuntimeError("No namespaces found for cluster")
+
+    target_entry = topology.find_installed(service_name)
+    if not target_entry:
+        raise RuntimeError("Microservice release not found")
+
+    target_meta = _get_target_meta(target_entry)
+    if not target_meta.get("cluster"):
+        target_meta["cluster"] = cluster_name
+    if not target_meta.get("namespace") or target_meta["namespace"] not in namespaces:
+        raise RuntimeError("Installed chart namespace not found in cluster namespaces")
+
+    deploy_result = _redeploy_target(target_meta)
     print(json.dumps({"success": True, "deployResult": deploy_result}, indent=2))
 
 
 def redeploy_fcom_processor() -> None:
-    clusters = ua_request("GET", "/microservice/Clusters", {"start": "0", "limit": "100"})
+    topology = _load_topology()
     cluster_override = FCOM_PROCESSOR_CLUSTER.strip()
-    cluster_name = cluster_override or _pick_cluster_name(clusters)
+    cluster_name = cluster_override or topology.default_cluster()
     if not cluster_name:
         raise RuntimeError("No clusters found")
-    if cluster_override:
-        cluster_entries = _extract_installed_entries(clusters)
-        cluster_names = {
-            _pick_entry_value(entry, ["ClusterName", "cluster", "Cluster", "name", "Name"])
-            for entry in cluster_entries
-        }
-        if cluster_override not in cluster_names:
-            raise RuntimeError("Provided cluster not found in cluster list")
+    if cluster_override and cluster_override not in topology.cluster_names:
+        raise RuntimeError("Provided cluster not found in cluster list")
 
-    namespaces_result = ua_request(
-        "GET",
-        "/microservice/Deploy/readClusterData",
-        {"Cluster": cluster_name, "start": "0", "limit": "200"},
-    )
-    namespaces = _pick_namespace_list(namespaces_result)
+    namespaces = topology.namespaces(cluster_name)
     if not namespaces:
         raise RuntimeError("No namespaces found for cluster")
 
@@ -562,24 +578,17 @@ def redeploy_fcom_processor() -> None:
     if namespace_override and namespace_override not in namespaces:
         raise RuntimeError("Provided namespace not found in cluster namespaces")
 
-    entries = _fetch_installed_entries()
+    entries = topology.installed
     if not entries:
         raise RuntimeError("No installed Helm charts found")
 
     target_name = (FCOM_PROCESSOR_RELEASE_NAME or FCOM_PROCESSOR_HELM_CHART or "fcom-processor").lower()
-    target_entry = None
-    for entry in entries:
-        if not _matches_target(entry, target_name):
-            continue
-        if namespace_override and _pick_entry_value(entry, ["Namespace", "namespace"]) != namespace_override:
-            continue
-        target_entry = entry
-        break
+    target_entry = topology.find_installed(target_name, namespace_override)
     if not target_entry:
         hint_values = [value.strip().lower() for value in FCOM_PROCESSOR_MATCH_HINTS.split(",") if value.strip()]
         if not hint_values:
             hint_values = ["fcom-processor", "fcom processor"]
-        hinted = _collect_hint_candidates(entries, namespace_override, hint_values)
+        hinted = topology.installed_index.matching(hint_values, namespace_override)
         if len(hinted) == 1:
             target_entry = hinted[0]
         else:
@@ -630,17 +639,164 @@ def redeploy_fcom_processor() -> None:
     if missing:
         raise RuntimeError(f"Missing required deploy fields: {', '.join(missing)}")
 
-    delete_result = ua_request("DELETE", f"/microservice/deploy/{deploy_id}")
-    if not delete_result.get("success"):
-        raise RuntimeError("Failed to uninstall FCOM Processor")
-
-    deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    try:
+        delete_result = ua_request("DELETE", f"/microservice/deploy/{deploy_id}")
+        if not delete_result.get("success"):
+            raise RuntimeError("Failed to uninstall FCOM Processor")
+        deploy_result = ua_request("POST", "/microservice/Deploy", payload)
+    finally:
+        invalidate_topology(_topology_key())
     if not deploy_result.get("success"):
         raise RuntimeError("Failed to redeploy FCOM Processor")
 
     print(json.dumps({"success": True, "deployResult": deploy_result}, indent=2))
 
 
+def wait_for_ready(
+    cluster: str,
+    namespace: str,
+    release: str,
+    timeout: float = UA_REDEPLOY_READY_TIMEOUT,
+    initial_delay: float = 1.0,
+    max_delay: float = 15.0,
+) -> tuple[bool, int]:
+    """Poll the release workload with exponential backoff; return (ready, polls).
+
+    The first poll waits initial_delay too: right after the DELETE/POST the old workload can
+    still be listed as ready.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    polls = 0
+    time.sleep(min(delay, max(0.0, timeout)))
+    delay = min(delay * 2, max_delay)
+    while True:
+        polls += 1
+        workloads = _fetch_workload_entries(cluster, namespace)
+        entry = next((item for item in workloads if item.get("name") == release), None)
+        if _is_running(entry):
+            return True, polls
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False, polls
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def _resolve_batch_targets(
+    patterns: list[str],
+    topology: Topology,
+    cluster_name: str,
+) -> tuple[list[dict[str, str]], list[str]]:
+    targets: dict[str, dict[str, str]] = {}
+    unmatched: list[str] = []
+    for pattern in patterns:
+        needle = pattern.strip().lower()
+        if not needle:
+            continue
+        if any(char in needle for char in "*?["):
+            matched = [
+                entry
+                for name in fnmatch.filter(topology.release_names(), needle)
+                for entry in topology.releases(name)
+            ]
+        else:
+            # Exact release name first, then the same first-substring match redeploy-service uses.
+            matched = topology.releases(needle)
+            if not matched:
+                fallback = topology.find_installed(needle)
+                matched = [fallback] if fallback else []
+        if not matched:
+            unmatched.append(pattern)
+            continue
+        for entry in matched:
+            target_meta = _get_target_meta(entry)
+            if not target_meta.get("cluster"):
+                target_meta["cluster"] = cluster_name
+            targets.setdefault(_build_deploy_id(target_meta) or target_meta.get("name", ""), target_meta)
+    return list(targets.values()), unmatched
+
+
+def _redeploy_and_wait(target_meta: dict[str, str], topology: Topology, wave: int, ready_timeout: float) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "release": target_meta.get("name", ""),
+        "namespace": target_meta.get("namespace", ""),
+        "cluster": target_meta.get("cluster", ""),
+        "wave": wave,
+    }
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        if not topology.has_namespace(target_meta.get("cluster", ""), target_meta.get("namespace", "")):
+            raise RuntimeError("Installed chart namespace not found in its cluster's namespaces")
+        _redeploy_target(target_meta, timings)
+        ready_started = time.perf_counter()
+        ready, polls = wait_for_ready(
+            target_meta.get("cluster", ""),
+            target_meta.get("namespace", ""),
+            target_meta.get("name", ""),
+            timeout=ready_timeout,
+        )
+        timings["readyMs"] = round((time.perf_counter() - ready_started) * 1000, 1)
+        record["status"] = "ready" if ready else "timeout"
+        record["polls"] = polls
+    except Exception as exc:
+        record["status"] = "error"
+        record["error"] = str(exc)
+    timings["totalMs"] = round((time.perf_counter() - started) * 1000, 1)
+    record.update(timings)
+    return record
+
+
+def redeploy_batch(
+    patterns: list[str],
+    parallel: int = 4,
+    ready_timeout: float = UA_REDEPLOY_READY_TIMEOUT,
+    continue_on_error: bool = False,
+) -> dict[str, Any]:
+    if not patterns:
+        raise RuntimeError("Missing service names")
+    parallel = max(1, parallel)
+    started = time.perf_counter()
+
+    topology = _load_topology()
+    cluster_name = topology.default_cluster()
+    if not cluster_name:
+        raise RuntimeError("No clusters found")
+    targets, unmatched = _resolve_batch_targets(patterns, topology, cluster_name)
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+
+        # Each wave is redeployed concurrently and must be ready before the next one starts.
+        waves = [targets[idx:idx + parallel] for idx in range(0, len(targets), parallel)]
+        releases: list[dict[str, Any]] = []
+        aborted = False
+        for wave_number, wave in enumerate(waves, start=1):
+            if aborted:
+                releases.extend(
+                    {"release": meta.get("name", ""), "namespace": meta.get("namespace", ""), "wave": wave_number, "status": "skipped"}
+                    for meta in wave
+                )
+                continue
+            futures = [
+                submit_in_context(pool, _redeploy_and_wait, meta, topology, wave_number, ready_timeout)
+                for meta in wave
+            ]
+            wave_results = [future.result() for future in futures]
+            releases.extend(wave_results)
+            if not continue_on_error and any(item["status"] != "ready" for item in wave_results):
+                aborted = True
+
+    return {
+        "success": not unmatched and bool(releases) and all(item["status"] == "ready" for item in releases),
+        "parallel": parallel,
+        "waves": len(waves),
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        "unmatched": unmatched,
+        "releases": releases,
+    }
+
+
 def _parse_params(args: list[str]) -> dict[str, str]:
     params: dict[str, str] = {}
     for arg in args:
@@ -651,30 +807,105 @@ def _parse_params(args: list[str]) -> dict[str, str]:
     return params
 
 
+def _fanout_task(args: list[str]) -> Callable[[], Any]:
+    command = args[0]
+    if command == "check-trap-chain":
+        return get_trap_chain_status
+    if command == "override-counts":
+        from ua_override_counts import collect_override_counts
+
+        return collect_override_counts
+    if command == "device-probe":
+        from ua_devices_probe import probe_devices_summary
+
+        params = _parse_params(args[1:])
+        return lambda: probe_devices_summary(
+            endpoint=params.get("endpoint", "/device/Devices"),
+            limit=int(params.get("limit", "50")),
+            start=int(params.get("start", "0")),
+            discovered_only=params.get("discovered_only", "").lower() == "true",
+            snmp_only=params.get("snmp_only", "").lower() == "true",
+        )
+    if command in ("redeploy-fcom", "deploy-service", "redeploy-service", "redeploy-batch"):
+        raise RuntimeError(f"{command} cannot be fanned out across servers")
+    if len(args) < 2:
+        raise RuntimeError("Usage: ua_api_helper.py --servers <file> <METHOD> <PATH> [key=value ...]")
+    if command.upper() != "GET":
+        raise RuntimeError("Only GET requests can be fanned out across servers")
+    path = args[1]
+    params = _parse_params(args[2:])
+    return lambda: ua_request("GET", path, params)
+
+
+def run_fanout(servers: list[UAServer], args: list[str], deadline: float = UA_FANOUT_DEADLINE) -> dict[str, Any]:
+    started = time.perf_counter()
+    results = run_on_servers(servers, _fanout_task(args), deadline)
+    failed = [server_id for server_id, outcome in results.items() if not outcome.get("success")]
+    return {
+        "success": not failed,
+        "command": " ".join(args),
+        "deadlineSeconds": deadline,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        "failed": failed,
+        "servers": results,
+    }
+
+
+def _pop_option(args: list[str], name: str) -> str | None:
+    if name not in args:
+        return None
+    idx = args.index(name)
+    if idx + 1 >= len(args):
+        raise RuntimeError(f"Missing value for {name}")
+    value = args[idx + 1]
+    del args[idx:idx + 2]
+    return value
+
+
 def main() -> int:
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    servers_file = _pop_option(args, "--servers") or os.getenv("UA_SERVERS_FILE", "")
+    deadline = _pop_option(args, "--deadline")
+    if servers_file:
+        if not args:
+            print("Usage: ua_api_helper.py --servers <file> [--deadline SECONDS] <command|GET PATH> [key=value ...]")
+            return 1
+        report = run_fanout(load_inventory(servers_file), args, float(deadline or UA_FANOUT_DEADLINE))
+        print(json.dumps(report, indent=2))
+        return 0 if report["success"] else 1
+    if len(args) < 1:
         print("Usage: ua_api_helper.py <METHOD> <PATH> [key=value ...] | redeploy-fcom")
         return 1
-    if sys.argv[1] == "redeploy-fcom":
+    if args[0] == "redeploy-fcom":
         redeploy_fcom_processor()
         return 0
-    if sys.argv[1] == "check-trap-chain":
+    if args[0] == "check-trap-chain":
         check_trap_chain()
         return 0
-    if sys.argv[1] == "deploy-service":
-        params = _parse_params(sys.argv[2:])
+    if args[0] == "deploy-service":
+        params = _parse_params(args[1:])
         deploy_service(params.get("name", ""))
         return 0
-    if sys.argv[1] == "redeploy-service":
-        params = _parse_params(sys.argv[2:])
+    if args[0] == "redeploy-service":
+        params = _parse_params(args[1:])
         redeploy_service(params.get("name", ""))
         return 0
-    if len(sys.argv) < 3:
+    if args[0] == "redeploy-batch":
+        params = _parse_params(args[1:])
+        report = redeploy_batch(
+            [name for name in params.get("names", "").split(",") if name.strip()],
+            parallel=int(params.get("parallel", "4")),
+            ready_timeout=float(params.get("timeout", str(UA_REDEPLOY_READY_TIMEOUT))),
+            continue_on_error=params.get("continue_on_error", "").lower() == "true",
+        )
+        print(json.dumps(report, indent=2))
+        return 0 if report["success"] else 1
+    if len(args) < 2:
         print("Usage: ua_api_helper.py <METHOD> <PATH> [key=value ...]")
         return 1
-    method = sys.argv[1]
-    path = sys.argv[2]
-    params = _parse_params(sys.argv[3:])
+    method = args[0]
+    path = args[1]
+    params = _parse_params(args[2:])
     payload = ua_request(method, path, params)
     print(json.dumps(payload, indent=2))
     return 0
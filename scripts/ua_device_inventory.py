@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Local SQLite copy of the UA device inventory (/device/Devices) with indexed lookups by
+  DeviceID, IP address and lower-cased device name.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_inventory.py sync
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_inventory.py status
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_inventory.py lookup --ip 192.168.3.11
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_inventory.py lookup --name "lab-ua-tony02"
+- from ua_device_inventory import DeviceInventory
+  with DeviceInventory() as inventory:
+      device = inventory.find(ip="192.168.3.11")
+
+Notes/Environment:
+- Uses UA credentials/settings from scripts/ua_api_helper.py.
+- A sync pages through every device (UA_DEVICE_PAGE_SIZE rows per page, default 500);
+  when the first page reports a total (total/totalCount), the remaining pages are fetched
+  concurrently, then paging continues sequentially while the last page is full.
+- A sync is complete when the listing ends on a short page with no rows after any earlier
+  short page (the reported total is informational only). An incomplete sync writes what it got but deletes
+  nothing and leaves synced_at unchanged; `sync --full` refuses to run on one.
+- The store is one file per UA server under UA_DEVICE_INVENTORY_DIR (default
+  ~/.cache/ua-navigator); UA_DEVICE_INVENTORY_DB pins an explicit path.
+- Lookups resync automatically once the last sync attempt, complete or not, is older than
+  UA_DEVICE_INVENTORY_MAX_AGE seconds (default 900, 0 = only on explicit sync/--refresh-inventory).
+- Syncs are incremental: every row carries a content hash (and the UA modification
+  timestamp when the rows expose one, which lets unchanged rows skip hashing), and only
+  inserted/changed rows are written and vanished ones deleted. `sync --full` rewrites
+  everything. Each sync runs in one transaction; readers never see a partial copy.
+- Rows keep their UA order through gapped ordinals; new rows are slotted in between, and
+  only a reordered UA listing renumbers the table.
+- UA has no changed-since filter on /device/Devices, so a sync still lists every row; the
+  saving is in hashing/normalizing/writing, not in the transfer.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from ua_api_helper import DEFAULT_SERVER, UA_MAX_CONCURRENCY, ua_request
+from ua_servers import current_server, submit_in_context
+
+SCHEMA_VERSION = 2
+INSERT_BATCH_SIZE = 2000
+ORDINAL_GAP = 1024
+DEVICES_ENDPOINT = "/device/Devices"
+NORMALIZED_COLUMNS = ("device_id", "name", "ip", "zone", "access_id", "status", "sys_oid")
+MODIFIED_KEYS = ["LastModified", "ModifiedTime", "LastUpdated", "UpdatedAt", "DeviceLastModified"]
+UA_DEVICE_PAGE_SIZE = max(1, int(os.getenv("UA_DEVICE_PAGE_SIZE", "500")))
+UA_DEVICE_INVENTORY_MAX_AGE = float(os.getenv("UA_DEVICE_INVENTORY_MAX_AGE", "900"))
+UA_DEVICE_INVENTORY_DIR = os.getenv(
+    "UA_DEVICE_INVENTORY_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ua-navigator")
+)
+
+
+def _extract_rows(payload: Any) -> List[Dict[str, Any]]:
+    if isinstance(payload, list):
+        return [row for row in payload if isinstance(row, dict)]
+    if not isinstance(payload, dict):
+        return []
+    for key in ("data", "rows", "results", "items"):
+        value = payload.get(key)
+        if isinstance(value, list):
+            return [row for row in value if isinstance(row, dict)]
+        if isinstance(value, dict):
+            nested = value.get(key)
+            if isinstance(nested, list):
+                return [row for row in nested if isinstance(row, dict)]
+    return []
+
+
+def _extract_total(payload: Any) -> Optional[int]:
+    if not isinstance(payload, dict):
+        return None
+    # Only explicit grand totals; `count` may be the number of rows in this page.
+    for key in ("total", "totalCount"):
+        value = payload.get(key)
+        if isinstance(value, (int, str)) and str(value).isdigit():
+            return int(value)
+    return None
+
+
+def _pick(row: Dict[str, Any], keys: List[str]) -> str:
+    for key in keys:
+        if key in row and row[key] is not None:
+            return str(row[key]).strip()
+        lower = key.lower()
+        for k, v in row.items():
+            if str(k).lower() == lower and v is not None:
+                return str(v).strip()
+    return ""
+
+
+def _normalize_device(row: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "id": _pick(row, ["DeviceID", "device_id", "id", "ID"]),
+        "name": _pick(row, ["DeviceName", "CustomName", "Name", "Node", "Hostname", "HostName"]),
+        "ip": _pick(row, ["IPAddress", "IPv4", "CombineIP", "IP", "ip"]),
+        "zone": _pick(row, ["DeviceZoneName", "ZoneName", "zone_name", "Zone"]),
+        "access_id": _pick(row, ["DeviceSNMPAccessID", "device_snmp_access_id"]),
+        "status": _pick(row, ["DeviceStatus", "device_status", "Status", "status"]),
+        "sys_oid": _pick(row, ["SysOID", "sys_oid", "SysObjectID", "sysObjectID"]),
+    }
+
+
+def _load_devices(limit: int, start: int) -> tuple[List[Dict[str, Any]], Optional[int]]:
+    payload = ua_request(
+        "GET",
+        DEVICES_ENDPOINT,
+        {
+            "limit": str(limit),
+            "start": str(start),
+            "excludeMetadata": "false",
+        },
+    )
+    return _extract_rows(payload), _extract_total(payload)
+
+
+def fetch_all_devices(
+    page_size: int = UA_DEVICE_PAGE_SIZE,
+    max_workers: int = UA_MAX_CONCURRENCY,
+) -> tuple[List[Dict[str, Any]], Optional[int], bool]:
+    """Return (every raw device row in UA order, the total UA reported or None, complete).
+
+    The listing is complete when it ends on a short page; a short page followed by more rows
+    (a gap in the concurrent fetch) makes it incomplete.
+    """
+    rows, total = _load_devices(page_size, 0)
+    if len(rows) < page_size:
+        return rows, total, True
+    page = rows
+    start = page_size
+    complete = True
+    if total is not None and total > start:
+        starts = range(start, total, page_size)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [submit_in_context(pool, _load_devices, page_size, start) for start in starts]
+            short = False
+            for future in futures:
+                page = future.result()[0]
+                if short and page:
+                    complete = False
+                short = short or len(page) < page_size
+                rows.extend(page)
+        start = starts[-1] + page_size
+    # A stale total undercounts: keep paging while the last page came back full.
+    while len(page) >= page_size:
+        page, _ = _load_devices(page_size, start)
+        rows.extend(page)
+        start += page_size
+    return rows, total, complete
+
+
+def _assign_ordinals(kept: List[Optional[int]]) -> Optional[List[int]]:
+    """Slot new/changed rows (None) between the kept ordinals; None if UA order changed."""
+    ordinals: List[int] = []
+    prev = -1
+    index = 0
+    while index < len(kept):
+        stored = kept[index]
+        if stored is not None:
+            if stored <= prev:
+                return None
+            ordinals.append(stored)
+            prev = stored
+            index += 1
+            continue
+        end = index
+        while end < len(kept) and kept[end] is None:
+            end += 1
+        run = end - index
+        step = ORDINAL_GAP if end == len(kept) else (kept[end] - prev) // (run + 1)
+        if step < 1:
+            return None
+        ordinals.extend(prev + step * offset for offset in range(1, run + 1))
+        prev = ordinals[-1]
+        index = end
+    return ordinals
+
+
+def _default_db_path() -> str:
+    configured = os.getenv("UA_DEVICE_INVENTORY_DB")
+    if configured:
+        return configured
+    base_url = (current_server() or DEFAULT_SERVER).base_url
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", base_url).strip("_") or "default"
+    return os.path.join(UA_DEVICE_INVENTORY_DIR, f"devices-{safe}.sqlite")
+
+
+class DeviceInventory:
+    """Indexed local device store; lookups cover the whole inventory, not one page."""
+
+    def __init__(self, db_path: Optional[str] = None, max_age: float = UA_DEVICE_INVENTORY_MAX_AGE) -> None:
+        self.db_path = db_path or _default_db_path()
+        self.max_age = max_age
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._conn.executescript("DROP TABLE IF EXISTS devices; DROP TABLE IF EXISTS inventory_meta;")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS devices (
+                device_key TEXT PRIMARY KEY,
+                ordinal INTEGER NOT NULL,
+                row_hash TEXT NOT NULL,
+                modified TEXT NOT NULL,
+                device_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                name_lower TEXT NOT NULL,
+                ip TEXT NOT NULL,
+                zone TEXT NOT NULL,
+                access_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                sys_oid TEXT NOT NULL,
+                row TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS devices_ordinal ON devices (ordinal);
+            CREATE INDEX IF NOT EXISTS devices_device_id ON devices (device_id);
+            CREATE INDEX IF NOT EXISTS devices_ip ON devices (ip);
+            CREATE INDEX IF NOT EXISTS devices_name_lower ON devices (name_lower);
+            CREATE INDEX IF NOT EXISTS devices_access_id ON devices (access_id);
+            CREATE TABLE IF NOT EXISTS inventory_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def __enter__(self) -> "DeviceInventory":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM inventory_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def synced_at(self) -> Optional[float]:
+        value = self._meta("synced_at")
+        return float(value) if value else None
+
+    def attempted_at(self) -> Optional[float]:
+        value = self._meta("attempted_at")
+        return float(value) if value else None
+
+    def age(self) -> Optional[float]:
+        synced_at = self.synced_at()
+        return None if synced_at is None else time.time() - synced_at
+
+    def is_stale(self) -> bool:
+        # An incomplete sync still counts as an attempt, so lookups do not refetch every time.
+        last = self.attempted_at() or self.synced_at()
+        if last is None:
+            return True
+        return self.max_age > 0 and time.time() - last > self.max_age
+
+    def sync(self, page_size: int = UA_DEVICE_PAGE_SIZE, full: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        raw_rows, total, complete = fetch_all_devices(page_size)
+        fetched = time.perf_counter()
+        if full and not complete:
+            raise RuntimeError(
+                f"Device listing has gaps ({len(raw_rows)} rows fetched); refusing to rewrite the inventory"
+            )
+
+        existing: Dict[str, tuple] = {}
+        if not full:
+            existing = {
+                key: (row_hash, modified, ordinal)
+                for key, row_hash, modified, ordinal in self._conn.execute(
+                    "SELECT device_key, row_hash, modified, ordinal FROM devices"
+                )
+            }
+        seen: Dict[str, None] = {}
+        keys: List[str] = []
+        kept: List[Optional[int]] = []
+        pending: Dict[int, tuple] = {}
+        inserted = updated = unchanged = 0
+        for position, row in enumerate(raw_rows):
+            modified = _pick(row, MODIFIED_KEYS)
+            device_id = _pick(row, ["DeviceID", "device_id", "id", "ID"])
+            stored = existing.get(device_id) if device_id else None
+            if stored is not None and modified and stored[1] == modified:
+                # Same modification stamp: trust the stored row without hashing it.
+                key, row_hash = device_id, stored[0]
+            else:
+                encoded = json.dumps(row, sort_keys=True, separators=(",", ":"))
+                row_hash = hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+                key = device_id or f"#{row_hash}"
+                stored = existing.get(key)
+            if key in seen:
+                continue
+            seen[key] = None
+            keys.append(key)
+            if stored is not None and stored[0] == row_hash:
+                unchanged += 1
+                kept.append(stored[2])
+                continue
+            if stored is None:
+                inserted += 1
+            else:
+                updated += 1
+            kept.append(None)
+            device = _normalize_device(row)
+            pending[len(keys) - 1] = (
+                row_hash,
+                modified,
+                device["id"],
+                device["name"],
+                device["name"].lower(),
+                device["ip"],
+                device["zone"],
+                device["access_id"],
+                device["status"],
+                device["sys_oid"],
+                json.dumps(row, separators=(",", ":")),
+            )
+        # Rows missing from a short fetch may still exist in UA; never delete on partial data.
+        deleted = [(key,) for key in existing if key not in seen] if complete else []
+
+        ordinals = _assign_ordinals(kept)
+        moves: List[tuple] = []
+        if ordinals is None:
+            # UA returned rows in a different order; renumber so lookups keep UA order.
+            ordinals = [position * ORDINAL_GAP for position in range(len(keys))]
+            moves = [
+                (ordinal, key)
+                for key, ordinal, stored in zip(keys, ordinals, kept)
+                if stored is not None and stored != ordinal
+            ]
+        writes = [(keys[index], ordinals[index]) + values for index, values in pending.items()]
+
+        with self._conn:
+            if full:
+                self._conn.execute("DELETE FROM devices")
+            self._conn.executemany("DELETE FROM devices WHERE device_key = ?", deleted)
+            for offset in range(0, len(writes), INSERT_BATCH_SIZE):
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO devices (device_key, ordinal, row_hash, modified, device_id, name, "
+                    "name_lower, ip, zone, access_id, status, sys_oid, row) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    writes[offset : offset + INSERT_BATCH_SIZE],
+                )
+            self._conn.executemany("UPDATE devices SET ordinal = ? WHERE device_key = ?", moves)
+            now = str(time.time())
+            self._conn.execute(
+                "INSERT OR REPLACE INTO inventory_meta (key, value) VALUES ('attempted_at', ?)", (now,)
+            )
+            if complete:
+                self._conn.execute("INSERT OR REPLACE INTO inventory_meta (key, value) VALUES ('synced_at', ?)", (now,))
+        finished = time.perf_counter()
+        return {
+            "db": self.db_path,
+            "mode": "full" if full else "incremental",
+            "devices": len(seen),
+            "reportedTotal": total,
+            "complete": complete,
+            "inserted": inserted,
+            "updated": updated,
+            "deleted": len(deleted),
+            "unchanged": unchanged,
+            "reordered": len(moves),
+            "rowsWritten": len(writes) + len(deleted) + len(moves),
+            "fetchSeconds": round(fetched - started, 3),
+            "storeSeconds": round(finished - fetched, 3),
+            "rowsPerSecond": round(len(raw_rows) / max(finished - started, 1e-9), 1),
+        }
+
+    def ensure_fresh(
+        self,
+        refresh: bool = False,
+        page_size: int = UA_DEVICE_PAGE_SIZE,
+    ) -> Optional[Dict[str, Any]]:
+        if refresh or self.is_stale():
+            return self.sync(page_size)
+        return None
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+
+    def _device(self, where: str, params: tuple) -> Optional[Dict[str, str]]:
+        row = self._conn.execute(
+            f"SELECT device_id, name, ip, zone, access_id FROM devices WHERE {where} ORDER BY ordinal LIMIT 1",
+            params,
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "name", "ip", "zone", "access_id"), row))
+
+    def get_by_id(self, device_id: str) -> Optional[Dict[str, str]]:
+        return self._device("device_id = ?", (device_id,))
+
+    def get_by_ip(self, ip: str) -> Optional[Dict[str, str]]:
+        return self._device("ip = ?", (ip,))
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, str]]:
+        lowered = name.lower()
+        # Exact names hit the index; otherwise fall back to the first substring match.
+        return self._device("name_lower = ?", (lowered,)) or self._device("instr(name_lower, ?) > 0", (lowered,))
+
+    def find(
+        self,
+        device_id: Optional[str] = None,
+        ip: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> Optional[Dict[str, str]]:
+        if device_id:
+            return self.get_by_id(device_id)
+        if ip:
+            return self.get_by_ip(ip)
+        if name:
+            return self.find_by_name(name)
+        return None
+
+    def rows(
+        self,
+        discovered_only: bool = False,
+        snmp_only: bool = False,
+        start: int = 0,
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Raw device rows in UA order, optionally filtered like ua_devices_probe."""
+        clauses = []
+        if discovered_only:
+            clauses.append("lower(status) = 'discovered'")
+        if snmp_only:
+            clauses.append("sys_oid != ''")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT row FROM devices {where} ORDER BY ordinal LIMIT ? OFFSET ?"
+        cursor = self._conn.execute(query, (limit if limit > 0 else -1, max(0, start)))
+        return [json.loads(row) for (row,) in cursor]
+
+    def devices(
+        self,
+        zone: Optional[str] = None,
+        name: Optional[str] = None,
+        discovered_only: bool = False,
+        snmp_only: bool = False,
+    ) -> Iterator[Dict[str, str]]:
+        """Normalized devices in UA order; zone is exact, name a case-insensitive substring."""
+        clauses = []
+        params: List[Any] = []
+        if zone:
+            clauses.append("zone = ?")
+            params.append(zone)
+        if name:
+            clauses.append("instr(name_lower, ?) > 0")
+            params.append(name.lower())
+        if discovered_only:
+            clauses.append("lower(status) = 'discovered'")
+        if snmp_only:
+            clauses.append("sys_oid != ''")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._conn.execute(
+            f"SELECT device_id, name, ip, zone, access_id FROM devices {where} ORDER BY ordinal", params
+        )
+        for row in cursor:
+            yield dict(zip(("id", "name", "ip", "zone", "access_id"), row))
+
+    def columns(self, *names: str, discovered_only: bool = False) -> Iterator[tuple]:
+        """Selected NORMALIZED_COLUMNS in UA order, without decoding the stored rows."""
+        unknown = set(names) - set(NORMALIZED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown inventory columns: {sorted(unknown)}")
+        where = "WHERE lower(status) = 'discovered'" if discovered_only else ""
+        return iter(self._conn.execute(f"SELECT {', '.join(names)} FROM devices {where} ORDER BY ordinal"))
+
+    def name_fields(self, fields: tuple = ("DeviceName", "CustomName", "SysName")) -> Iterator[tuple]:
+        """(normalized device, {field: value}) in UA order, for building name indexes."""
+        extracts = ", ".join(f"json_extract(row, '$.{field}')" for field in fields)
+        cursor = self._conn.execute(
+            f"SELECT device_id, name, ip, zone, access_id, {extracts} FROM devices ORDER BY ordinal"
+        )
+        for row in cursor:
+            device = dict(zip(("id", "name", "ip", "zone", "access_id"), row[:5]))
+            values = {field: str(value).strip() for field, value in zip(fields, row[5:]) if value not in (None, "")}
+            yield device, values
+
+    def status(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            "db": self.db_path,
+            "devices": self.count(),
+            "syncedAt": self.synced_at(),
+            "attemptedAt": self.attempted_at(),
+            "ageSeconds": round(age, 1) if age is not None else None,
+            "maxAgeSeconds": self.max_age,
+            "stale": self.is_stale(),
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync and query the local UA device inventory.")
+    parser.add_argument("--db", help="SQLite store path (default: per-server file under the cache dir)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Pull every device into the local store")
+    sync_parser.add_argument("--page-size", type=int, default=UA_DEVICE_PAGE_SIZE, help="Device list page size")
+    sync_parser.add_argument("--full", action="store_true", help="Rewrite every row instead of only changes")
+
+    subparsers.add_parser("status", help="Show store size and age")
+
+    lookup_parser = subparsers.add_parser("lookup", help="Resolve a device from the local store")
+    lookup_parser.add_argument("--device-id", help="DeviceID to resolve")
+    lookup_parser.add_argument("--ip", help="IP address to resolve")
+    lookup_parser.add_argument("--name", help="Device name or substring")
+    lookup_parser.add_argument("--refresh-inventory", action="store_true", help="Resync before the lookup")
+
+    args = parser.parse_args()
+
+    with DeviceInventory(args.db) as inventory:
+        if args.command == "sync":
+            print(json.dumps(inventory.sync(max(1, args.page_size), full=args.full), indent=2))
+            return 0
+        if args.command == "status":
+            print(json.dumps(inventory.status(), indent=2))
+            return 0
+        if not (args.device_id or args.ip or args.name):
+            print("lookup needs --device-id, --ip or --name", file=sys.stderr)
+            return 1
+        inventory.ensure_fresh(args.refresh_inventory)
+        device = inventory.find(args.device_id, args.ip, args.name)
+        print(json.dumps({"device": device}, indent=2))
+        return 0 if device else 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
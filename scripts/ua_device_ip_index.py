@@ -0,0 +1,158 @@
+"""
+Purpose:
+- In-memory IPv4/IPv6 index over device rows for CIDR, range and longest-prefix queries.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --cidr 10.20.0.0/16 --snmp-only
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --ip-range 10.0.0.10-10.0.0.99
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --nearest 10.20.4.7
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --bulk --cidr fd00::/64
+- from ua_device_ip_index import DeviceIPIndex
+  index = DeviceIPIndex(rows, lambda row: row["ip"])
+  in_subnet = index.cidr("10.20.0.0/16")
+
+Notes:
+- Addresses are packed to integers and kept in one sorted array per family (array("I")
+  for IPv4, a sorted int list for IPv6); every query is two bisects plus a slice.
+- nearest(address) is the longest-prefix query: the most specific CIDR block around the
+  address that contains at least one device, with the devices in it. The address itself
+  does not have to belong to a device.
+- IP values may carry a /prefix or %zone suffix; rows with a missing or unparsable IP are
+  counted in `skipped` and never match.
+- Results come back in address order.
+- validate_selectors() checks --cidr / --ip-range / --nearest up front so CLIs can report
+  bad input through parser.error instead of a traceback.
+"""
+from __future__ import annotations
+
+import ipaddress
+import socket
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+Address = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+def parse_ip(value: str) -> Optional[Address]:
+    packed = pack_ip(value)
+    if packed is None:
+        return None
+    version, number = packed
+    return ipaddress.IPv4Address(number) if version == 4 else ipaddress.IPv6Address(number)
+
+
+def pack_ip(value: str) -> Optional[Tuple[int, int]]:
+    """(version, integer address); inet_pton is much cheaper than ipaddress at inventory scale."""
+    text = (value or "").strip().split("/", 1)[0].split("%", 1)[0]
+    if not text:
+        return None
+    family, version = (socket.AF_INET6, 6) if ":" in text else (socket.AF_INET, 4)
+    try:
+        return version, int.from_bytes(socket.inet_pton(family, text), "big")
+    except OSError:
+        return None
+
+
+class _Family(Generic[T]):
+    def __init__(self, bits: int, pairs: List[Tuple[int, T]]) -> None:
+        pairs.sort(key=lambda pair: pair[0])
+        self.bits = bits
+        self.keys: Any = array("I", (key for key, _ in pairs)) if bits == 32 else [key for key, _ in pairs]
+        self.records: List[T] = [record for _, record in pairs]
+
+    def between(self, low: int, high: int) -> List[T]:
+        return self.records[bisect_left(self.keys, low) : bisect_right(self.keys, high)]
+
+
+class DeviceIPIndex(Generic[T]):
+    def __init__(self, records: Iterable[T], ip_of: Callable[[T], str]) -> None:
+        pairs: Dict[int, List[Tuple[int, T]]] = {4: [], 6: []}
+        self.skipped = 0
+        for record in records:
+            packed = pack_ip(ip_of(record))
+            if packed is None:
+                self.skipped += 1
+                continue
+            pairs[packed[0]].append((packed[1], record))
+        self._families: Dict[int, _Family[T]] = {4: _Family(32, pairs[4]), 6: _Family(128, pairs[6])}
+
+    def __len__(self) -> int:
+        return sum(len(family.records) for family in self._families.values())
+
+    def cidr(self, network: str) -> List[T]:
+        net = ipaddress.ip_network(network.strip(), strict=False)
+        return self._families[net.version].between(int(net.network_address), int(net.broadcast_address))
+
+    def range(self, start: str, end: str) -> List[T]:
+        low, high = ipaddress.ip_address(start.strip()), ipaddress.ip_address(end.strip())
+        if low.version != high.version:
+            raise ValueError(f"Address family mismatch in range {start}-{end}")
+        if int(low) > int(high):
+            low, high = high, low
+        return self._families[low.version].between(int(low), int(high))
+
+    def nearest(self, address: str) -> Tuple[Optional[str], List[T]]:
+        """Longest-prefix query: (smallest CIDR holding address and a device, its devices)."""
+        target = ipaddress.ip_address(address.strip())
+        family = self._families[target.version]
+        if not family.records:
+            return None, []
+        value = int(target)
+        position = bisect_left(family.keys, value)
+        neighbours = [family.keys[index] for index in (position - 1, position) if 0 <= index < len(family.keys)]
+        prefix = max(family.bits - (value ^ key).bit_length() for key in neighbours)
+        net = ipaddress.ip_network(f"{target}/{prefix}", strict=False)
+        return str(net), family.between(int(net.network_address), int(net.broadcast_address))
+
+    def select(
+        self,
+        cidr: Optional[str] = None,
+        ip_range: Optional[str] = None,
+        nearest: Optional[str] = None,
+    ) -> List[T]:
+        """Apply the CLI selectors (--cidr, --ip-range A-B, --nearest); they intersect."""
+        selected: Optional[List[T]] = None
+        for candidates in (
+            self.cidr(cidr) if cidr else None,
+            self.range(*_split_range(ip_range)) if ip_range else None,
+            self.nearest(nearest)[1] if nearest else None,
+        ):
+            if candidates is None:
+                continue
+            if selected is None:
+                selected = candidates
+            else:
+                keep = {id(record) for record in candidates}
+                selected = [record for record in selected if id(record) in keep]
+        return selected if selected is not None else []
+
+
+def validate_selectors(
+    cidr: Optional[str] = None,
+    ip_range: Optional[str] = None,
+    nearest: Optional[str] = None,
+) -> None:
+    """Raise ValueError naming the offending option if a CLI selector does not parse."""
+    checks: List[Tuple[str, Optional[str], Callable[[str], Any]]] = [
+        ("--cidr", cidr, lambda value: ipaddress.ip_network(value.strip(), strict=False)),
+        ("--ip-range", ip_range, lambda value: DeviceIPIndex([], str).range(*_split_range(value))),
+        ("--nearest", nearest, lambda value: ipaddress.ip_address(value.strip())),
+    ]
+    for option, value, parse in checks:
+        if not value:
+            continue
+        try:
+            parse(value)
+        except ValueError as exc:
+            raise ValueError(f"{option}: {exc}") from None
+
+
+def _split_range(value: str) -> Tuple[str, str]:
+    # IPv6 addresses contain no '-', so a single dash always separates the two ends.
+    start, separator, end = value.partition("-")
+    if not separator or not start.strip() or not end.strip():
+        raise ValueError(f"Expected an address range like 10.0.0.1-10.0.0.99, got {value!r}")
+    return start, end
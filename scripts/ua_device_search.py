@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Ranked device name search (exact, prefix, substring and fuzzy) over DeviceName,
+  CustomName and SysName, built once from the local device inventory.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_search.py core-rtr-0042
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_search.py --mode fuzzy --limit 5 core-rtr-4242
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_device_search.py --interactive
+- from ua_device_search import DeviceNameIndex
+  index = DeviceNameIndex.from_inventory(inventory)
+  hits = index.search("edge-12", limit=10)
+
+Notes/Environment:
+- Reads devices from scripts/ua_device_inventory.py (resynced when stale or with
+  --refresh-inventory).
+- Prefix queries bisect a sorted array of lower-cased names. Substring queries intersect a
+  trigram posting list with a containment check. Fuzzy queries rank by the share of query
+  trigrams found in the name (at least half); candidates are drawn only from the rarest
+  query trigrams, since a name sharing enough trigrams must contain one of them.
+- Very broad queries rank at most the first 5000 prefix/substring/fuzzy candidates.
+- Ranking: exact > prefix > substring (word-boundary matches first) > fuzzy; shorter names
+  rank higher within a tier, and DeviceName beats CustomName beats SysName. Each device is
+  reported once, with its best-matching name.
+- --interactive reads one query per line from stdin and prints the hits and the query time.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ua_device_inventory import DeviceInventory
+
+NAME_FIELDS = ("DeviceName", "CustomName", "SysName")
+FUZZY_THRESHOLD = 0.5
+PREFIX_SCAN_LIMIT = 5000
+SUBSTRING_SCAN_LIMIT = 5000
+FUZZY_CANDIDATE_LIMIT = 5000
+MODES = ("auto", "exact", "prefix", "substring", "fuzzy")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+def _padded_trigrams(name: str) -> Set[str]:
+    return _trigrams(f" {name} ")
+
+
+class DeviceNameIndex:
+    """In-memory name index; terms are (lower-cased name, device position, field rank)."""
+
+    def __init__(self, records: Iterable[Tuple[Dict[str, str], Dict[str, str]]]) -> None:
+        self.devices: List[Dict[str, str]] = []
+        self._term_names: List[str] = []
+        self._term_device: array = array("I")
+        self._term_field: array = array("B")
+        self._postings: Dict[str, array] = {}
+        for device, values in records:
+            position = len(self.devices)
+            self.devices.append(device)
+            seen: Set[str] = set()
+            for rank, field in enumerate(NAME_FIELDS):
+                name = (values.get(field) or "").lower()
+                if not name or name in seen:
+                    continue
+                seen.add(name)
+                term = len(self._term_names)
+                self._term_names.append(name)
+                self._term_device.append(position)
+                self._term_field.append(rank)
+                for gram in _padded_trigrams(name):
+                    postings = self._postings.get(gram)
+                    if postings is None:
+                        postings = self._postings[gram] = array("I")
+                    postings.append(term)
+        order = sorted(range(len(self._term_names)), key=self._term_names.__getitem__)
+        self._sorted_names = [self._term_names[term] for term in order]
+        self._sorted_terms = array("I", order)
+
+    @classmethod
+    def from_inventory(cls, inventory: DeviceInventory) -> "DeviceNameIndex":
+        return cls(inventory.name_fields(NAME_FIELDS))
+
+    def __len__(self) -> int:
+        return len(self._term_names)
+
+    def _prefix_terms(self, query: str) -> List[int]:
+        terms: List[int] = []
+        index = bisect_left(self._sorted_names, query)
+        while index < len(self._sorted_names) and len(terms) < PREFIX_SCAN_LIMIT:
+            if not self._sorted_names[index].startswith(query):
+                break
+            terms.append(self._sorted_terms[index])
+            index += 1
+        return terms
+
+    def _substring_terms(self, query: str) -> List[int]:
+        grams = _trigrams(query)
+        if grams:
+            postings = []
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                postings.append(posting)
+            candidates: Iterable[int] = min(postings, key=len)
+        else:
+            # Too short for trigrams: scan the names directly.
+            candidates = range(len(self._term_names))
+        names = self._term_names
+        terms: List[int] = []
+        for term in candidates:
+            if query in names[term]:
+                terms.append(term)
+                if len(terms) >= SUBSTRING_SCAN_LIMIT:
+                    break
+        return terms
+
+    def _fuzzy_terms(self, query: str) -> Dict[int, float]:
+        grams = _padded_trigrams(query)
+        needed = max(1, math.ceil(FUZZY_THRESHOLD * len(grams)))
+        ranked = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[int] = set()
+        for gram in ranked[: len(ranked) - needed + 1]:
+            for term in self._postings.get(gram, ()):
+                candidates.add(term)
+                if len(candidates) >= FUZZY_CANDIDATE_LIMIT:
+                    break
+            else:
+                continue
+            break
+        scores: Dict[int, float] = {}
+        for term in candidates:
+            padded = f" {self._term_names[term]} "
+            similarity = sum(1 for gram in grams if gram in padded) / len(grams)
+            if similarity >= FUZZY_THRESHOLD:
+                scores[term] = similarity
+        return scores
+
+    def search(self, query: str, limit: int = 10, mode: str = "auto") -> List[Dict[str, Any]]:
+        query = query.strip().lower()
+        if not query:
+            return []
+        if mode not in MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        best: Dict[int, Tuple[float, int, str]] = {}
+
+        def offer(term: int, score: float, kind: str) -> None:
+            name = self._term_names[term]
+            # Shorter names and higher-priority fields win ties within a tier.
+            score += 0.5 * len(query) / max(len(name), 1) - 0.01 * self._term_field[term]
+            device = self._term_device[term]
+            current = best.get(device)
+            if current is None or score > current[0]:
+                best[device] = (score, term, kind)
+
+        if mode in ("auto", "exact", "prefix"):
+            for term in self._prefix_terms(query):
+                if self._term_names[term] == query:
+                    offer(term, 4.0, "exact")
+                elif mode != "exact":
+                    offer(term, 3.0, "prefix")
+        if mode == "substring" or (mode == "auto" and len(query) >= 3):
+            for term in self._substring_terms(query):
+                name = self._term_names[term]
+                at = name.find(query)
+                boundary = at == 0 or not name[at - 1].isalnum()
+                offer(term, 2.0 + (0.5 if boundary else 0.0), "substring")
+        if mode == "fuzzy" or (mode == "auto" and not best):
+            for term, similarity in self._fuzzy_terms(query).items():
+                offer(term, similarity, "fuzzy")
+
+        top = heapq.nlargest(limit, best.items(), key=lambda item: (item[1][0], -item[0]))
+        return [
+            {
+                "device": self.devices[device],
+                "matched": self._term_names[term],
+                "field": NAME_FIELDS[self._term_field[term]],
+                "match": kind,
+                "score": round(score, 4),
+            }
+            for device, (score, term, kind) in top
+        ]
+
+
+def _print_hits(query: str, hits: List[Dict[str, Any]], elapsed: float) -> None:
+    print(json.dumps({"query": query, "elapsedMs": round(elapsed * 1000, 3), "hits": hits}, indent=2))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ranked device name search over the local inventory.")
+    parser.add_argument("query", nargs="?", help="Name, prefix or fragment to search for")
+    parser.add_argument("--mode", choices=MODES, default="auto", help="Match mode")
+    parser.add_argument("--limit", type=int, default=10, help="Number of results")
+    parser.add_argument("--interactive", action="store_true", help="Read queries from stdin, one per line")
+    parser.add_argument("--inventory-db", help="Device inventory SQLite path")
+    parser.add_argument("--refresh-inventory", action="store_true", help="Resync the device inventory first")
+    args = parser.parse_args()
+
+    if not args.query and not args.interactive:
+        parser.error("a query or --interactive is required")
+
+    started = time.perf_counter()
+    with DeviceInventory(args.inventory_db) as inventory:
+        inventory.ensure_fresh(args.refresh_inventory)
+        index = DeviceNameIndex.from_inventory(inventory)
+    print(
+        f"Indexed {len(index)} names for {len(index.devices)} devices in {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+
+    queries: Iterable[str] = [args.query] if args.query else (line.strip() for line in sys.stdin)
+    found: Optional[bool] = None
+    for query in queries:
+        if not query:
+            continue
+        started = time.perf_counter()
+        hits = index.search(query, args.limit, args.mode)
+        _print_hits(query, hits, time.perf_counter() - started)
+        found = bool(hits) if found is None else found or bool(hits)
+    return 0 if found or args.interactive else 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
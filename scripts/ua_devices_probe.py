@@ -10,18 +10,47 @@ Usage:
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --show-keys --sample 5
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --verified-only --exclude-metadata
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --verified-only --snmp-only
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --inventory --limit 0 --snmp-only
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --cidr 10.20.0.0/16 --snmp-only --limit 0
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_devices_probe.py --profile-fields --page-size 500
 
 Notes/Environment:
 - Uses UA credentials/settings from scripts/ua_api_helper.py.
 - Prints field keys and example rows to help map ZoneName/ZoneID/SysOID.
+- probe_devices_summary() backs `ua_api_helper.py --servers ... device-probe`.
+- --inventory reads /device/Devices rows from the local device inventory
+  (scripts/ua_device_inventory.py) instead of one API page: --start/--limit and the filters
+  apply to the whole inventory (--limit 0 = all rows). The store is resynced when stale or
+  with --refresh-inventory; --endpoint and --exclude-metadata do not apply.
+- --cidr / --ip-range A-B / --nearest IP (longest-prefix) select by address through
+  scripts/ua_device_ip_index.py; they imply --inventory and combine with the other filters.
+- --profile-fields streams every page of --endpoint (--page-size rows each, --max-rows to
+  stop early; paging also stops when a page repeats the previous one, for endpoints that
+  ignore `start`), pivots each page into one column per key and reports, per field: fill and
+  null rate (missing, null and "" count as null), distinct count, up to 5 sample values and
+  the inferred type (int/float/bool/ip/oid/timestamp/string/object/list) with its mix.
+  Memory is bounded: one page plus, per field, an exact distinct set of up to 1024 values
+  that then spills into a HyperLogLog sketch (4096 registers, ~1.6% error; reported as
+  distinctApprox=true).
 """
 from __future__ import annotations
 
 import argparse
 import json
-from typing import Any, Dict, List
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterator, List
 
 from ua_api_helper import ua_request
+from ua_device_inventory import DeviceInventory
+from ua_device_ip_index import DeviceIPIndex, pack_ip, validate_selectors
+
+DISTINCT_EXACT_LIMIT = 1024
+HLL_PRECISION = 12
+PROFILE_SAMPLES = 5
+OID_PATTERN = re.compile(r"^\.?\d+(\.\d+){2,}$")
+TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}")
 
 
 def _extract_rows(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -75,6 +104,236 @@ def _ip(row: Dict[str, Any]) -> str:
     return _pick(row, ["IPAddress", "IPv4", "CombineIP", "IP"])
 
 
+def probe_devices(
+    endpoint: str = "/device/Devices",
+    limit: int = 50,
+    start: int = 0,
+    exclude_metadata: bool = False,
+    discovered_only: bool = False,
+    snmp_only: bool = False,
+) -> List[Dict[str, Any]]:
+    params = {
+        "limit": str(limit),
+        "start": str(start),
+    }
+    if exclude_metadata:
+        params["excludeMetadata"] = "true"
+
+    result = ua_request("GET", endpoint, params)
+    rows = _extract_rows(result)
+    normalized = [_normalize_row(row) for row in rows]
+    if discovered_only:
+        normalized = [row for row in normalized if _device_status(row).lower() == "discovered"]
+    if snmp_only:
+        normalized = [row for row in normalized if _sys_oid(row)]
+    return normalized
+
+
+def probe_inventory(
+    limit: int = 50,
+    start: int = 0,
+    discovered_only: bool = False,
+    snmp_only: bool = False,
+    refresh: bool = False,
+    db_path: str | None = None,
+    cidr: str | None = None,
+    ip_range: str | None = None,
+    nearest: str | None = None,
+) -> List[Dict[str, Any]]:
+    by_address = bool(cidr or ip_range or nearest)
+    with DeviceInventory(db_path) as inventory:
+        inventory.ensure_fresh(refresh)
+        if by_address:
+            rows = inventory.rows(discovered_only=discovered_only, snmp_only=snmp_only)
+        else:
+            rows = inventory.rows(discovered_only=discovered_only, snmp_only=snmp_only, start=start, limit=limit)
+    if by_address:
+        rows = DeviceIPIndex(rows, _ip).select(cidr, ip_range, nearest)
+        rows = rows[max(0, start) :][: limit if limit > 0 else None]
+    return [_normalize_row(row) for row in rows]
+
+
+def probe_devices_summary(endpoint: str = "/device/Devices", **kwargs: Any) -> Dict[str, Any]:
+    rows = probe_devices(endpoint, **kwargs)
+    return {
+        "endpoint": endpoint,
+        "rows": len(rows),
+        "devices": [
+            {
+                "name": _device_name(row),
+                "zone": _zone_name(row),
+                "ip": _ip(row),
+                "status": _device_status(row),
+                "sysOid": _sys_oid(row),
+            }
+            for row in rows
+        ],
+    }
+
+
+class _HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        self._precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, token: str) -> None:
+        # str hashes are SipHash, randomized per process but stable within one run.
+        value = hash(token) & 0xFFFFFFFFFFFFFFFF
+        index = value >> (64 - self._precision)
+        rest = value & ((1 << (64 - self._precision)) - 1)
+        rank = (64 - self._precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def estimate(self) -> int:
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            return round(size * math.log(size / zeros))
+        return round(raw)
+
+
+_JSON_TYPES = {bool: "bool", int: "int", float: "float", dict: "object", list: "list"}
+
+
+def _infer_type(value: Any) -> str:
+    json_type = _JSON_TYPES.get(type(value))
+    if json_type:
+        return json_type
+    text = str(value).strip()
+    if text.lstrip("-").isdigit():
+        return "int"
+    if text[:1].isdigit() or ":" in text:
+        if pack_ip(text) is not None:
+            return "ip"
+    if OID_PATTERN.match(text):
+        return "oid"
+    if TIMESTAMP_PATTERN.match(text):
+        return "timestamp"
+    try:
+        float(text)
+    except ValueError:
+        return "string"
+    return "float"
+
+
+class FieldProfile:
+    """Running null/type/cardinality statistics for one column."""
+
+    def __init__(self) -> None:
+        self.present = 0
+        self.types: Counter = Counter()
+        self.samples: List[Any] = []
+        self._distinct: set | None = set()
+        self._sketch: _HyperLogLog | None = None
+        self._type_memo: Dict[tuple, str] = {}
+
+    def add_column(self, values: List[Any]) -> None:
+        types = self.types
+        memo = self._type_memo
+        for value in values:
+            if value is None or value == "":
+                continue
+            self.present += 1
+            token = json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else str(value)
+            # True/"True" and 1/"1" share a token but not a type.
+            memo_key = (type(value), token)
+            value_type = memo.get(memo_key)
+            if value_type is None:
+                value_type = _infer_type(value)
+                if len(memo) < DISTINCT_EXACT_LIMIT:
+                    memo[memo_key] = value_type
+            types[value_type] += 1
+            if self._distinct is not None:
+                if token in self._distinct:
+                    continue
+                if len(self.samples) < PROFILE_SAMPLES:
+                    self.samples.append(value)
+                self._distinct.add(token)
+                if len(self._distinct) > DISTINCT_EXACT_LIMIT:
+                    # High cardinality: spill into a fixed-size sketch.
+                    self._sketch = _HyperLogLog()
+                    for seen in self._distinct:
+                        self._sketch.add(seen)
+                    self._distinct = None
+            else:
+                self._sketch.add(token)
+
+    def report(self, key: str, rows: int) -> Dict[str, Any]:
+        approximate = self._distinct is None
+        dominant = self.types.most_common(1)[0][0] if self.types else "empty"
+        return {
+            "key": key,
+            "present": self.present,
+            "nullRate": round(1 - self.present / rows, 4) if rows else None,
+            "distinct": self._sketch.estimate() if approximate else len(self._distinct),
+            "distinctApprox": approximate,
+            "type": dominant,
+            "types": dict(self.types.most_common()),
+            "samples": self.samples,
+        }
+
+
+def iter_device_pages(
+    endpoint: str = "/device/Devices",
+    page_size: int = 500,
+    exclude_metadata: bool = False,
+    max_rows: int = 0,
+) -> Iterator[List[Dict[str, Any]]]:
+    start = 0
+    previous: List[str] = []
+    while True:
+        limit = page_size if max_rows <= 0 else min(page_size, max_rows - start)
+        if limit <= 0:
+            return
+        page = probe_devices(endpoint, limit=limit, start=start, exclude_metadata=exclude_metadata)
+        # An endpoint that ignores `start` keeps serving the same full page; stop on a repeat.
+        keys = [
+            _pick(row, ["DeviceID", "device_id", "id", "ID"]) or json.dumps(row, sort_keys=True, default=str)
+            for row in page
+        ]
+        if keys and keys == previous:
+            return
+        previous = keys
+        if page:
+            yield page
+        if len(page) < limit:
+            return
+        start += limit
+
+
+def profile_fields(
+    pages: Iterator[List[Dict[str, Any]]],
+    discovered_only: bool = False,
+    snmp_only: bool = False,
+) -> Dict[str, Any]:
+    profiles: Dict[str, FieldProfile] = {}
+    rows = pages_seen = 0
+    for page in pages:
+        pages_seen += 1
+        if discovered_only:
+            page = [row for row in page if _device_status(row).lower() == "discovered"]
+        if snmp_only:
+            page = [row for row in page if _sys_oid(row)]
+        columns: Dict[str, List[Any]] = {}
+        for row in page:
+            for key, value in row.items():
+                columns.setdefault(key, []).append(value)
+        for key, values in columns.items():
+            profile = profiles.get(key)
+            if profile is None:
+                profile = profiles[key] = FieldProfile()
+            profile.add_column(values)
+        rows += len(page)
+    return {
+        "rows": rows,
+        "pages": pages_seen,
+        "fields": [profiles[key].report(key, rows) for key in sorted(profiles)],
+    }
+
+
 def _print_sample(rows: List[Dict[str, Any]], count: int) -> None:
     for idx, row in enumerate(rows[:count], start=1):
         print(f"\nSample {idx}:")
@@ -99,29 +358,56 @@ def main() -> None:
         action="store_true",
         help="Only include devices with SysOID present",
     )
+    parser.add_argument("--inventory", action="store_true", help="Read rows from the local device inventory")
+    parser.add_argument("--inventory-db", help="Device inventory SQLite path")
+    parser.add_argument("--refresh-inventory", action="store_true", help="Resync the device inventory first")
+    parser.add_argument("--cidr", help="Only devices inside this CIDR block (implies --inventory)")
+    parser.add_argument("--ip-range", help="Only devices in this address range, e.g. 10.0.0.1-10.0.0.99")
+    parser.add_argument("--nearest", help="Devices in the most specific block around this address")
+    parser.add_argument("--profile-fields", action="store_true", help="Profile every field across all pages")
+    parser.add_argument("--page-size", type=int, default=500, help="Page size for --profile-fields")
+    parser.add_argument("--max-rows", type=int, default=0, help="Stop --profile-fields after N rows (0 = all)")
     args = parser.parse_args()
+    try:
+        validate_selectors(args.cidr, args.ip_range, args.nearest)
+    except ValueError as exc:
+        parser.error(str(exc))
 
-    params = {
-        "limit": str(args.limit),
-        "start": str(args.start),
-    }
-    if args.exclude_metadata:
-        params["excludeMetadata"] = "true"
+    if args.profile_fields:
+        pages = iter_device_pages(args.endpoint, max(1, args.page_size), args.exclude_metadata, args.max_rows)
+        report = profile_fields(pages, args.discovered_only, args.snmp_only)
+        print(json.dumps({"endpoint": args.endpoint, **report}, indent=2, default=str))
+        return
 
-    result = ua_request("GET", args.endpoint, params)
-    rows = _extract_rows(result)
-    normalized = [_normalize_row(row) for row in rows]
-    if args.discovered_only:
-        normalized = [row for row in normalized if _device_status(row).lower() == "discovered"]
-    if args.snmp_only:
-        normalized = [row for row in normalized if _sys_oid(row)]
-    print(f"Endpoint: {args.endpoint}")
+    if args.inventory or args.refresh_inventory or args.cidr or args.ip_range or args.nearest:
+        normalized = probe_inventory(
+            limit=args.limit,
+            start=args.start,
+            discovered_only=args.discovered_only,
+            snmp_only=args.snmp_only,
+            refresh=args.refresh_inventory,
+            db_path=args.inventory_db,
+            cidr=args.cidr,
+            ip_range=args.ip_range,
+            nearest=args.nearest,
+        )
+        print("Endpoint: inventory")
+    else:
+        normalized = probe_devices(
+            args.endpoint,
+            limit=args.limit,
+            start=args.start,
+            exclude_metadata=args.exclude_metadata,
+            discovered_only=args.discovered_only,
+            snmp_only=args.snmp_only,
+        )
+        print(f"Endpoint: {args.endpoint}")
     print(f"Rows: {len(normalized)}")
 
     if args.show_keys:
         keys = set()
         for row in normalized:
-            keys.update(_normalize_row(row).keys())
+            keys.update(row.keys())
         print("\nKeys:")
         for key in sorted(keys):
             print(f"- {key}")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Export UA microservice / trap-chain health in the Prometheus text exposition format.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_metrics_exporter.py --port 9469 --interval 15
+- curl -s http://127.0.0.1:9469/metrics
+
+Notes/Environment:
+- Uses UA credentials/settings and get_trap_chain_status() from scripts/ua_api_helper.py.
+- A background thread refreshes the trap-chain view every --interval seconds and renders the
+  metrics page once per refresh; scrapes only return the cached page, so scrape latency does
+  not depend on UA latency.
+- UA API latency is recorded for every request made by the refresh loop as the
+  ua_api_request_duration_seconds histogram (labels: method, path).
+- On a failed refresh the previous service gauges are kept and ua_trap_chain_up drops to 0.
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from ua_api_helper import _parse_ready, add_request_observer, get_trap_chain_status
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class LatencyHistogram:
+    """Cumulative per-(method, path) latency histogram fed by ua_request observers."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], List[float]] = {}
+        self._failures: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, method: str, path: str, seconds: float, ok: bool) -> None:
+        key = (method, path)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # bucket counts..., +Inf count, sum
+                series = self._series[key] = [0.0] * (len(self._buckets) + 2)
+            for idx, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    series[idx] += 1
+            series[-2] += 1
+            series[-1] += seconds
+            if not ok:
+                self._failures[key] = self._failures.get(key, 0) + 1
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP ua_api_request_duration_seconds UA REST API request latency.",
+            "# TYPE ua_api_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            series_items = sorted(self._series.items())
+            failures = dict(self._failures)
+        for (method, path), series in series_items:
+            for idx, bound in enumerate(self._buckets):
+                lines.append(
+                    f"ua_api_request_duration_seconds_bucket{_labels(method=method, path=path, le=bound)} "
+                    f"{int(series[idx])}"
+                )
+            lines.append(
+                f"ua_api_request_duration_seconds_bucket{_labels(method=method, path=path, le='+Inf')} "
+                f"{int(series[-2])}"
+            )
+            lines.append(f"ua_api_request_duration_seconds_sum{_labels(method=method, path=path)} {series[-1]:.6f}")
+            lines.append(f"ua_api_request_duration_seconds_count{_labels(method=method, path=path)} {int(series[-2])}")
+        lines.append("# HELP ua_api_request_failures_total UA REST API requests that raised an error.")
+        lines.append("# TYPE ua_api_request_failures_total counter")
+        for (method, path), count in sorted(failures.items()):
+            lines.append(f"ua_api_request_failures_total{_labels(method=method, path=path)} {count}")
+        return lines
+
+
+def render_status(status: Optional[Dict[str, Any]], up: bool, refreshed_at: float, duration: float) -> List[str]:
+    gauges: Dict[str, Tuple[str, List[str]]] = {
+        "ua_trap_chain_service_installed": ("1 if the required release is installed.", []),
+        "ua_trap_chain_service_available": ("1 if the Helm chart is available in the catalog.", []),
+        "ua_trap_chain_service_running": ("1 if the workload reports all replicas ready and available.", []),
+        "ua_trap_chain_service_ready_replicas": ("Ready replicas reported by the workload.", []),
+        "ua_trap_chain_service_desired_replicas": ("Desired replicas reported by the workload.", []),
+    }
+    for item in (status or {}).get("required") or []:
+        labels = _labels(service=item.get("name") or "")
+        ready, total = _parse_ready((item.get("workload") or {}).get("ready"))
+        values = {
+            "ua_trap_chain_service_installed": 1 if item.get("installed") else 0,
+            "ua_trap_chain_service_available": 1 if item.get("available") else 0,
+            "ua_trap_chain_service_running": 1 if item.get("running") else 0,
+            "ua_trap_chain_service_ready_replicas": ready,
+            "ua_trap_chain_service_desired_replicas": total,
+        }
+        for name, value in values.items():
+            gauges[name][1].append(f"{name}{labels} {value:g}")
+
+    lines: List[str] = []
+    for name, (help_text, samples) in gauges.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(samples)
+    lines.extend(
+        [
+            "# HELP ua_trap_chain_up 1 if the last trap-chain refresh succeeded.",
+            "# TYPE ua_trap_chain_up gauge",
+            f"ua_trap_chain_up {1 if up else 0}",
+            "# HELP ua_trap_chain_last_refresh_timestamp_seconds Unix time of the last refresh attempt.",
+            "# TYPE ua_trap_chain_last_refresh_timestamp_seconds gauge",
+            f"ua_trap_chain_last_refresh_timestamp_seconds {refreshed_at:.3f}",
+            "# HELP ua_trap_chain_refresh_duration_seconds Wall time of the last refresh attempt.",
+            "# TYPE ua_trap_chain_refresh_duration_seconds gauge",
+            f"ua_trap_chain_refresh_duration_seconds {duration:.6f}",
+        ]
+    )
+    return lines
+
+
+class MetricsCache:
+    def __init__(self, histogram: LatencyHistogram) -> None:
+        self._histogram = histogram
+        self._status: Optional[Dict[str, Any]] = None
+        self.page = b"# no refresh completed yet\n"
+
+    def refresh(self) -> None:
+        started = time.time()
+        up = True
+        try:
+            self._status = get_trap_chain_status()
+        except Exception:  # pragma: no cover - network errors
+            up = False
+        lines = render_status(self._status, up, started, time.time() - started)
+        lines.extend(self._histogram.render())
+        self.page = ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _refresh_loop(cache: MetricsCache, interval: float, stop: threading.Event) -> None:
+    while not stop.is_set():
+        cache.refresh()
+        stop.wait(interval)
+
+
+def _make_handler(cache: MetricsCache) -> type:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = cache.page
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - base signature
+            return None
+
+    return MetricsHandler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prometheus exporter for UA trap-chain health.")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=9469, help="Listen port")
+    parser.add_argument("--interval", type=float, default=15.0, help="Background refresh interval (seconds)")
+    args = parser.parse_args()
+
+    histogram = LatencyHistogram()
+    add_request_observer(histogram.observe)
+    cache = MetricsCache(histogram)
+    stop = threading.Event()
+    threading.Thread(target=_refresh_loop, args=(cache, args.interval, stop), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(cache))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,7 @@ Usage:
 Notes:
 - Uses UA credentials/settings from scripts/ua_api_helper.py.
 - Mirrors the overview index path resolution for overrides root.
+- collect_override_counts() is also used by `ua_api_helper.py --servers ... override-counts`.
 """
 from __future__ import annotations
 
@@ -164,8 +165,8 @@ def collect_vendor_pairs(path_prefix: str) -> List[Tuple[str, str]]:
     return pairs
 
 
-def main() -> int:
-    overrides_root = resolve_overrides_root(PATH_PREFIX)
+def collect_override_counts(path_prefix: str = PATH_PREFIX) -> Dict[str, Any]:
+    overrides_root = resolve_overrides_root(path_prefix)
     override_listing = list_directory_recursive(overrides_root)
     override_files = [
         entry
@@ -195,10 +196,10 @@ def main() -> int:
             protocol = normalize_override_protocol(method) if method else file_protocol
             totals[f"{protocol}::{vendor}"] += 1
 
-    vendor_pairs = collect_vendor_pairs(PATH_PREFIX)
+    vendor_pairs = collect_vendor_pairs(path_prefix)
 
-    output = {
-        "path_prefix": PATH_PREFIX,
+    return {
+        "path_prefix": path_prefix,
         "overrides_root": overrides_root,
         "override_files": len(override_files),
         "overall_override_entries": overall,
@@ -206,7 +207,10 @@ def main() -> int:
         "file_totals": dict(sorted(file_totals.items())),
         "known_vendor_pairs": sorted({f"{protocol}::{vendor}" for protocol, vendor in vendor_pairs}),
     }
-    print(json.dumps(output, indent=2))
+
+
+def main() -> int:
+    print(json.dumps(collect_override_counts(), indent=2))
     return 0
 
 
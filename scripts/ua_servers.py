@@ -0,0 +1,324 @@
+"""
+Purpose:
+- UA server inventory, per-host keep-alive connection pools and fan-out helpers shared by
+  scripts/ua_api_helper.py and the scripts built on it.
+
+Usage:
+- ./scripts/ua_api_helper.py --servers servers.json check-trap-chain
+- ./scripts/ua_api_helper.py --servers servers.json --deadline 30 GET /microservice/Clusters limit=5
+
+  servers.json (same fields as the backend serverRegistry, plus credentials):
+    [
+      {"server_id": "lab-ua-tony02", "hostname": "lab-ua-tony02.tony.lab", "port": 443,
+       "username": "admin", "password_env": "UA_LAB_PASSWORD", "insecure_tls": true,
+       "max_concurrency": 4}
+    ]
+
+Notes/Environment:
+- UA_SERVERS_FILE can be used instead of --servers.
+- Each server gets its own connection pool; max_concurrency bounds in-flight requests per
+  host so one slow server cannot starve the others.
+- A global deadline caps every request timeout; servers still running at the deadline are
+  reported as failed instead of stalling the merged report. Servers run on daemon threads,
+  so a straggler never delays process exit past the deadline.
+- server_id must be unique within a servers file; results are keyed by it.
+- Requests go over the pooled http.client connections. When an https proxy applies to the
+  host (https_proxy / no_proxy), or UA answers with a redirect, the request goes through
+  urllib instead, which honours the proxy environment and follows redirects.
+"""
+from __future__ import annotations
+
+import contextvars
+import http.client
+import io
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 20.0
+_RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class UAServer:
+    server_id: str
+    hostname: str
+    port: int = 443
+    username: str = ""
+    password: str = ""
+    insecure_tls: bool = True
+    max_concurrency: int = 8
+    _pool: Optional["HostPool"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def base_path(self) -> str:
+        return "/api"
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.hostname}:{self.port}{self.base_path}"
+
+    @property
+    def pool(self) -> "HostPool":
+        if self._pool is None:
+            with _pool_lock:
+                if self._pool is None:
+                    self._pool = HostPool(self)
+        return self._pool
+
+
+class HostPool:
+    """Keep-alive HTTPS connections to one UA host, bounded by max_concurrency."""
+
+    def __init__(self, server: UAServer) -> None:
+        self._server = server
+        self._slots = threading.BoundedSemaphore(max(1, server.max_concurrency))
+        self._idle: List[http.client.HTTPSConnection] = []
+        self._lock = threading.Lock()
+        if server.insecure_tls:
+            self._context = ssl._create_unverified_context()
+        else:
+            self._context = ssl.create_default_context()
+
+    def _checkout(self, timeout: float) -> http.client.HTTPSConnection:
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.timeout = timeout
+                return conn
+        return http.client.HTTPSConnection(
+            self._server.hostname,
+            self._server.port,
+            timeout=timeout,
+            context=self._context,
+        )
+
+    def _checkin(self, conn: http.client.HTTPSConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def request(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No free connection slot for {self._server.server_id}")
+        try:
+            for attempt in range(2):
+                conn = self._checkout(timeout)
+                reused = conn.sock is not None
+                try:
+                    conn.request(method, target, body=body, headers=headers)
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except _RETRYABLE_ERRORS:
+                    conn.close()
+                    # A pooled connection the server already closed; safe to replay reads only.
+                    if reused and attempt == 0 and method == "GET":
+                        continue
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._checkin(conn)
+                return resp.status, resp.reason, resp.headers, data
+            raise RuntimeError("unreachable")
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_current_server: contextvars.ContextVar[Optional[UAServer]] = contextvars.ContextVar("ua_server", default=None)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("ua_deadline", default=None)
+
+
+def current_server() -> Optional[UAServer]:
+    return _current_server.get()
+
+
+def request_timeout(default: float = DEFAULT_TIMEOUT) -> float:
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Global deadline exceeded")
+    return min(default, remaining)
+
+
+def _uses_proxy(server: UAServer) -> bool:
+    return "https" in urllib.request.getproxies() and not urllib.request.proxy_bypass(server.hostname)
+
+
+def _urllib_request_json(
+    server: UAServer,
+    method: str,
+    target: str,
+    headers: Dict[str, str],
+    body: Optional[bytes],
+    timeout: float,
+) -> Any:
+    context = ssl._create_unverified_context() if server.insecure_tls else ssl.create_default_context()
+    req = urllib.request.Request(
+        f"https://{server.hostname}:{server.port}{target}", data=body, headers=headers, method=method
+    )
+    with urllib.request.urlopen(req, context=context, timeout=timeout) as resp:
+        data = resp.read()
+    return json.loads(data.decode("utf-8"))
+
+
+def request_json(
+    server: UAServer,
+    method: str,
+    target: str,
+    headers: Dict[str, str],
+    body: Optional[bytes] = None,
+) -> Any:
+    method = method.upper()
+    if _uses_proxy(server):
+        return _urllib_request_json(server, method, target, headers, body, request_timeout())
+    status, reason, response_headers, data = server.pool.request(
+        method, target, headers, body=body, timeout=request_timeout()
+    )
+    if status in _REDIRECT_STATUSES:
+        # The pool speaks raw http.client; let urllib follow redirects as it always did.
+        return _urllib_request_json(server, method, target, headers, body, request_timeout())
+    if status >= 400:
+        raise urllib.error.HTTPError(
+            f"{server.base_url}{target}", status, reason, response_headers, io.BytesIO(data)
+        )
+    return json.loads(data.decode("utf-8"))
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """Submit fn so it sees the caller's server/deadline context in the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _server_from_entry(entry: Dict[str, Any]) -> UAServer:
+    password = entry.get("password") or ""
+    if not password and entry.get("password_env"):
+        password = os.getenv(str(entry["password_env"]), "")
+    server_id = str(entry.get("server_id") or entry.get("id") or entry.get("hostname") or "").strip()
+    hostname = str(entry.get("hostname") or entry.get("host") or "").strip()
+    if not server_id or not hostname:
+        raise ValueError(f"Server entry requires server_id and hostname: {entry}")
+    return UAServer(
+        server_id=server_id,
+        hostname=hostname,
+        port=int(entry.get("port") or 443),
+        username=str(entry.get("username") or ""),
+        password=password,
+        insecure_tls=bool(entry.get("insecure_tls", True)),
+        max_concurrency=int(entry.get("max_concurrency") or 8),
+    )
+
+
+def load_inventory(path: str) -> List[UAServer]:
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    entries = payload.get("servers") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"No servers defined in {path}")
+    servers = [_server_from_entry(entry) for entry in entries if isinstance(entry, dict)]
+    seen: Dict[str, None] = {}
+    for server in servers:
+        if server.server_id in seen:
+            raise ValueError(f"Duplicate server_id {server.server_id!r} in {path}")
+        seen[server.server_id] = None
+    return servers
+
+
+def _run_for_server(server: UAServer, deadline: float, fn: Callable[[], Any]) -> Dict[str, Any]:
+    _current_server.set(server)
+    _deadline.set(deadline)
+    started = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as exc:
+        return {
+            "success": False,
+            "error": f"{type(exc).__name__}: {exc}",
+            "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        }
+    return {
+        "success": True,
+        "result": result,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _resolve_future(
+    future: Future,
+    context: contextvars.Context,
+    server: UAServer,
+    deadline: float,
+    fn: Callable[[], Any],
+) -> None:
+    try:
+        future.set_result(context.run(_run_for_server, server, deadline, fn))
+    except BaseException as exc:
+        future.set_exception(exc)
+
+
+def run_on_servers(
+    servers: List[UAServer],
+    fn: Callable[[], Any],
+    deadline_seconds: float,
+) -> Dict[str, Dict[str, Any]]:
+    """Run fn once per server concurrently and merge the outcomes keyed by server_id."""
+    ids = [server.server_id for server in servers]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate server_id in {ids}")
+    deadline = time.monotonic() + deadline_seconds
+    futures: Dict[str, Future] = {}
+    for server in servers:
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        futures[server.server_id] = future
+        # Daemon threads: a server still running at the deadline must not hold up interpreter exit.
+        threading.Thread(
+            target=_resolve_future,
+            args=(future, contextvars.copy_context(), server, deadline, fn),
+            name=f"ua-{server.server_id}",
+            daemon=True,
+        ).start()
+    done, _pending = wait(futures.values(), timeout=deadline_seconds)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for server_id, future in futures.items():
+        if future in done:
+            results[server_id] = future.result()
+        else:
+            results[server_id] = {"success": False, "error": "Global deadline exceeded"}
+    for server in servers:
+        server.pool.close()
+    return results
@@ -8,109 +8,141 @@ Usage:
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --device-id 45
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --ip 192.168.3.11
 - /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --name "lab-ua-tony02"
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --bulk > profiles.jsonl
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --bulk --zone "Default First Zone"
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --bulk --devices-file devices.txt
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_snmp_access_profile.py --bulk --cidr 10.20.0.0/16 --snmp-only
 
 Notes/Environment:
 - Uses UA credentials/settings from scripts/ua_api_helper.py.
-- Fetches devices from /device/Devices to resolve DeviceSNMPAccessID.
+- Resolves DeviceSNMPAccessID from the local device inventory (scripts/ua_device_inventory.py),
+  which covers every device, not just the first page; it is resynced when older than
+  UA_DEVICE_INVENTORY_MAX_AGE or when --refresh-inventory is given.
 - Fetches SNMP access profile from /discovery/snmp/{id}.
+- --bulk resolves many devices in one run: --device-ids / --devices-file (one DeviceID, IP
+  or name per line), a --zone / --name / --cidr / --ip-range / --discovered-only /
+  --snmp-only filter, or the
+  whole inventory when no selector is given. Filters also narrow an explicit selector
+  list; an all-digit selector is a DeviceID first, then a device name. Devices are grouped by DeviceSNMPAccessID,
+  each distinct profile is fetched once (--workers concurrent requests), and one JSON line
+  per device is written as soon as its profile arrives. A summary goes to stderr.
 """
 from __future__ import annotations
 
 import argparse
+import ipaddress
 import json
-from typing import Any, Dict, List, Optional
-
-from ua_api_helper import ua_request
-
-
-def _extract_rows(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    if not payload:
-        return []
-    for key in ("data", "rows", "results", "items"):
-        value = payload.get(key)
-        if isinstance(value, list):
-            return [row for row in value if isinstance(row, dict)]
-        if isinstance(value, dict):
-            nested = value.get(key)
-            if isinstance(nested, list):
-                return [row for row in nested if isinstance(row, dict)]
-    if isinstance(payload, list):
-        return [row for row in payload if isinstance(row, dict)]
-    return []
-
-
-def _pick(row: Dict[str, Any], keys: List[str]) -> str:
-    for key in keys:
-        if key in row and row[key] is not None:
-            return str(row[key]).strip()
-        lower = key.lower()
-        for k, v in row.items():
-            if str(k).lower() == lower and v is not None:
-                return str(v).strip()
-    return ""
-
-
-def _normalize_device(row: Dict[str, Any]) -> Dict[str, str]:
-    return {
-        "id": _pick(row, ["DeviceID", "device_id", "id", "ID"]),
-        "name": _pick(
-            row,
-            [
-                "DeviceName",
-                "CustomName",
-                "Name",
-                "Node",
-                "Hostname",
-                "HostName",
-            ],
-        ),
-        "ip": _pick(row, ["IPAddress", "IPv4", "CombineIP", "IP", "ip"]),
-        "zone": _pick(row, ["DeviceZoneName", "ZoneName", "zone_name", "Zone"]),
-        "access_id": _pick(row, ["DeviceSNMPAccessID", "device_snmp_access_id"]),
-    }
-
-
-def _load_devices(limit: int, start: int) -> List[Dict[str, str]]:
-    payload = ua_request(
-        "GET",
-        "/device/Devices",
-        {
-            "limit": str(limit),
-            "start": str(start),
-            "excludeMetadata": "false",
-        },
-    )
-    rows = _extract_rows(payload)
-    return [_normalize_device(row) for row in rows]
-
-
-def _find_device(
-    devices: List[Dict[str, str]],
-    device_id: str | None,
-    ip: str | None,
-    name: str | None,
-) -> Optional[Dict[str, str]]:
-    if device_id:
-        return next((device for device in devices if device.get("id") == device_id), None)
-    if ip:
-        return next((device for device in devices if device.get("ip") == ip), None)
-    if name:
-        lowered = name.lower()
-        return next(
-            (
-                device
-                for device in devices
-                if (device.get("name") or "").lower().find(lowered) >= 0
-            ),
-            None,
-        )
-    return None
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ua_api_helper import UA_MAX_CONCURRENCY, ua_request
+from ua_device_inventory import UA_DEVICE_PAGE_SIZE, DeviceInventory
+from ua_device_ip_index import DeviceIPIndex, validate_selectors
+from ua_servers import submit_in_context
 
 
 def _fetch_snmp_access(access_id: str) -> Dict[str, Any]:
     return ua_request("GET", f"/discovery/snmp/{access_id}")
 
 
+def _find_by_selector(inventory: DeviceInventory, selector: str) -> Optional[Dict[str, str]]:
+    if selector.isdigit():
+        # All-digit device names exist too; only fall back to them when no DeviceID matches.
+        return inventory.get_by_id(selector) or inventory.find_by_name(selector)
+    try:
+        ipaddress.ip_address(selector)
+    except ValueError:
+        return inventory.find_by_name(selector)
+    return inventory.get_by_ip(selector)
+
+
+def _read_selectors(device_ids: Optional[str], devices_file: Optional[str]) -> List[str]:
+    selectors = [item.strip() for item in (device_ids or "").split(",") if item.strip()]
+    if devices_file:
+        with open(devices_file, "r", encoding="utf-8") as handle:
+            selectors.extend(line.strip() for line in handle if line.strip() and not line.startswith("#"))
+    return selectors
+
+
+def resolve_profiles(
+    devices: Iterable[Dict[str, str]],
+    emit: Callable[[Dict[str, Any]], None],
+    workers: int = UA_MAX_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Fetch each distinct access profile once and emit one record per device."""
+    started = time.perf_counter()
+    groups: Dict[str, List[Dict[str, str]]] = {}
+    summary = {"devices": 0, "profiles": 0, "profileErrors": 0, "withoutAccessId": 0}
+    for device in devices:
+        summary["devices"] += 1
+        access_id = device.get("access_id") or ""
+        if not access_id or access_id == "0":
+            summary["withoutAccessId"] += 1
+            emit({"device": device, "error": "Device does not have a valid DeviceSNMPAccessID."})
+            continue
+        groups.setdefault(access_id, []).append(device)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {submit_in_context(pool, _fetch_snmp_access, access_id): access_id for access_id in groups}
+        for future in as_completed(futures):
+            access_id = futures[future]
+            try:
+                record: Dict[str, Any] = {"profile": future.result()}
+                summary["profiles"] += 1
+            except Exception as exc:
+                record = {"error": f"{type(exc).__name__}: {exc}"}
+                summary["profileErrors"] += 1
+            for device in groups.pop(access_id):
+                emit({"device": device, "resolved_access_id": access_id, **record})
+
+    summary["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def _emit_line(record: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _run_bulk(args: argparse.Namespace) -> int:
+    with DeviceInventory(args.inventory_db) as inventory:
+        inventory.ensure_fresh(args.refresh_inventory, max(1, args.limit))
+        selectors = _read_selectors(args.device_ids, args.devices_file)
+        devices: List[Dict[str, str]] = []
+        unresolved = 0
+        filtered = inventory.devices(
+            zone=args.zone,
+            name=args.name,
+            discovered_only=args.discovered_only,
+            snmp_only=args.snmp_only,
+        )
+        if selectors:
+            seen = set()
+            for selector in selectors:
+                device = _find_by_selector(inventory, selector)
+                if device is None:
+                    unresolved += 1
+                    _emit_line({"selector": selector, "error": "No matching device found."})
+                elif device["id"] not in seen:
+                    seen.add(device["id"])
+                    devices.append(device)
+            if args.zone or args.name or args.discovered_only or args.snmp_only:
+                allowed = {device["id"] for device in filtered}
+                devices = [device for device in devices if device["id"] in allowed]
+        else:
+            devices = list(filtered)
+        if args.cidr or args.ip_range:
+            devices = DeviceIPIndex(devices, lambda device: device["ip"]).select(args.cidr, args.ip_range)
+    summary = resolve_profiles(devices, _emit_line, args.workers)
+    summary["unresolvedSelectors"] = unresolved
+    if selectors:
+        summary["filteredOut"] = len(seen) - len(devices)
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Resolve a device to its SNMP access profile using UA REST API."
@@ -119,14 +151,32 @@ def main() -> int:
     parser.add_argument("--device-id", help="DeviceID to resolve")
     parser.add_argument("--ip", help="IP address to resolve")
     parser.add_argument("--name", help="Device name or substring")
-    parser.add_argument("--limit", type=int, default=500, help="Device list page size")
-    parser.add_argument("--start", type=int, default=0, help="Device list start offset")
+    parser.add_argument("--limit", type=int, default=UA_DEVICE_PAGE_SIZE, help="Device list page size for syncs")
+    parser.add_argument("--inventory-db", help="Device inventory SQLite path")
+    parser.add_argument("--refresh-inventory", action="store_true", help="Resync the device inventory first")
+    parser.add_argument("--bulk", action="store_true", help="Resolve many devices, one JSON line per device")
+    parser.add_argument("--device-ids", help="Bulk: comma-separated DeviceIDs")
+    parser.add_argument("--devices-file", help="Bulk: file with one DeviceID, IP or name per line")
+    parser.add_argument("--zone", help="Bulk: only devices in this zone")
+    parser.add_argument("--cidr", help="Bulk: only devices inside this CIDR block")
+    parser.add_argument("--ip-range", help="Bulk: only devices in this range, e.g. 10.0.0.1-10.0.0.99")
+    parser.add_argument("--discovered-only", action="store_true", help="Bulk: only DeviceStatus=Discovered")
+    parser.add_argument("--snmp-only", action="store_true", help="Bulk: only devices with SysOID present")
+    parser.add_argument("--workers", type=int, default=UA_MAX_CONCURRENCY, help="Bulk: concurrent profile fetches")
     args = parser.parse_args()
+    try:
+        validate_selectors(args.cidr, args.ip_range)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.bulk:
+        return _run_bulk(args)
 
     access_id = (args.access_id or "").strip()
     if not access_id:
-        devices = _load_devices(args.limit, args.start)
-        device = _find_device(devices, args.device_id, args.ip, args.name)
+        with DeviceInventory(args.inventory_db) as inventory:
+            inventory.ensure_fresh(args.refresh_inventory, max(1, args.limit))
+            device = inventory.find(args.device_id, args.ip, args.name)
         if not device:
             raise SystemExit("No matching device found for the provided selector.")
         access_id = device.get("access_id") or ""
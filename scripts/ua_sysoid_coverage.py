@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Report which live devices' SysOIDs belong to vendors that have trap COMs under
+  coms/trap/<vendor>, with coverage per zone and uncovered vendors ranked by device count.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_sysoid_coverage.py
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_sysoid_coverage.py --discovered-only --top 20
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_sysoid_coverage.py --vendor-map vendors.json
+
+  vendors.json maps OID prefixes to vendor labels; deeper prefixes win:
+    {"1.3.6.1.4.1.9": "cisco", "1.3.6.1.4.1.2636.1.1.1.2": "juniper-mx"}
+
+Notes/Environment:
+- Devices come from the local device inventory (scripts/ua_device_inventory.py), streamed
+  as (zone, SysOID) columns.
+- The prefix index maps every enterprise root (1.3.6.1.4.1.<n>) seen in a COM trap OID to
+  the coms/trap vendor directories that use it. It is cached under UA_DEVICE_INVENTORY_DIR
+  keyed by the corpus file list, sizes and mtimes, so only a changed corpus is re-parsed.
+- A SysOID is matched by walking its arcs from the longest prefix down (one dict lookup per
+  arc). COM prefixes decide coverage; --vendor-map and the built-in enterprise names only
+  label uncovered vendors (unknown ones show as enterprise.<n>).
+- Coverage percentages are over devices that report a SysOID; devices without one are
+  counted separately.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ua_device_inventory import UA_DEVICE_INVENTORY_DIR, DeviceInventory
+
+INDEX_VERSION = 1
+ENTERPRISES = "1.3.6.1.4.1"
+DEFAULT_COMS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "coms", "trap")
+ENTERPRISE_PATTERN = re.compile(r"^\.?(1\.3\.6\.1\.4\.1\.\d+)(?:\.|$)")
+KNOWN_ENTERPRISES = {
+    "2": "ibm",
+    "9": "cisco",
+    "11": "hp",
+    "94": "nokia",
+    "193": "ericsson",
+    "311": "microsoft",
+    "637": "alcatel",
+    "674": "dell",
+    "1916": "extreme",
+    "1991": "foundry",
+    "2011": "huawei",
+    "2620": "checkpoint",
+    "2636": "juniper",
+    "3375": "f5",
+    "3902": "zte",
+    "6486": "alcatel-lucent-enterprise",
+    "6527": "timetra",
+    "6876": "vmware",
+    "8072": "net-snmp",
+    "9148": "acmepacket",
+    "12356": "fortinet",
+    "14823": "aruba",
+    "25461": "paloaltonetworks",
+    "25506": "h3c",
+    "30065": "arista",
+}
+
+
+def _list_com_files(root: str) -> List[str]:
+    paths: List[str] = []
+    for current_root, _dirs, files in os.walk(root):
+        for file_name in files:
+            if file_name.endswith(".json"):
+                paths.append(os.path.join(current_root, file_name))
+    paths.sort()
+    return paths
+
+
+def _fingerprint(root: str, paths: List[str]) -> str:
+    digest = hashlib.sha1(str(INDEX_VERSION).encode("utf-8"))
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.relpath(path, root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _trap_oids(payload: Any) -> Iterable[str]:
+    objects = payload.get("objects") if isinstance(payload, dict) else None
+    for obj in objects or []:
+        trap = obj.get("trap") if isinstance(obj, dict) else None
+        if isinstance(trap, dict) and trap.get("oid"):
+            yield str(trap["oid"])
+
+
+def build_prefix_index(root: str) -> Dict[str, List[str]]:
+    """Enterprise prefix -> sorted vendor directories with trap COMs under it."""
+    vendors: Dict[str, Set[str]] = defaultdict(set)
+    for path in _list_com_files(root):
+        vendor = os.path.relpath(path, root).split(os.sep, 1)[0]
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        for oid in _trap_oids(payload):
+            match = ENTERPRISE_PATTERN.match(oid)
+            if match:
+                vendors[match.group(1)].add(vendor)
+    return {prefix: sorted(names) for prefix, names in vendors.items()}
+
+
+def load_prefix_index(root: str, refresh: bool = False) -> Tuple[Dict[str, List[str]], Dict[str, Any]]:
+    started = time.perf_counter()
+    paths = _list_com_files(root)
+    fingerprint = _fingerprint(root, paths)
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.abspath(root)).strip("_")
+    cache_path = os.path.join(UA_DEVICE_INVENTORY_DIR, f"com-oid-prefixes-{safe}.json")
+    if not refresh:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as handle:
+                cached = json.load(handle)
+            if cached.get("fingerprint") == fingerprint:
+                stats = {"files": len(paths), "prefixes": len(cached["prefixes"]), "cached": True}
+                stats["seconds"] = round(time.perf_counter() - started, 3)
+                return cached["prefixes"], stats
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+    prefixes = build_prefix_index(root)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"fingerprint": fingerprint, "prefixes": prefixes}, handle)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    stats = {"files": len(paths), "prefixes": len(prefixes), "cached": False}
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return prefixes, stats
+
+
+class PrefixMatcher:
+    """Longest-prefix match of dotted OIDs against a prefix -> value dict."""
+
+    def __init__(self, prefixes: Dict[str, Any]) -> None:
+        self._prefixes = {prefix.strip("."): value for prefix, value in prefixes.items()}
+        self._max_arcs = max((prefix.count(".") + 1 for prefix in self._prefixes), default=0)
+
+    def match(self, oid: str) -> Optional[Tuple[str, Any]]:
+        arcs = oid.strip().strip(".").split(".")[: self._max_arcs]
+        for length in range(len(arcs), 0, -1):
+            prefix = ".".join(arcs[:length])
+            value = self._prefixes.get(prefix)
+            if value is not None:
+                return prefix, value
+        return None
+
+
+def _vendor_label(sys_oid: str, labels: PrefixMatcher) -> Tuple[str, str]:
+    hit = labels.match(sys_oid)
+    if hit:
+        return hit[0], hit[1]
+    match = ENTERPRISE_PATTERN.match(sys_oid.strip())
+    if match:
+        return match.group(1), f"enterprise.{match.group(1).rsplit('.', 1)[1]}"
+    return "", "non-enterprise"
+
+
+def _percent(part: int, whole: int) -> Optional[float]:
+    return round(100.0 * part / whole, 2) if whole else None
+
+
+def coverage_report(
+    devices: Iterable[Tuple[str, str]],
+    com_prefixes: Dict[str, List[str]],
+    vendor_map: Optional[Dict[str, str]] = None,
+    top: int = 25,
+) -> Dict[str, Any]:
+    covered_by = PrefixMatcher(com_prefixes)
+    labels = {f"{ENTERPRISES}.{number}": name for number, name in KNOWN_ENTERPRISES.items()}
+    labels.update(vendor_map or {})
+    label_matcher = PrefixMatcher(labels)
+
+    totals = Counter()
+    zones: Dict[str, Counter] = defaultdict(Counter)
+    covered_vendors: Counter = Counter()
+    uncovered: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+    uncovered_zones: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+    # Inventories repeat a few hundred SysOIDs; memoize the prefix walk per SysOID.
+    memo: Dict[str, Optional[Tuple[str, Any]]] = {}
+
+    for zone, sys_oid in devices:
+        zone = zone or "(no zone)"
+        totals["devices"] += 1
+        zones[zone]["devices"] += 1
+        sys_oid = (sys_oid or "").strip()
+        if not sys_oid:
+            totals["withoutSysOid"] += 1
+            continue
+        totals["withSysOid"] += 1
+        zones[zone]["withSysOid"] += 1
+        if sys_oid not in memo:
+            memo[sys_oid] = covered_by.match(sys_oid)
+        hit = memo[sys_oid]
+        if hit is not None:
+            totals["covered"] += 1
+            zones[zone]["covered"] += 1
+            covered_vendors["/".join(hit[1])] += 1
+            continue
+        key = _vendor_label(sys_oid, label_matcher)
+        uncovered[key][sys_oid] += 1
+        uncovered_zones[key][zone] += 1
+
+    ranked = sorted(uncovered.items(), key=lambda item: (-sum(item[1].values()), item[0]))
+    return {
+        "devices": totals["devices"],
+        "withSysOid": totals["withSysOid"],
+        "withoutSysOid": totals["withoutSysOid"],
+        "covered": totals["covered"],
+        "coveragePercent": _percent(totals["covered"], totals["withSysOid"]),
+        "distinctSysOids": len(memo),
+        "uncoveredVendors": [
+            {
+                "prefix": prefix,
+                "vendor": vendor,
+                "devices": sum(sys_oids.values()),
+                "distinctSysOids": len(sys_oids),
+                "topSysOids": [oid for oid, _ in sys_oids.most_common(3)],
+                "zones": dict(uncovered_zones[(prefix, vendor)].most_common()),
+            }
+            for (prefix, vendor), sys_oids in ranked[: max(0, top)]
+        ],
+        "uncoveredVendorCount": len(ranked),
+        "coveredVendors": dict(covered_vendors.most_common()),
+        "zones": {
+            zone: {
+                "devices": counts["devices"],
+                "withSysOid": counts["withSysOid"],
+                "covered": counts["covered"],
+                "coveragePercent": _percent(counts["covered"], counts["withSysOid"]),
+            }
+            for zone, counts in sorted(zones.items())
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SysOID to trap COM vendor coverage report.")
+    parser.add_argument("--coms-root", default=DEFAULT_COMS_ROOT, help="Trap COM corpus root (coms/trap)")
+    parser.add_argument("--vendor-map", help="JSON file mapping OID prefixes to vendor labels")
+    parser.add_argument("--top", type=int, default=25, help="Number of uncovered vendors to list")
+    parser.add_argument("--discovered-only", action="store_true", help="Only DeviceStatus=Discovered devices")
+    parser.add_argument("--inventory-db", help="Device inventory SQLite path")
+    parser.add_argument("--refresh-inventory", action="store_true", help="Resync the device inventory first")
+    parser.add_argument("--refresh-index", action="store_true", help="Re-parse the COM corpus")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.coms_root):
+        print(f"Path not found: {args.coms_root}", file=sys.stderr)
+        return 1
+    vendor_map = None
+    if args.vendor_map:
+        with open(args.vendor_map, "r", encoding="utf-8") as handle:
+            vendor_map = json.load(handle)
+
+    com_prefixes, corpus = load_prefix_index(args.coms_root, args.refresh_index)
+    started = time.perf_counter()
+    with DeviceInventory(args.inventory_db) as inventory:
+        inventory.ensure_fresh(args.refresh_inventory)
+        devices = inventory.columns("zone", "sys_oid", discovered_only=args.discovered_only)
+        report = coverage_report(devices, com_prefixes, vendor_map, args.top)
+    report["corpus"] = corpus
+    report["matchSeconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,339 @@
+"""
+Purpose:
+- Cached UA cluster topology (clusters, namespaces, installed releases, catalog charts)
+  shared by the deploy/redeploy helpers.
+
+Usage:
+- from ua_topology import invalidate_topology, load_topology
+  topology = load_topology(get_json, cache_key="https://host:443/api")
+  entry = topology.find_installed("fcom-processor")
+  namespaces = topology.namespaces(topology.default_cluster())
+
+  get_json(path, params) must return the decoded JSON of a GET on the UA API.
+
+Notes/Environment:
+- The snapshot is persisted as JSON under UA_TOPOLOGY_CACHE_DIR (default
+  ~/.cache/ua-navigator) and reused for UA_TOPOLOGY_TTL seconds (default 60, 0 disables).
+- A cold build fetches clusters, installed releases and catalogs concurrently, then the
+  namespaces of every cluster concurrently.
+- Callers that install or uninstall releases should call invalidate_topology() afterwards.
+- Release, (release, namespace), cluster and chart lookups are dict indexes; an exact
+  release/chart name wins over substring matches.
+- HintIndex answers "hint is a substring of release, chart or name" through an inverted
+  token index: hint tokens select candidate entries, and only those are substring-checked.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ua_servers import submit_in_context
+
+CACHE_VERSION = 1
+UA_TOPOLOGY_TTL = float(os.getenv("UA_TOPOLOGY_TTL", "60"))
+UA_TOPOLOGY_CACHE_DIR = os.getenv(
+    "UA_TOPOLOGY_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ua-navigator")
+)
+
+GetJson = Callable[[str, Dict[str, str]], Dict[str, Any]]
+
+RELEASE_KEYS = ("ReleaseName", "releaseName", "release_name")
+CHART_KEYS = ("Helmchart", "helmchart", "chart", "chartName", "helmChart")
+NAME_KEYS = ("Name", "name")
+CATALOG_KEYS = ("name", "Name", "chart", "Chart", "helmchart", "Helmchart")
+CLUSTER_KEYS = ("ClusterName", "cluster", "Cluster", "name", "Name")
+NAMESPACE_KEYS = ("Namespace", "namespace", "name", "Name")
+INSTALLED_MATCH_FIELDS = (RELEASE_KEYS, CHART_KEYS, NAME_KEYS)
+CATALOG_MATCH_FIELDS = (CATALOG_KEYS,)
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def _extract_entries(result: Any) -> List[Dict[str, Any]]:
+    if isinstance(result, list):
+        return [entry for entry in result if isinstance(entry, dict)]
+    if not isinstance(result, dict):
+        return []
+    data = result.get("data") or result.get("results") or result.get("rows") or result.get("items")
+    if isinstance(data, dict):
+        data = data.get("data") or data.get("results") or data.get("rows") or data.get("items")
+    if isinstance(data, list):
+        return [entry for entry in data if isinstance(entry, (dict, str))]
+    return []
+
+
+def _pick(entry: Dict[str, Any], keys: tuple) -> str:
+    for key in keys:
+        value = entry.get(key)
+        if value is not None:
+            return str(value)
+    lowered = {str(key).lower(): value for key, value in entry.items()}
+    for key in keys:
+        value = lowered.get(key.lower())
+        if value is not None:
+            return str(value)
+    return ""
+
+
+class EntryRecord:
+    """An installed/catalog entry with its match fields picked and lower-cased once."""
+
+    __slots__ = ("position", "entry", "values", "namespace")
+
+    def __init__(self, position: int, entry: Dict[str, Any], fields: Tuple[tuple, ...]) -> None:
+        self.position = position
+        self.entry = entry
+        self.values = tuple(value.lower() for value in (_pick(entry, keys) for keys in fields) if value)
+        self.namespace = _pick(entry, ("Namespace", "namespace"))
+
+
+class HintIndex:
+    """Inverted token index answering "which entries contain this hint" in list order."""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], fields: Tuple[tuple, ...]) -> None:
+        self.records = [EntryRecord(position, entry, fields) for position, entry in enumerate(entries)]
+        self._postings: Dict[str, Set[int]] = {}
+        for record in self.records:
+            for value in record.values:
+                for token in _TOKEN_PATTERN.findall(value):
+                    self._postings.setdefault(token, set()).add(record.position)
+        self._expanded: Dict[str, Set[int]] = {}
+
+    def _token_positions(self, token: str) -> Set[int]:
+        # A hint token can sit inside a longer entry token ("proc" in "processor"), so
+        # expand it over the vocabulary once and reuse the union.
+        positions = self._expanded.get(token)
+        if positions is None:
+            positions = set()
+            for vocab, posting in self._postings.items():
+                if token in vocab:
+                    positions |= posting
+            self._expanded[token] = positions
+        return positions
+
+    def positions(self, hint: str) -> Set[int]:
+        hint = hint.lower()
+        if not hint:
+            return set()
+        tokens = set(_TOKEN_PATTERN.findall(hint))
+        if tokens:
+            postings = sorted((self._token_positions(token) for token in tokens), key=len)
+            candidates: Iterable[int] = set.intersection(*postings)
+        else:
+            candidates = range(len(self.records))
+        return {
+            position
+            for position in candidates
+            if any(hint in value for value in self.records[position].values)
+        }
+
+    def matching(self, hints: Iterable[str], namespace: str = "") -> List[Dict[str, Any]]:
+        positions: Set[int] = set()
+        for hint in hints:
+            if hint:
+                positions |= self.positions(hint)
+        return [
+            self.records[position].entry
+            for position in sorted(positions)
+            if not namespace or self.records[position].namespace == namespace
+        ]
+
+    def first(self, hints: Iterable[str], namespace: str = "") -> Optional[Dict[str, Any]]:
+        matches = self.matching(hints, namespace)
+        return matches[0] if matches else None
+
+
+def _fetch_paged(get_json: GetJson, path: str, limit: int, paged: bool, max_pages: int = 25) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for page in range(1, max_pages + 1):
+        start = (page - 1) * limit
+        params = {"start": str(start), "limit": str(limit)}
+        if paged:
+            params["page"] = str(page)
+        batch = [entry for entry in _extract_entries(get_json(path, params)) if isinstance(entry, dict)]
+        if not batch:
+            break
+        entries.extend(batch)
+        if len(batch) < limit:
+            break
+    return entries
+
+
+def _namespace_names(result: Any) -> List[str]:
+    names: List[str] = []
+    for entry in _extract_entries(result):
+        name = entry if isinstance(entry, str) else _pick(entry, NAMESPACE_KEYS)
+        if name.strip():
+            names.append(name.strip())
+    return names
+
+
+def fetch_topology(get_json: GetJson, max_workers: int = 8) -> Dict[str, Any]:
+    """Fetch the raw topology snapshot from UA."""
+    with ThreadPoolExecutor(max_workers=max(2, max_workers)) as pool:
+        installed_future = submit_in_context(
+            pool, _fetch_paged, get_json, "/microservice/Deploy/readForInstalled", 200, True
+        )
+        catalogs_future = submit_in_context(pool, _fetch_paged, get_json, "/microservice/Catalogs", 500, False)
+        clusters_result = get_json("/microservice/Clusters", {"start": "0", "limit": "100"})
+        clusters = [
+            name
+            for name in (_pick(entry, CLUSTER_KEYS) for entry in _extract_entries(clusters_result) if isinstance(entry, dict))
+            if name
+        ]
+        namespace_futures = {
+            cluster: submit_in_context(
+                pool,
+                get_json,
+                "/microservice/Deploy/readClusterData",
+                {"Cluster": cluster, "start": "0", "limit": "200"},
+            )
+            for cluster in dict.fromkeys(clusters)
+        }
+        return {
+            "version": CACHE_VERSION,
+            "fetchedAt": time.time(),
+            "clusters": clusters,
+            "namespaces": {cluster: _namespace_names(future.result()) for cluster, future in namespace_futures.items()},
+            "installed": installed_future.result(),
+            "catalogs": catalogs_future.result(),
+        }
+
+
+class Topology:
+    """Indexed view over a topology snapshot."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.fetched_at = float(data.get("fetchedAt") or 0)
+        self.clusters: List[str] = list(data.get("clusters") or [])
+        self.cluster_names = set(self.clusters)
+        self._namespaces: Dict[str, List[str]] = {
+            cluster: list(names) for cluster, names in (data.get("namespaces") or {}).items()
+        }
+        self._namespace_sets = {cluster: set(names) for cluster, names in self._namespaces.items()}
+        self.installed: List[Dict[str, Any]] = list(data.get("installed") or [])
+        self.catalogs: List[Dict[str, Any]] = list(data.get("catalogs") or [])
+
+        self._by_release: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_release_namespace: Dict[tuple, Dict[str, Any]] = {}
+        for entry in self.installed:
+            release = _pick(entry, RELEASE_KEYS + NAME_KEYS).lower()
+            if not release:
+                continue
+            self._by_release.setdefault(release, []).append(entry)
+            namespace = _pick(entry, ("Namespace", "namespace"))
+            self._by_release_namespace.setdefault((release, namespace), entry)
+        self._by_chart: Dict[str, Dict[str, Any]] = {}
+        for entry in self.catalogs:
+            chart = _pick(entry, CATALOG_KEYS).lower()
+            if chart:
+                self._by_chart.setdefault(chart, entry)
+        self.installed_index = HintIndex(self.installed, INSTALLED_MATCH_FIELDS)
+        self.catalog_index = HintIndex(self.catalogs, CATALOG_MATCH_FIELDS)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def default_cluster(self, preferred: str = "primary-cluster") -> str:
+        if preferred in self.cluster_names:
+            return preferred
+        return self.clusters[0] if self.clusters else ""
+
+    def namespaces(self, cluster: str) -> List[str]:
+        return self._namespaces.get(cluster, [])
+
+    def has_namespace(self, cluster: str, namespace: str) -> bool:
+        return namespace in self._namespace_sets.get(cluster, ())
+
+    def release(self, name: str, namespace: str = "") -> Optional[Dict[str, Any]]:
+        """Exact (case-insensitive) release lookup, optionally pinned to a namespace."""
+        key = name.lower()
+        if namespace:
+            return self._by_release_namespace.get((key, namespace))
+        matches = self._by_release.get(key)
+        return matches[0] if matches else None
+
+    def releases(self, name: str) -> List[Dict[str, Any]]:
+        """All installed entries with this exact (case-insensitive) release name."""
+        return list(self._by_release.get(name.lower(), []))
+
+    def release_names(self) -> List[str]:
+        return list(self._by_release)
+
+    def find_installed(self, target: str, namespace: str = "") -> Optional[Dict[str, Any]]:
+        """Exact release hit, else the first entry whose release/chart/name contains target."""
+        if not target:
+            return None
+        target = target.lower()
+        exact = self.release(target, namespace)
+        if exact is not None:
+            return exact
+        return self.installed_index.first([target], namespace)
+
+    def find_catalog(self, target: str) -> Optional[Dict[str, Any]]:
+        """Exact chart-name hit, else the first catalog chart whose name contains target."""
+        if not target:
+            return None
+        target = target.lower()
+        exact = self._by_chart.get(target)
+        if exact is not None:
+            return exact
+        return self.catalog_index.first([target])
+
+
+def _cache_path(cache_key: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", cache_key).strip("_") or "default"
+    return os.path.join(UA_TOPOLOGY_CACHE_DIR, f"topology-{safe}.json")
+
+
+def _read_cache(path: str, ttl: float) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return None
+    if time.time() - float(data.get("fetchedAt") or 0) > ttl:
+        return None
+    return data
+
+
+def _write_cache(path: str, data: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_topology(
+    get_json: GetJson,
+    cache_key: str,
+    ttl: float = UA_TOPOLOGY_TTL,
+    refresh: bool = False,
+    max_workers: int = 8,
+) -> Topology:
+    path = _cache_path(cache_key)
+    data = None if refresh or ttl <= 0 else _read_cache(path, ttl)
+    if data is None:
+        data = fetch_topology(get_json, max_workers)
+        if ttl > 0:
+            _write_cache(path, data)
+    return Topology(data)
+
+
+def invalidate_topology(cache_key: str) -> None:
+    try:
+        os.remove(_cache_path(cache_key))
+    except OSError:
+        pass
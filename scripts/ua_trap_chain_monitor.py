@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Continuously monitor the UA trap chain (trap-collector, fcom-processor, event-sink) and
+  emit only what changed between polls; serve the latest snapshot from memory.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_trap_chain_monitor.py --port 8765
+- /root/navigator/.venv/bin/python /root/navigator/scripts/ua_trap_chain_monitor.py --unix-socket /run/ua-trap-chain.sock
+- curl -s http://127.0.0.1:8765/snapshot
+- curl -s --unix-socket /run/ua-trap-chain.sock http://localhost/snapshot
+
+Notes/Environment:
+- Uses UA credentials/settings and get_trap_chain_status() from scripts/ua_api_helper.py.
+- Prints JSON lines to stdout: one "snapshot" record on the first successful poll, then a
+  "diff" record only when something changed (installed/uninstalled, started/stopped,
+  ready count, catalog availability, placement) and "error" records for failed polls.
+- The poll interval drops to --min-interval after a change or error and doubles while the
+  chain is stable, up to --max-interval.
+- Snapshot reads are answered from a pre-serialized buffer; they never trigger UA calls.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from ua_api_helper import get_trap_chain_status
+
+WATCHED_FIELDS = ("installed", "running", "available", "cluster", "namespace")
+
+
+class SnapshotStore:
+    """Holds the last trap-chain snapshot and its serialized form for fast reads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status: Optional[Dict[str, Any]] = None
+        self._body = json.dumps({"success": False, "error": "No snapshot yet"}).encode("utf-8")
+
+    def update(self, status: Optional[Dict[str, Any]], fetched_at: float, error: str | None = None) -> None:
+        with self._lock:
+            if status is not None:
+                self._status = status
+            payload = dict(self._status or {"success": False})
+            payload["fetchedAt"] = fetched_at if status is not None else payload.get("fetchedAt")
+            payload["lastError"] = error
+            self._body = json.dumps(payload).encode("utf-8")
+
+    @property
+    def status(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._status
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+
+def _event_name(field: str, after: Any) -> str:
+    if field == "installed":
+        return "installed" if after else "uninstalled"
+    if field == "running":
+        return "started" if after else "stopped"
+    if field == "available":
+        return "catalog_added" if after else "catalog_removed"
+    return "moved"
+
+
+def diff_status(previous: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    before_index = {item.get("name"): item for item in previous.get("required") or []}
+    changes: List[Dict[str, Any]] = []
+    for item in current.get("required") or []:
+        name = item.get("name")
+        before = before_index.get(name)
+        if before is None:
+            changes.append({"service": name, "event": "added", "after": item})
+            continue
+        # An install/uninstall implies placement and workload changes; report only the flip.
+        flipped = before.get("installed") != item.get("installed")
+        fields = ("installed", "running", "available") if flipped else WATCHED_FIELDS
+        for field in fields:
+            if before.get(field) != item.get(field):
+                changes.append(
+                    {
+                        "service": name,
+                        "event": _event_name(field, item.get(field)),
+                        "field": field,
+                        "before": before.get(field),
+                        "after": item.get(field),
+                    }
+                )
+        if flipped:
+            continue
+        before_workload = before.get("workload") or {}
+        workload = item.get("workload") or {}
+        for field in ("ready", "available", "uptodate"):
+            if before_workload.get(field) != workload.get(field):
+                changes.append(
+                    {
+                        "service": name,
+                        "event": "ready_changed" if field == "ready" else "workload_changed",
+                        "field": f"workload.{field}",
+                        "before": before_workload.get(field),
+                        "after": workload.get(field),
+                    }
+                )
+    return changes
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def poll_forever(store: SnapshotStore, min_interval: float, max_interval: float, stop: threading.Event) -> None:
+    interval = min_interval
+    while not stop.is_set():
+        started = time.time()
+        try:
+            status = get_trap_chain_status()
+        except Exception as exc:  # pragma: no cover - network errors
+            store.update(None, started, error=str(exc))
+            _emit({"type": "error", "at": started, "message": str(exc)})
+            interval = min_interval
+        else:
+            previous = store.status
+            store.update(status, started)
+            if previous is None:
+                _emit({"type": "snapshot", "at": started, **status})
+                interval = min_interval
+            else:
+                changes = diff_status(previous, status)
+                if changes:
+                    _emit({"type": "diff", "at": started, "changes": changes})
+                    interval = min_interval
+                else:
+                    interval = min(interval * 2, max_interval)
+        stop.wait(interval)
+
+
+def _make_handler(store: SnapshotStore) -> type:
+    class SnapshotHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] not in ("/", "/snapshot"):
+                self.send_error(404)
+                return
+            body = store.body
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self) -> str:
+            return str(self.client_address[0]) if self.client_address else "unix"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - base signature
+            return None
+
+    return SnapshotHandler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Monitor the UA trap chain and serve the latest snapshot.")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=0, help="HTTP port (0 disables HTTP)")
+    parser.add_argument("--unix-socket", help="Serve the snapshot over this Unix socket path")
+    parser.add_argument("--min-interval", type=float, default=5.0, help="Fastest poll interval (seconds)")
+    parser.add_argument("--max-interval", type=float, default=60.0, help="Slowest poll interval (seconds)")
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    handler = _make_handler(store)
+    servers: List[socketserver.BaseServer] = []
+    if args.port:
+        servers.append(ThreadingHTTPServer((args.host, args.port), handler))
+    if args.unix_socket:
+        if os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+        servers.append(ThreadingUnixHTTPServer(args.unix_socket, handler))
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    try:
+        poll_forever(store, args.min_interval, max(args.min_interval, args.max_interval), stop)
+    except KeyboardInterrupt:
+        stop.set()
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
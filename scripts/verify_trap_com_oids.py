@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Purpose:
+- Check that every trap COM object under coms/trap still resolves against the shipped MIB
+  set, and that resolved OIDs neither collide nor disagree with the COMs' trap.oid.
+
+Usage:
+- /root/navigator/.venv/bin/python /root/navigator/scripts/verify_trap_com_oids.py
+- /root/navigator/.venv/bin/python /root/navigator/scripts/verify_trap_com_oids.py --vendor cisco --vendor a10
+- /root/navigator/.venv/bin/python /root/navigator/scripts/verify_trap_com_oids.py --no-index --workers 8
+
+Notes/Environment:
+- Same MIB settings as scripts/test_snmptranslate.py (UA_MIB_DIR / MIBDIRS, MIBS,
+  UA_SNMP_TRANSLATE_CMD).
+- Every @objectName is collected once, however many COM files repeat it, and resolved
+  through test_snmptranslate.resolve_names: native MIB index first, then the on-disk
+  result cache, then batched snmptranslate runs in parallel. Re-runs against an unchanged
+  MIB dir never start snmptranslate.
+- Reported problems: names that do not resolve, distinct names resolving to the same OID,
+  and names whose resolved OID differs from the trap.oid recorded in the COM. Lists are cut
+  at --top entries; the counts are always complete.
+- Exits 1 when any problem is found, so it can gate a corpus update.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from mib_symbol_index import MibSymbolIndex
+from test_snmptranslate import DEFAULT_BATCH_SIZE, TranslateCache, resolve_names
+
+DEFAULT_COMS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "coms", "trap")
+
+
+def collect_object_names(root: str, vendors: Optional[List[str]] = None) -> Dict[str, Any]:
+    """@objectName -> COM files and recorded trap OIDs, for every trap COM under root."""
+    files: Dict[str, List[str]] = defaultdict(list)
+    recorded: Dict[str, Set[str]] = defaultdict(set)
+    scanned = 0
+    objects = 0
+    for directory in [os.path.join(root, vendor) for vendor in vendors] if vendors else [root]:
+        for current_root, dirs, file_names in os.walk(directory):
+            dirs.sort()
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".json"):
+                    continue
+                path = os.path.join(current_root, file_name)
+                try:
+                    with open(path, "r", encoding="utf-8") as handle:
+                        payload = json.load(handle)
+                except (OSError, ValueError):
+                    continue
+                scanned += 1
+                if not isinstance(payload, dict):
+                    continue
+                for obj in payload.get("objects") or []:
+                    name = obj.get("@objectName") if isinstance(obj, dict) else None
+                    if not name:
+                        continue
+                    objects += 1
+                    files[name].append(os.path.relpath(path, root))
+                    trap = obj.get("trap")
+                    if isinstance(trap, dict) and trap.get("oid"):
+                        recorded[name].add(str(trap["oid"]).strip().strip("."))
+    return {"files": scanned, "objects": objects, "names": files, "recordedOids": recorded}
+
+
+def verify(
+    corpus: Dict[str, Any],
+    results: Dict[str, Dict[str, Any]],
+    top: int = 50,
+) -> Dict[str, Any]:
+    files: Dict[str, List[str]] = corpus["names"]
+    recorded: Dict[str, Set[str]] = corpus["recordedOids"]
+    unresolved: List[Dict[str, Any]] = []
+    by_oid: Dict[str, List[str]] = defaultdict(list)
+    mismatches: List[Dict[str, Any]] = []
+    for name in sorted(files):
+        result = results[name]
+        oid = result["stdout"].strip(".") if result["returncode"] == 0 else ""
+        if not oid:
+            unresolved.append({"name": name, "error": result["stderr"] or None, "files": files[name][:3]})
+            continue
+        by_oid[oid].append(name)
+        expected = recorded.get(name)
+        if expected and oid not in expected:
+            mismatches.append(
+                {"name": name, "resolvedOid": oid, "comOids": sorted(expected), "files": files[name][:3]}
+            )
+    collisions = [{"oid": oid, "names": names} for oid, names in sorted(by_oid.items()) if len(names) > 1]
+    return {
+        "unresolvedCount": len(unresolved),
+        "collisionCount": len(collisions),
+        "oidMismatchCount": len(mismatches),
+        "duplicateNames": sum(1 for paths in files.values() if len(paths) > 1),
+        "unresolved": unresolved[: max(0, top)],
+        "collisions": collisions[: max(0, top)],
+        "oidMismatches": mismatches[: max(0, top)],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify trap COM object names resolve against the MIB set.")
+    parser.add_argument("--coms-root", default=DEFAULT_COMS_ROOT, help="Trap COM corpus root (coms/trap)")
+    parser.add_argument("--vendor", action="append", help="Only this vendor directory (repeatable)")
+    parser.add_argument("--mib-dir", default=os.getenv("UA_MIB_DIR") or os.getenv("MIBDIRS") or "/opt/assure1/distrib/mibs")
+    parser.add_argument("--mibs", default=os.getenv("MIBS"), help="Optional MIBS search list.")
+    parser.add_argument("--binary", default=os.getenv("UA_SNMP_TRANSLATE_CMD", "snmptranslate"))
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Parallel snmptranslate runs.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Names per snmptranslate run.")
+    parser.add_argument("--top", type=int, default=50, help="Entries listed per problem kind")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk result cache.")
+    parser.add_argument("--no-index", action="store_true", help="Skip the native MIB index; always run snmptranslate.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.coms_root):
+        print(f"Path not found: {args.coms_root}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    corpus = collect_object_names(args.coms_root, args.vendor)
+    scan_seconds = time.perf_counter() - started
+    index = None if args.no_index else MibSymbolIndex.load(args.mib_dir)
+    cache = None if args.no_cache else TranslateCache()
+    try:
+        results, summary = resolve_names(
+            list(corpus["names"]),
+            args.binary,
+            args.mib_dir,
+            None,
+            args.mibs,
+            args.workers,
+            args.batch_size,
+            cache,
+            index,
+        )
+    finally:
+        if cache:
+            cache.close()
+
+    report = {
+        "comFiles": corpus["files"],
+        "objects": corpus["objects"],
+        "distinctNames": len(corpus["names"]),
+        "scanSeconds": round(scan_seconds, 3),
+        "resolve": summary,
+        **verify(corpus, results, args.top),
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if report["unresolvedCount"] or report["collisionCount"] or report["oidMismatchCount"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())